@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 # --- BEGIN: localized auto-install missing Python deps (improved) ---
-import importlib, sys, os, subprocess, shlex, shutil
+import importlib, importlib.util, sys, os, subprocess, shlex, shutil
 from datetime import datetime
 
 # --- automatic short lang detect (hu or en) ---
@@ -13,14 +13,12 @@ if LANG not in ("hu", "en"):
 REQ = [("PyQt6", "pyqt6"), ("cryptography", "cryptography")]
 
 def module_ok(name: str) -> bool:
+    # Locates the package without importing it; PyQt6 and cryptography are loaded once, when used
     try:
-        importlib.import_module(name)
-        return True
+        return importlib.util.find_spec(name) is not None
     except Exception:
         return False
 
-missing = [pip for mod, pip in REQ if not module_ok(mod)]
-
 MSG = {
     "en": {
         "missing": "Missing Python packages required by NetMountManager: {pkgs}",
@@ -48,9 +46,11 @@ MSG = {
     }
 }[LANG]
 
-if not missing:
-    pass
-else:
+def ensure_dependencies():
+    missing = [pip for mod, pip in REQ if not module_ok(mod)]
+    if not missing:
+        return
+
     pkgs_str = " ".join(missing)
 
     if os.geteuid() == 0:
@@ -121,6 +121,7 @@ else:
         proc.start(cmd[0], cmd[1:])
         dlg.exec()
 
+        importlib.invalidate_caches()
         still_missing = [pip for mod, pip in REQ if not module_ok(mod)]
         if still_missing:
             sys.stderr.write(MSG["missing"].format(pkgs=" ".join(still_missing)) + "\n")
@@ -166,13 +167,18 @@ else:
                 sys.stderr.write(MSG["pip_cmd"].format(pkgs=pkgs_str) + "\n")
                 sys.exit(1)
 
+            importlib.invalidate_caches()
             still_missing = [pip for mod, pip in REQ if not module_ok(mod)]
             if still_missing:
                 sys.stderr.write(MSG["missing"].format(pkgs=" ".join(still_missing)) + "\n")
                 sys.stderr.write(MSG["dnf_reco"] + "\n")
+
+if __name__ == "__main__":
+    # Only a script run checks: importing this module (e.g. from the startup benchmark) has no side effects
+    ensure_dependencies()
 # --- END: localized auto-install missing Python deps (improved) ---
 
-import os, sys, time, json, socket, subprocess, urllib.parse, getpass
+import os, sys, time, json, socket, getpass
 from pathlib import Path
 
 current_file = Path(__file__).resolve()
@@ -180,24 +186,30 @@ project_root = current_file.parent.parent
 sys.path.insert(0, str(project_root))
 
 from PyQt6.QtWidgets import (
-    QApplication, QMessageBox, QInputDialog, QLineEdit, QDialog,
+    QApplication, QMessageBox, QDialog,
     QTextEdit, QVBoxLayout, QLabel
 )
 from PyQt6.QtGui import QIcon
 from PyQt6.QtCore import QLocale
 
 from netmount.config import (
-    SECURE_FILE, XBEL_FILE, BOOKMARK_NS, SMBUNMOUNT_EXEC, icon_path, lang_file_am, lang_file_pw
+    SECURE_FILE, SMBUNMOUNT_EXEC, MOUNT_OP_TIMEOUT, icon_path, lang_file_am, lang_file_pw
 )
-from netmount.utils.xml_utils import prettify
 from netmount.bookmarks import add_place, clean_mount_bookmarks
-from netmount.password_prompt import ask_admin_password
+from netmount.password_prompt import ask_admin_password, launch_with_password
+from netmount.privhelper import get_helper
+from netmount.mount_options import build_mount_command, split_remote, sftp_key_path, needs_smb_probe, refresh_smb_capabilities
+from netmount.runner import run_command, ERROR_AUTH
 from netmount.decryptor import decrypt, encrypt
 
-app = QApplication(sys.argv)
-app.setWindowIcon(QIcon(str(icon_path)))
 LANG = QLocale.system().name().split('_')[0]
 
+# Set up by start_ui(); nothing is built at import time
+app = None
+T = {}
+T_PW = {}
+progress_dialog = None
+
 fallback_error_msgs = {
     "en": {
         "title": "❌ Language File Error - Network Mount Manager",
@@ -209,29 +221,31 @@ fallback_error_msgs = {
     }
 }
 
-try:
-    with open(lang_file_am, "r", encoding="utf-8") as f:
-        LANGS = json.load(f)
-    T = LANGS.get(LANG, LANGS["en"])
-
-    with open(lang_file_pw, "r", encoding="utf-8") as f:
-        PW_LANGS = json.load(f)
-    T_PW = PW_LANGS.get(LANG, PW_LANGS['en'])
-except Exception as e:
-    err = fallback_error_msgs.get(LANG, fallback_error_msgs["en"])
-    QMessageBox.critical(
-        None, err["title"],
-        err["text"].format(path=lang_file_am, error=e)
-    )
-    sys.exit(1)
+def load_languages():
+    global T, T_PW
+    try:
+        with open(lang_file_am, "r", encoding="utf-8") as f:
+            LANGS = json.load(f)
+        T = LANGS.get(LANG, LANGS["en"])
+
+        with open(lang_file_pw, "r", encoding="utf-8") as f:
+            PW_LANGS = json.load(f)
+        T_PW = PW_LANGS.get(LANG, PW_LANGS['en'])
+    except Exception as e:
+        err = fallback_error_msgs.get(LANG, fallback_error_msgs["en"])
+        QMessageBox.critical(
+            None, err["title"],
+            err["text"].format(path=lang_file_am, error=e)
+        )
+        sys.exit(1)
 
 def is_local_network_up() -> bool:
     try:
-        result = subprocess.run(
+        result = run_command(
             'ip -o addr show up | grep -v " lo " | grep -qE "inet(6)? "',
             shell=True
         )
-        return result.returncode == 0
+        return result.ok
     except Exception:
         return False
 
@@ -249,20 +263,23 @@ class ProgressDialog(QDialog):
         self.text_area.append(message)
         QApplication.processEvents()
 
-progress_dialog = ProgressDialog(T["title"])
-progress_dialog.show()
+def start_ui():
+    # Everything auto_mount() needs before its first log line: the application, texts and progress window
+    global app, progress_dialog
+    app = QApplication.instance() or QApplication(sys.argv)
+    app.setWindowIcon(QIcon(str(icon_path)))
+    load_languages()
+    progress_dialog = ProgressDialog(T["title"])
+    progress_dialog.show()
 
 def log(msg):
     print(msg)
-    progress_dialog.log(msg)
+    if progress_dialog is not None:
+        progress_dialog.log(msg)
 
-def mount_with_password(mount_point, path, options, password):
+def mount_with_password(cmd, path, password):
     try:
-        proc = subprocess.run(
-            ["sudo", "-S", "mount", "-t", "cifs", mount_point, path, "-o", options],
-            input=password + '\n',
-            text=True, capture_output=True
-        )
+        proc = get_helper(password).run(cmd)
         if proc.returncode != 0:
             raise RuntimeError(proc.stderr)
         add_place(os.path.basename(path), path, icon="network-server", category="mounts")
@@ -281,12 +298,9 @@ def is_ip_reachable(ip, port=445, timeout=2):
 
 def launch_net_unmounter(admin_password: str):
     log(f"{T['mountguard_log']} {T['start_unmounter']}")
-    env = os.environ.copy()
-    env["NETMOUNT_PW"] = admin_password
-
-    subprocess.Popen(
+    launch_with_password(
         ["python3", os.path.join(SMBUNMOUNT_EXEC)],
-        env=env,
+        admin_password,
         start_new_session=True
     )
 
@@ -299,11 +313,7 @@ def is_unmounter_running():
     try:
         user = getpass.getuser()
         for _ in range(3):
-            result = subprocess.run(
-                ["ps", "-u", user, "-o", "pid,cmd"],
-                stdout=subprocess.PIPE,
-                text=True
-            )
+            result = run_command(["ps", "-u", user, "-o", "pid,cmd"])
             for line in result.stdout.splitlines():
                 if "net_unmounter.py" in line and "python3" in line:
                     return True
@@ -336,15 +346,12 @@ def auto_mount():
         log(f"{T.get('error_log','[ERROR]')} {T.get('decryption_failed','Decryption failed').format(error=e)}")
         return
 
-    for m in mounts:
+    for m in sorted(mounts, key=lambda x: x.get('order', 0)):
         if not m.get('automount'):
             continue
 
         path = m['path']
         url = m['url']
-        user = m.get('user', '')
-        stored_password = m.get('password', '')
-        smb_version = m.get('smb_version', '').strip()
 
         if "last_known_status" not in m:
             m["last_known_status"] = "unknown"
@@ -361,24 +368,24 @@ def auto_mount():
 
         try:
             if url.startswith("sftp://"):
-                if prev_was_con: time.sleep(1)
-
-                remote = url[7:]
-                host_part = remote.split('/', 1)[0]
-                remote_path = '/' + remote.split('/', 1)[1] if '/' in remote else ''
-                host, port = host_part.split(':') if ':' in host_part else (host_part, '22')
-
-                key_path = os.path.expanduser(f"~/.ssh/netmount_keys/id_rsa_{host}_{port}")
+                host, port, _ = split_remote(url, "sftp")
+                key_path = sftp_key_path(host, port)
                 if not os.path.exists(key_path):
                     log(f"{T['skip_log']} {T['no_key']} {key_path}")
                     continue
 
+            if needs_smb_probe(m):
+                refresh_smb_capabilities(m)
+            cmd = build_mount_command(m, uid, gid)
+            if not cmd:
+                log(f"{T['skip_log']} {T['incomplete_entry']} {path}")
+                continue
+
+            if url.startswith("sftp://"):
+                if prev_was_con: time.sleep(1)
+
                 try:
-                    subprocess.run([
-                        "sshfs", f"{user}@{host}:{remote_path}", path,
-                        "-p", port,
-                        "-o", f"IdentityFile={key_path},uid={uid},gid={gid},StrictHostKeyChecking=no"
-                    ], check=True)
+                    run_command(cmd, timeout=MOUNT_OP_TIMEOUT, check=True)
                     add_place(os.path.basename(path), path, icon="network-server", category="mounts")
                     m["last_known_status"] = "mounted"
                     log(f"{T['ok_log']} {T['sftp_mount_ok']} {path}")
@@ -389,24 +396,15 @@ def auto_mount():
             elif url.startswith("ftp://"):
                 if prev_was_con: time.sleep(1)
 
-                remote = url[7:]
-                host_part = remote.split('/', 1)[0]
-                remote_path = '/' + remote.split('/', 1)[1] if '/' in remote else ''
-                host, port = host_part.split(':') if ':' in host_part else (host_part, '21')
-
-                try:
-                    result = subprocess.run([
-                        "curlftpfs", host, path,
-                        "-o", f"user={user}:{stored_password},uid={uid},gid={gid},ftp_port={port}"
-                    ], capture_output=True, check=True, text=True)
+                result = run_command(cmd, timeout=MOUNT_OP_TIMEOUT)
 
+                if result.ok:
                     add_place(os.path.basename(path), path, icon="network-server", category="mounts")
                     m["last_known_status"] = "mounted"
                     log(f"{T['ok_log']} {T['ftp_mount_ok']} {path}")
-
-                except subprocess.CalledProcessError as e:
-                    stderr = e.stderr.strip() if e.stderr else str(e)
-                    if "530" in stderr or "Access denied" in stderr or "Permission denied" in stderr:
+                else:
+                    stderr = result.stderr.strip() or result.error_kind
+                    if result.error_kind == ERROR_AUTH:
                         log(f"{T['error_log']} {T['ftp_auth_error']}: {stderr}")
                     else:
                         log(f"{T['error_log']} {T['ftp_mount_fail']}: {stderr}")
@@ -419,24 +417,17 @@ def auto_mount():
                     log(f"{T['skip_log']} {T['no_dir']} {path}")
                     continue
 
-                options = f"username={user},password={stored_password},uid={uid},gid={gid}"
-                if smb_version:
-                    options += f",vers={smb_version}"
-
-                mount_point = url[6:]
-                if not mount_point.startswith("//"):
-                    mount_point = f"//{mount_point}"
-
-                smb_host = mount_point.split('/')[2]
+                smb_host, _, _ = split_remote(url, "smb")
                 if not is_ip_reachable(smb_host):
                     log(f"{T['skip_log']} {T['smb_unreachable']} {smb_host}")
                     continue
 
-                if mount_with_password(mount_point, path, options, admin_password):
+                if mount_with_password(cmd, path, admin_password):
                     m["last_known_status"] = "mounted"
                     log(f"{T['ok_log']} {T['smb_mount_ok']} {path}")
                     prev_was_con = True
                 else:
+                    refresh_smb_capabilities(m)
                     log(f"{T['error_log']} {T['password_invalid_final']}")
                     return
 
@@ -455,6 +446,7 @@ def auto_mount():
     progress_dialog.close()
 
 def main():
+    start_ui()
     auto_mount()
 
 if __name__ == "__main__":
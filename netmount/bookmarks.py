@@ -1,10 +1,9 @@
 import os
 import time
 import xml.etree.ElementTree as ET
-from xml.dom import minidom
 from netmount.config import XBEL_FILE, BOOKMARK_NS
 from netmount.utils.xml_utils import prettify
-from typing import Any
+from typing import Any, Callable
 
 ET.register_namespace("bookmark", BOOKMARK_NS)
 
@@ -75,7 +74,8 @@ def clean_mount_bookmarks():
     except Exception:
         pass
 
-def regenerate_bookmarks_from_active_mounts(mounts: Any):
+def regenerate_bookmarks_from_active_mounts(mounts: Any, is_mounted: Callable[[str], bool] | None = None):
+    # is_mounted: live check of the caller; without it the stored last_known_status decides
     if not os.path.exists(XBEL_FILE):
         return
 
@@ -93,8 +93,10 @@ def regenerate_bookmarks_from_active_mounts(mounts: Any):
 
     for mount in sorted(mounts, key=lambda m: m.get("order", 0)):
         path = mount.get("path", "")
-        status = mount.get("last_known_status", "unknown")
-        if status == "mounted" and path:
+        if not path:
+            continue
+        active = is_mounted(path) if is_mounted else mount.get("last_known_status", "unknown") == "mounted"
+        if active:
             title = path.split('/')[-1]
             full_title = "MNT-" + title
             unique_id = f"{int(time.time())}/0"
@@ -1,6 +1,5 @@
 from pathlib import Path
 import os
-import xml.etree.ElementTree as ET
 
 # 📁 Alapkönyvtár
 BASE_DIR = Path.home() / "NetMountManager"
@@ -22,10 +21,12 @@ lang_file_pw = LANG_DIR / "password_prompt.json"
 # 🗂️ Konfigurációs fájl
 SECURE_FILE = DATA_DIR / ".net_mounts.secure"
 
+# 🖼️ A csatolási lista titkosítatlan pillanatképe (jelszavak nélkül) az azonnali GUI induláshoz
+STARTUP_SNAPSHOT = DATA_DIR / "gui_snapshot.json"
+
 # 📄 XBEL könyvjelzők (KDE)
 XBEL_FILE = Path.home() / ".local/share/user-places.xbel"
 BOOKMARK_NS = "http://www.freedesktop.org/standards/desktop-bookmarks"
-ET.register_namespace("bookmark", BOOKMARK_NS)
 
 # 🚀 Automatikus indulási fájlok
 AUTOMOUNT_SCRIPT = Path.home() / ".config/autostart/net-automounts.desktop"
@@ -35,5 +36,73 @@ SMBUNMOUNT_EXEC = BASE_DIR / "netmount/net_unmounter.py"
 SMBUNMOUNT_SCRIPT_D_OLD = Path.home() / ".config/autostart/net_unmounter.desktop"
 SMBUNMOUNT_SCRIPT_OLD = Path.home() / ".config/systemd/user/smb-unmount.service"
 
+# ⏳ Külső parancsok alapértelmezett határideje (mp) – lejáratkor a teljes folyamatcsoport leáll
+COMMAND_TIMEOUT = 10
+KEYGEN_TIMEOUT = 30
+KEY_INSTALL_TIMEOUT = 30
+
+# 🔑 Tömeges kulcstelepítés: egyszerre ennyi SFTP szerverrel dolgozik
+PROVISION_WORKERS = 8
+
+# 📡 GUI háttér-elérhetőségvizsgálat: párhuzamos szálak, eredmény érvényessége (mp)
+STATUS_PROBE_WORKERS = 8
+STATUS_PROBE_TTL = 30
+
+# 🔄 Lista frissítési kérések összevonása: ennyi ms-on belüli kérésekből egy frissítés lesz
+REFRESH_DEBOUNCE_MS = 50
+
+# ⏱️ GUI csatolási/lecsatolási műveletek párhuzamos szálai
+GUI_JOB_WORKERS = 4
+
+# 🚀 Hidegindítási keret (ms) belépési pontonként: modulimport és használatra kész állapot (startupbench ellenőrzi)
+STARTUP_BUDGETS_MS = {
+    "main": {"import_ms": 250, "ready_ms": 1500},
+    "auto_mount": {"import_ms": 200, "ready_ms": 600},
+    "net_unmounter": {"import_ms": 250, "ready_ms": 700},
+}
+
+# ⚙️ Daemon párhuzamos műveletek (egyidejű csatolások száma, műveletenkénti határidő másodpercben)
+DAEMON_MAX_WORKERS = 4
+MOUNT_OP_TIMEOUT = 30
+UNMOUNT_OP_TIMEOUT = 15
+
+# 🪜 Lecsatolási lépcső (normál -> -f -> -l / fusermount -uz) lépésenkénti határideje (mp); elérhetetlen szervernél a rövidebb
+UNMOUNT_STEP_TIMEOUT = 2.0
+UNMOUNT_FAST_STEP_TIMEOUT = 0.5
+
+# ⏱️ Csatolásonkénti ellenőrzési időköz (mp): hiba/változás után a minimum, stabil állapotban a plafonig nő
+CHECK_INTERVAL_MIN = 5.0
+CHECK_INTERVAL_MAX = 120.0
+CHECK_INTERVAL_BACKOFF = 1.5
+CHECK_COALESCE_WINDOW = 1.0
+
+# 🌊 Újracsatolás hálózat-helyreállás után: hullámméret, szerverenkénti egyidejű kézfogások, várakozás (mp)
+RECOVERY_WAVE_SIZE = 3
+RECOVERY_PER_HOST_LIMIT = 2
+RECOVERY_JITTER = (0.3, 1.2)
+
+# 🤝 SMB dialektus-felderítés (NEGOTIATE) gyorsítótára szerverenként, időkorlát és érvényesség (mp)
+SMB_PROBE_CACHE = DATA_DIR / "smb_probe.json"
+SMB_PROBE_TIMEOUT = 3.0
+SMB_PROBE_MAX_AGE = 7 * 24 * 3600
+
+# 🔐 sshfs titkosító-kalibráció: mért adatmennyiség (bájt), lépésenkénti határidő és újramérés gyakorisága (mp)
+SSH_TUNE_BYTES = 64 * 1024 * 1024
+SSH_TUNE_TIMEOUT = 30
+SSH_TUNE_MAX_AGE = 14 * 24 * 3600
+# 🐢 Daemon háttér-újramérés: kisebb mintával, egyszerre egy szerveren, két mérés között legalább ennyi mp
+SSH_TUNE_RECHECK_BYTES = 16 * 1024 * 1024
+SSH_TUNE_RECHECK_GAP = 3600
+
+# 🔑 Jogosultsági segédfolyamat (root) – munkamenetenként egyszer indul, helyi socketen fogad kéréseket
+RUNTIME_DIR = Path(os.environ.get("XDG_RUNTIME_DIR") or f"/run/user/{os.getuid()}")
+HELPER_SOCKET = RUNTIME_DIR / "netmount-helper.sock"
+HELPER_IDLE_TIMEOUT = 1800
+HELPER_START_TIMEOUT = 10
+
+# 🔗 SSH kapcsolat-multiplexelés: szerverenként egy ControlMaster socket, utolsó munkamenet után ennyi mp-ig él
+SSH_CONTROL_DIR = RUNTIME_DIR / "netmount-ssh"
+SSH_CONTROL_PERSIST = 300
+
 # 💡 Egyéb
 home_dir = str(Path.home())
@@ -0,0 +1,72 @@
+import copy
+import threading
+from typing import Any
+
+from PyQt6.QtCore import QObject, pyqtSignal
+
+from netmount.decryptor import encrypt
+from netmount.startupcache import save_snapshot, snapshot_entries
+
+class ConfigWriter(QObject):
+    # 💾 Write-behind persistence of the mount list: save() returns at once and the key derivation,
+    # encryption and locked write happen on a worker thread. Saves queued while one is running
+    # collapse into the newest snapshot. Failures come back through `failed` on the GUI thread.
+    failed = pyqtSignal(str)
+
+    def __init__(self, password: str, parent=None):
+        super().__init__(parent)
+        self.password = password
+        self.pending = None
+        self.busy = False
+        self.closed = False
+        self.cond = threading.Condition()
+        self.thread = threading.Thread(target=self.run, name="config-writer", daemon=True)
+        self.thread.start()
+
+    def save(self, mounts: list[dict[str, Any]]) -> None:
+        snapshot = copy.deepcopy(mounts)
+        with self.cond:
+            if not self.closed:
+                self.pending = snapshot
+                self.cond.notify_all()
+                return
+        # After close() there is no worker left to hand the snapshot to
+        self.write(snapshot)
+
+    def write(self, snapshot: list[dict[str, Any]]) -> None:
+        encrypt(self.password, snapshot)
+        save_snapshot(snapshot_entries(snapshot))
+
+    def run(self) -> None:
+        while True:
+            with self.cond:
+                while self.pending is None and not self.closed:
+                    self.cond.wait()
+                if self.pending is None:
+                    return
+                snapshot, self.pending = self.pending, None
+                self.busy = True
+            try:
+                self.write(snapshot)
+            except Exception as e:
+                try:
+                    self.failed.emit(str(e))
+                except RuntimeError:
+                    # The receiving window is already gone
+                    pass
+            finally:
+                with self.cond:
+                    self.busy = False
+                    self.cond.notify_all()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        # Blocks until the newest snapshot is on disk
+        with self.cond:
+            return self.cond.wait_for(lambda: self.pending is None and not self.busy, timeout)
+
+    def close(self) -> None:
+        # Writes what is still queued, then stops the worker; safe to call more than once
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+        self.thread.join()
@@ -4,10 +4,6 @@ import hashlib
 import json
 import fcntl
 from pathlib import Path
-from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
-from cryptography.hazmat.backends import default_backend
 from typing import Any
 
 from netmount.config import SECURE_FILE
@@ -15,6 +11,8 @@ from netmount.config import SECURE_FILE
 ITERATIONS = 100_000
 ENCODING = "utf-8"
 
+# cryptography is imported on first use: the GUI decrypts on a worker thread after its window is up
+
 class LockedSecureFile:
     def __init__(self, file_path: Path, mode: str):
         self.file_path = file_path
@@ -40,6 +38,10 @@ class LockedSecureFile:
                 pass
 
 def derive_key(password: str) -> bytes:
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+    from cryptography.hazmat.backends import default_backend
+
     salt = hashlib.md5(password.encode(ENCODING)).digest()
     kdf = PBKDF2HMAC(
         algorithm=hashes.SHA256(),
@@ -51,6 +53,8 @@ def derive_key(password: str) -> bytes:
     return base64.urlsafe_b64encode(kdf.derive(password.encode(ENCODING)))
 
 def encrypt(password: str, data: Any, file_path: Path = SECURE_FILE) -> None:
+    from cryptography.fernet import Fernet
+
     key = derive_key(password)
     fernet = Fernet(key)
     json_data = json.dumps(data).encode(ENCODING)
@@ -71,6 +75,8 @@ def decrypt(password: str, file_path: Path = SECURE_FILE) -> Any:
     except Exception:
         pass
 
+    from cryptography.fernet import Fernet
+
     key = derive_key(password)
     fernet = Fernet(key)
     with LockedSecureFile(file_path, "rb") as f:
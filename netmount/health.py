@@ -0,0 +1,62 @@
+import time
+
+# 📉 Flap damping: each reachable <-> unreachable transition adds 1 to the score,
+# which decays exponentially. Above SUPPRESS_LIMIT no action is taken until the
+# score falls back below REUSE_LIMIT.
+FLAP_HALF_LIFE = 300.0
+FLAP_SUPPRESS_LIMIT = 4.0
+FLAP_REUSE_LIMIT = 2.0
+# Once the score has decayed below this the entry counts as stable again and its flap count starts over
+FLAP_FORGET_LIMIT = 0.1
+
+class MountHealth:
+    def __init__(self, half_life: float = FLAP_HALF_LIFE):
+        self.half_life = half_life
+        self.failures = 0
+        self.successes = 0
+        self.flaps = 0
+        self.flap_score = 0.0
+        self.flapped = False
+        self.suppressed = False
+        self.last_reachable = None
+        self.updated = time.time()
+
+    def decay(self, now: float | None = None) -> None:
+        now = time.time() if now is None else now
+        elapsed = max(0.0, now - self.updated)
+        if self.half_life > 0:
+            self.flap_score *= 0.5 ** (elapsed / self.half_life)
+        self.updated = now
+
+    def record(self, reachable: bool, now: float | None = None) -> bool:
+        # Returns True when the suppression state changed during this probe
+        self.decay(now)
+        if self.flaps and self.flap_score < FLAP_FORGET_LIMIT:
+            self.flaps = 0
+            self.flap_score = 0.0
+
+        self.flapped = self.last_reachable is not None and reachable != self.last_reachable
+        if self.flapped:
+            self.flaps += 1
+            self.flap_score += 1.0
+        self.last_reachable = reachable
+
+        if reachable:
+            self.successes += 1
+            self.failures = 0
+        else:
+            self.failures += 1
+            self.successes = 0
+
+        was_suppressed = self.suppressed
+        if self.flap_score >= FLAP_SUPPRESS_LIMIT:
+            self.suppressed = True
+        elif self.flap_score < FLAP_REUSE_LIMIT:
+            self.suppressed = False
+        return was_suppressed != self.suppressed
+
+    def sustained_down(self, threshold: int) -> bool:
+        return not self.suppressed and self.failures >= max(1, threshold)
+
+    def sustained_up(self, threshold: int) -> bool:
+        return not self.suppressed and self.successes >= max(1, threshold)
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+import os
+import sys
+import time
+import shlex
+import urllib.parse
+from pathlib import Path
+from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+
+current_file = Path(__file__).resolve()
+project_root = current_file.parent.parent
+sys.path.insert(0, str(project_root))
+
+from netmount.config import KEYGEN_TIMEOUT, KEY_INSTALL_TIMEOUT, PROVISION_WORKERS
+from netmount.mount_options import key_path, KEY_TYPES
+from netmount.runner import run_command
+from netmount.sshmux import ensure_control_dir, setup_control_path, ssh_args
+
+# 🔑 SSH key generation and installation, shared by KeySetupWizard and the bulk provisioning below
+
+def connection_details(entry: dict[str, Any]) -> tuple[str, str, str, str]:
+    # (host, port, ssh_host, user); ssh_host is bracketed for IPv6 literals
+    parsed = urllib.parse.urlparse(entry.get('url', ''))
+    host = parsed.hostname
+    if not host:
+        raise ValueError("missing host")
+    user = entry.get('user') or parsed.username
+    if not user:
+        raise ValueError("missing user")
+    ssh_host = host if ':' not in host else f'[{host}]'
+    return host, str(parsed.port or 22), ssh_host, user
+
+def existing_key_type(host: str, port: str) -> str | None:
+    return next((t for t in KEY_TYPES if Path(key_path(host, port, t) + ".pub").exists()), None)
+
+def generate_key(host: str, port: str, key_type: str) -> None:
+    path = key_path(host, port, key_type)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    cmd = ["ssh-keygen", "-t", key_type, "-f", path, "-N", ""]
+    if key_type == "rsa":
+        cmd[3:3] = ["-b", "3072"]
+    run_command(cmd, timeout=KEYGEN_TIMEOUT, check=True)
+
+def remove_key(host: str, port: str, key_type: str) -> None:
+    for suffix in ("", ".pub"):
+        try:
+            os.remove(key_path(host, port, key_type) + suffix)
+        except OSError:
+            pass
+
+def read_public_key(host: str, port: str, key_type: str) -> str:
+    with open(key_path(host, port, key_type) + ".pub", "r") as f:
+        return f.read().strip()
+
+def install_command(user: str, ssh_host: str, port: str, control_path: str,
+                    messages: tuple[str, str, str] | None = None) -> list[str]:
+    # One password-authenticated session reads the public key from stdin and appends it if missing.
+    # The session doubles as ControlMaster on its own setup socket (never a mount's), so an RSA
+    # fallback install reuses it without a new handshake.
+    # messages: optional (connected, directory ready, key inserted) lines echoed back for the wizard log
+    echo = [f"echo {shlex.quote(m)}" for m in messages] if messages else ["true"] * 3
+    remote = " && ".join([
+        echo[0],
+        "umask 077",
+        "mkdir -p ~/.ssh",
+        "chmod 700 ~/.ssh",
+        echo[1],
+        "touch ~/.ssh/authorized_keys",
+        "chmod 600 ~/.ssh/authorized_keys",
+        "read -r key",
+        '{ grep -qxF "$key" ~/.ssh/authorized_keys || printf \'%s\\n\' "$key" >> ~/.ssh/authorized_keys; }',
+        echo[2],
+    ])
+    ensure_control_dir()
+    return ["sshpass", "-e", "ssh", "-p", port] + ssh_args(control_path, "auto", 60) + [
+        "-o", "PreferredAuthentications=password", "-o", "PubkeyAuthentication=no",
+        "-o", "StrictHostKeyChecking=no", "-o", "ConnectTimeout=5",
+        f"{user}@{ssh_host}", remote
+    ]
+
+def verify_command(user: str, ssh_host: str, port: str, identity: str) -> list[str]:
+    # Key login is checked on a fresh connection, bypassing the password-authenticated master
+    return [
+        "ssh", "-p", port, "-i", identity,
+        "-o", "BatchMode=yes", "-o", "IdentitiesOnly=yes", "-o", "ControlPath=none",
+        "-o", "StrictHostKeyChecking=no", "-o", "ConnectTimeout=5",
+        f"{user}@{ssh_host}", "true"
+    ]
+
+def close_command(user: str, ssh_host: str, port: str, control_path: str) -> list[str]:
+    # Ends the password-authenticated master started by install_command() on the same setup socket
+    return ["ssh", "-p", port, "-O", "exit"] + ssh_args(control_path, "no") + [f"{user}@{ssh_host}"]
+
+def provision(entry: dict[str, Any], password: str, timeout: float = KEY_INSTALL_TIMEOUT) -> dict[str, Any]:
+    # Generates (if missing), installs and verifies the key of one SFTP entry; never raises
+    started = time.monotonic()
+    outcome = {"url": entry.get("url", ""), "host": "", "port": "", "ok": False,
+               "key_type": None, "stage": None, "error": None}
+    try:
+        host, port, ssh_host, user = connection_details(entry)
+    except ValueError as e:
+        outcome.update(stage="config", error=str(e), duration=time.monotonic() - started)
+        return outcome
+    outcome.update(host=host, port=port)
+
+    env = dict(os.environ, SSHPASS=password)
+    control_path = None
+    key_type = existing_key_type(host, port)
+    try:
+        for candidate in KEY_TYPES[KEY_TYPES.index(key_type) if key_type else 0:]:
+            if key_type != candidate:
+                outcome["stage"] = "keygen"
+                generate_key(host, port, candidate)
+                key_type = candidate
+            outcome["key_type"] = key_type
+
+            outcome["stage"] = "install"
+            control_path = control_path or setup_control_path()
+            result = run_command(install_command(user, ssh_host, port, control_path), timeout=timeout,
+                                 input=read_public_key(host, port, key_type) + "\n", env=env)
+            if not result.ok:
+                outcome["error"] = result.error_kind
+                break
+
+            outcome["stage"] = "verify"
+            result = run_command(verify_command(user, ssh_host, port, key_path(host, port, key_type)), timeout=timeout)
+            if result.ok:
+                outcome.update(ok=True, stage=None, error=None)
+                break
+            outcome["error"] = result.error_kind
+            # Servers older than OpenSSH 6.5 ignore Ed25519 keys: the next type replaces it
+            if candidate != KEY_TYPES[-1]:
+                remove_key(host, port, key_type)
+    except Exception as e:
+        outcome["error"] = str(e)
+    finally:
+        if control_path:
+            run_command(close_command(user, ssh_host, port, control_path), timeout=5)
+
+    outcome["duration"] = time.monotonic() - started
+    return outcome
+
+def provision_groups(entries: list[dict[str, Any]]) -> list[list[list[int]]]:
+    # Entry indices grouped per user@host:port, those groups in turn per key file (host:port).
+    # One user@host:port is provisioned once; users sharing a key file run one after another,
+    # so ssh-keygen and the RSA fallback's remove_key never race on the same path.
+    by_key: dict[Any, dict[str, list[int]]] = {}
+    for index, entry in enumerate(entries):
+        try:
+            host, port, _, user = connection_details(entry)
+        except ValueError:
+            # Fails at the config stage without touching any key
+            by_key[("invalid", index)] = {"": [index]}
+            continue
+        by_key.setdefault((host, port), {}).setdefault(user, []).append(index)
+    return [list(users.values()) for users in by_key.values()]
+
+def provision_all(entries: list[dict[str, Any]], password: str, workers: int = PROVISION_WORKERS) -> list[dict[str, Any]]:
+    # Each user@host:port group uses the first stored password among its entries; the shared one covers the rest
+    if not entries:
+        return []
+    results: list[dict[str, Any] | None] = [None] * len(entries)
+
+    def provision_key_file(groups: list[list[int]]) -> None:
+        for group in groups:
+            members = [entries[i] for i in group]
+            own = next((e["password"] for e in members if e.get("password")), None)
+            outcome = provision(members[0], own or password)
+            for i in group:
+                results[i] = dict(outcome, url=entries[i].get("url", ""))
+
+    key_files = provision_groups(entries)
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(key_files)))) as pool:
+        list(pool.map(provision_key_file, key_files))
+    return results
+
+def pending_entries(mounts: list[dict[str, Any]], include_valid: bool = False) -> list[dict[str, Any]]:
+    pending = []
+    for mount in mounts:
+        if not mount.get("url", "").startswith("sftp://"):
+            continue
+        try:
+            host, port, _, _ = connection_details(mount)
+        except ValueError:
+            continue
+        if include_valid or not mount.get("sshkeyvalid") or existing_key_type(host, port) is None:
+            pending.append(mount)
+    return pending
+
+def apply_results(entries: list[dict[str, Any]], results: list[dict[str, Any]]) -> int:
+    # Marks each entry in place; the caller saves the config once
+    for entry, outcome in zip(entries, results):
+        entry["sshkeyvalid"] = outcome["ok"]
+    return sum(1 for outcome in results if outcome["ok"])
+
+def main():
+    import argparse
+    import getpass
+    from netmount.decryptor import decrypt, encrypt
+
+    parser = argparse.ArgumentParser(description="Install SSH keys on every SFTP host of the NetMountManager config")
+    parser.add_argument("--workers", type=int, default=PROVISION_WORKERS)
+    parser.add_argument("--all", action="store_true", help="re-install keys that are already marked valid")
+    args = parser.parse_args()
+
+    admin_password = getpass.getpass("Admin password: ")
+    mounts = decrypt(admin_password)
+    entries = pending_entries(mounts, args.all)
+    if not entries:
+        print("nothing to provision")
+        return
+
+    password = getpass.getpass(f"SSH password for {len(entries)} host(s) without a stored one: ")
+    started = time.monotonic()
+    results = provision_all(entries, password, args.workers)
+    ok = apply_results(entries, results)
+    encrypt(admin_password, mounts)
+
+    for outcome in results:
+        where = f"{outcome['host']}:{outcome['port']}" if outcome["host"] else outcome["url"]
+        status = outcome["key_type"] if outcome["ok"] else f"FAILED at {outcome['stage']}: {outcome['error']}"
+        print(f"{where:40} {outcome['duration']:6.1f}s  {status}")
+    print(f"{ok}/{len(results)} provisioned in {time.monotonic() - started:.1f}s")
+    sys.exit(0 if ok == len(results) else 1)
+
+if __name__ == "__main__":
+    main()
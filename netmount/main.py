@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 import sys
-import os
+import time
 import traceback
 from pathlib import Path
 
@@ -9,15 +9,14 @@ project_root = current_file.parent.parent
 sys.path.insert(0, str(project_root))
 
 import json
-from PyQt6.QtWidgets import QApplication, QMessageBox, QInputDialog, QLineEdit
+from PyQt6.QtWidgets import QApplication, QMessageBox
 from PyQt6.QtGui import QIcon
 from PyQt6.QtCore import QLocale, QTimer
 
 from netmount.config import icon_path, lang_file, lang_file_pw
 from netmount.mountmanager import MountManager
-from netmount.mountmanager import LoadingDialog
 
-from netmount.password_prompt import ask_admin_password
+from netmount.password_prompt import ask_admin_password, password_from_parent
 
 LANG = QLocale.system().name().split('_')[0]
 
@@ -90,24 +89,21 @@ def main():
     sys.excepthook = _global_excepthook
 
     try:
-        admin_pw = os.environ.get("NETMOUNT_PW") or ask_admin_password(T_PW)
-
-        loading = LoadingDialog(T)
-        loading.show()
-        QApplication.processEvents()
+        admin_pw = password_from_parent() or ask_admin_password(T_PW)
+        started = time.monotonic()
 
         def after_load():
             try:
-                window = MountManager(T, admin_pw)
+                # Painted from the cached snapshot; the config is decrypted in the background
+                window = MountManager(T, admin_pw, started)
 
                 app._main_window = window
 
                 try:
-                    window.refresh_with_loading(external_dialog=loading)
+                    window.refresh_list()
                 except Exception:
                     raise
 
-                loading.close()
                 window.show()
 
                 msg2 = T.get('console_app_started', 'Application started and main window shown.')
@@ -117,14 +113,10 @@ def main():
                 tb = traceback.format_exc()
                 title = T.get('fatal_error_title_0', 'Fatal error during startup')
                 short = T.get('fatal_error_text_0', 'An unexpected error occurred while starting the application. See details.')
-                try:
-                    loading.close()
-                except Exception:
-                    pass
                 show_fatal_trace(title, short, tb)
                 sys.exit(1)
 
-        QTimer.singleShot(100, after_load)
+        QTimer.singleShot(0, after_load)
         sys.exit(app.exec())
 
     except Exception:
@@ -0,0 +1,173 @@
+import os
+from typing import Any
+
+from netmount.policies import get_policy, is_suspend
+from netmount.smbprobe import cached as cached_smb_capabilities, refresh as refresh_smb_probe
+from netmount.sshmux import ensure_control_dir, mux_options, mount_control_path
+
+# 🚀 Named performance profiles, stored per entry as mount["profile"]
+PROFILE_DEFAULT = "default"
+PROFILE_LAN_BULK = "lan_bulk"
+PROFILE_WAN = "wan_latency"
+PROFILE_MEDIA = "media"
+
+PROFILES = {
+    PROFILE_DEFAULT: {},
+    PROFILE_LAN_BULK: {
+        "smb": ["rsize=4194304", "wsize=4194304", "cache=loose", "actimeo=30", "multichannel", "max_channels=4"],
+        "sftp": ["Ciphers=aes128-gcm@openssh.com", "Compression=no", "max_conns=4", "kernel_cache"],
+        "ftp": ["cache=yes", "cache_timeout=60"],
+    },
+    PROFILE_WAN: {
+        "smb": ["rsize=1048576", "wsize=1048576", "cache=strict", "actimeo=1"],
+        "sftp": ["Ciphers=chacha20-poly1305@openssh.com", "Compression=yes"],
+        "ftp": ["cache=yes", "cache_timeout=10"],
+    },
+    PROFILE_MEDIA: {
+        "smb": ["rsize=4194304", "cache=loose", "actimeo=600"],
+        "sftp": ["kernel_cache", "cache_timeout=600", "Compression=no"],
+        "ftp": ["cache=yes", "cache_timeout=600"],
+    },
+}
+
+# Multichannel is SMB 3.x only; dropped for an older dialect or a server that does not advertise it
+MULTICHANNEL_KEYS = ("multichannel", "max_channels")
+
+# 🔁 Protocol-level reconnect settings for mounts with the "suspend" policy:
+# the share stays mounted through an outage and the client reconnects by itself
+CIFS_RECOVERY_OPTIONS = ["echo_interval=5", "soft", "handletimeout=60000"]
+SSHFS_RECOVERY_OPTIONS = ["reconnect", "ServerAliveInterval=15", "ServerAliveCountMax=3"]
+
+DEFAULT_PORTS = {"smb": "445", "sftp": "22", "ftp": "21"}
+
+# 🔑 Per-host key types, in order of preference; RSA stays for servers without Ed25519 support
+KEY_TYPES = ("ed25519", "rsa")
+KEY_DIR = "~/.ssh/netmount_keys"
+
+def url_proto(url: str) -> str:
+    for proto in ("smb", "sftp", "ftp"):
+        if url.startswith(f"{proto}://"):
+            return proto
+    return "unknown"
+
+def escape_url(url: str, proto: str) -> str:
+    if proto == "ftp":
+        return url.replace(' ', '%20')
+    elif proto == "smb":
+        return url.replace(' ', r'\040')
+    return url
+
+def split_remote(url: str, proto: str) -> tuple[str, str, str]:
+    # proto://host[:port][/path] -> (host, port, "/path" or "")
+    remote = url[len(proto) + 3:]
+    host_part, sep, rest = remote.partition('/')
+    host, _, port = host_part.partition(':')
+    return host, port or DEFAULT_PORTS.get(proto, ""), '/' + rest if sep else ''
+
+def get_profile(mount: dict[str, Any]) -> str:
+    profile = mount.get("profile")
+    return profile if profile in PROFILES else PROFILE_DEFAULT
+
+def smb_capabilities(mount: dict[str, Any]) -> dict | None:
+    host, port, _ = split_remote(mount.get("url", ""), "smb")
+    return cached_smb_capabilities(host, int(port)) if host and port.isdigit() else None
+
+def refresh_smb_capabilities(mount: dict[str, Any]) -> dict | None:
+    host, port, _ = split_remote(mount.get("url", ""), "smb")
+    return refresh_smb_probe(host, int(port)) if host and port.isdigit() else None
+
+def needs_smb_probe(mount: dict[str, Any]) -> bool:
+    return url_proto(mount.get("url", "")) == "smb" and not str(mount.get("smb_version") or "").strip() \
+        and smb_capabilities(mount) is None
+
+def smb_version(mount: dict[str, Any], caps: dict | None) -> str:
+    # A version typed by the user wins; otherwise the dialect the server offered in its last NEGOTIATE
+    # (caps: the entry's cached probe result, looked up once by the caller)
+    version = str(mount.get("smb_version") or "").strip()
+    if version:
+        return version
+    return caps["dialect"] if caps else ""
+
+def tuning_options(mount: dict[str, Any], proto: str) -> list[str]:
+    # Cipher/MAC measured by sshtune for this host; overrides the profile's cipher choice
+    tuning = mount.get("ssh_tuning")
+    if proto != "sftp" or not isinstance(tuning, dict) or not tuning.get("cipher"):
+        return []
+    options = [f"Ciphers={tuning['cipher']}"]
+    if tuning.get("mac"):
+        options.append(f"MACs={tuning['mac']}")
+    return options
+
+def profile_options(mount: dict[str, Any], proto: str, caps: dict | None = None) -> list[str]:
+    options = list(PROFILES[get_profile(mount)].get(proto, []))
+    if tuning_options(mount, proto):
+        options = [o for o in options if o.partition("=")[0] not in ("Ciphers", "MACs")]
+    if proto == "smb":
+        version = smb_version(mount, caps)
+        if (version and not version.startswith("3")) or (caps and not caps.get("multichannel")):
+            options = [o for o in options if o.partition("=")[0] not in MULTICHANNEL_KEYS]
+    return options
+
+def recovery_options(mount: dict[str, Any], proto: str) -> list[str]:
+    if not is_suspend(get_policy(mount)):
+        return []
+    if proto == "smb":
+        return list(CIFS_RECOVERY_OPTIONS)
+    if proto == "sftp":
+        return list(SSHFS_RECOVERY_OPTIONS)
+    return []
+
+def join_options(base: list[str], mount: dict[str, Any], proto: str, caps: dict | None = None) -> str:
+    return ",".join(base + profile_options(mount, proto, caps) + tuning_options(mount, proto) + recovery_options(mount, proto))
+
+def key_path(host: str, port: str, key_type: str = KEY_TYPES[0]) -> str:
+    return os.path.expanduser(f"{KEY_DIR}/id_{key_type}_{host.replace(':', '_')}_{port}")
+
+def sftp_key_path(host: str, port: str) -> str:
+    # The first key that exists for this host; the preferred type's path when there is none yet
+    for key_type in KEY_TYPES:
+        path = key_path(host, port, key_type)
+        if os.path.exists(path):
+            return path
+    return key_path(host, port)
+
+def build_mount_command(mount: dict[str, Any], uid: int, gid: int) -> list[str]:
+    # The one mount command builder for the GUI, the daemon and auto_mount; [] when the entry is incomplete
+    url = mount.get("url", "")
+    path = mount.get("path", "")
+    user = mount.get("user", "")
+    password = mount.get("password", "")
+    proto = url_proto(url)
+    if not path or not user:
+        return []
+
+    if proto == "smb":
+        if not password:
+            return []
+        base = [f"username={user}", f"password={password}", f"uid={uid}", f"gid={gid}"]
+        caps = smb_capabilities(mount)
+        version = smb_version(mount, caps)
+        if version:
+            base.append(f"vers={version}")
+        source = "//" + escape_url(url[6:], "smb")
+        return ["mount", "-t", "cifs", source, path, "-o", join_options(base, mount, proto, caps)]
+
+    if proto == "ftp":
+        host, port, _ = split_remote(escape_url(url, "ftp"), proto)
+        if not host or not password:
+            return []
+        full_host = f"{host}:{port}" if port != "21" else host
+        base = [f"user={user}:{password}", f"uid={uid}", f"gid={gid}"]
+        return ["curlftpfs", full_host, path, "-o", join_options(base, mount, proto)]
+
+    if proto == "sftp":
+        host, port, remote_path = split_remote(url, proto)
+        key_path = sftp_key_path(host, port)
+        if not host or not remote_path or not os.path.exists(key_path):
+            return []
+        ensure_control_dir()
+        options = join_options([f"IdentityFile={key_path}", f"uid={uid}", f"gid={gid}", "StrictHostKeyChecking=no"], mount, proto)
+        mux = mux_options(mount_control_path(user, host, port, options))
+        return ["sshfs", f"{user}@{host}:{remote_path}", path, "-p", port, "-o", ",".join([options] + mux)]
+
+    return []
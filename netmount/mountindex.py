@@ -0,0 +1,68 @@
+import uuid
+import urllib.parse
+from typing import Any
+
+# 🆔 Every mount entry carries a persistent "id"; rows, callbacks and lookups go through it
+# instead of list positions, which go stale after a reorder or remove
+
+ID_KEY = "id"
+
+def new_id() -> str:
+    return uuid.uuid4().hex
+
+def entry_key(entry: dict[str, Any]) -> tuple[str | None, str | None]:
+    return entry.get("url"), entry.get("path")
+
+def ensure_ids(mounts: list[dict[str, Any]]) -> bool:
+    # Gives entries of older configs (and duplicated ids of hand-merged ones) a fresh id; True if any changed
+    seen = set()
+    changed = False
+    for entry in mounts:
+        if not entry.get(ID_KEY) or entry[ID_KEY] in seen:
+            entry[ID_KEY] = new_id()
+            changed = True
+        seen.add(entry[ID_KEY])
+    return changed
+
+# Results that belong to the server the entry points at, not to the entry itself
+SERVER_BOUND_KEYS = ("ssh_tuning", "sshkeyvalid")
+
+def edited_entry(previous: dict[str, Any], entry: dict[str, Any]) -> dict[str, Any]:
+    # An edit re-adds the entry from the form: it keeps its id, position and every field the form
+    # does not show; key and cipher results only while it still points at the same server
+    kept = {key: value for key, value in previous.items() if key not in entry or key in (ID_KEY, "order")}
+    if urllib.parse.urlparse(previous.get("url", "")).netloc != urllib.parse.urlparse(entry.get("url", "")).netloc:
+        for key in SERVER_BOUND_KEYS:
+            kept.pop(key, None)
+    return {**entry, **kept}
+
+class MountIndex:
+    # id -> entry and (url, path) -> entry over the mount list; the owner of the list calls
+    # add()/remove() next to every append/remove, rebuild() after a reload
+    def __init__(self, mounts: list[dict[str, Any]] | None = None):
+        self.by_id = {}
+        self.by_key = {}
+        self.rebuild(mounts or [])
+
+    def rebuild(self, mounts: list[dict[str, Any]]) -> None:
+        self.by_id = {entry[ID_KEY]: entry for entry in mounts}
+        self.by_key = {entry_key(entry): entry for entry in mounts}
+
+    def get(self, mount_id: str) -> dict[str, Any] | None:
+        return self.by_id.get(mount_id)
+
+    def find(self, url: str | None, path: str | None) -> dict[str, Any] | None:
+        return self.by_key.get((url, path))
+
+    def add(self, entry: dict[str, Any]) -> None:
+        # An id already taken by another entry (e.g. an imported copy) is replaced
+        if not entry.get(ID_KEY) or self.by_id.get(entry[ID_KEY]) not in (None, entry):
+            entry[ID_KEY] = new_id()
+        self.by_id[entry[ID_KEY]] = entry
+        self.by_key[entry_key(entry)] = entry
+
+    def remove(self, entry: dict[str, Any]) -> None:
+        if self.by_id.get(entry.get(ID_KEY)) is entry:
+            del self.by_id[entry[ID_KEY]]
+        if self.by_key.get(entry_key(entry)) is entry:
+            del self.by_key[entry_key(entry)]
@@ -0,0 +1,183 @@
+import os
+import time
+import threading
+from typing import Callable
+
+from PyQt6.QtCore import QObject, QSocketNotifier, QTimer, pyqtSignal
+
+from netmount.mountops import MOUNTINFO, parse_mountinfo, mounted_paths
+from netmount.runner import CommandResult
+
+# ⏱️ GUI mount/unmount operations: a worker runs the command, the mount table decides when it is done
+JOB_MOUNT = "mount"
+JOB_UNMOUNT = "unmount"
+
+OUTCOME_OK = "ok"
+OUTCOME_FAILED = "failed"
+OUTCOME_CANCELLED = "cancelled"
+OUTCOME_TIMEOUT = "timeout"
+
+class MountTableWatcher(QObject):
+    # The kernel flags /proc/self/mountinfo with POLLPRI whenever the mount table changes,
+    # so every mount and unmount (ours, auto_mount's or the daemon's) arrives as one event
+    changed = pyqtSignal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.notifier = None
+        try:
+            self.file = open(MOUNTINFO, "rb", buffering=0)
+        except OSError:
+            self.file = None
+            return
+        self.notifier = QSocketNotifier(self.file.fileno(), QSocketNotifier.Type.Exception, self)
+        self.notifier.activated.connect(self.on_activated)
+        self.read()
+
+    def read(self) -> set[str]:
+        if self.file is None:
+            return mounted_paths()
+        # Reading through the watched descriptor also re-arms the notification
+        self.file.seek(0)
+        data = b""
+        while chunk := self.file.read(65536):
+            data += chunk
+        return parse_mountinfo(data.decode("utf-8", errors="replace").splitlines())
+
+    def on_activated(self, *_):
+        self.changed.emit(self.read())
+
+    def close(self) -> None:
+        if self.notifier is not None:
+            self.notifier.setEnabled(False)
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+class MountJob(QObject):
+    # One mount or unmount of one path. `work` runs on a worker thread and receives a cancel event;
+    # the job is done once the mount table shows the target state, or the command fails, is
+    # cancelled or runs past `timeout`. `finished` fires exactly once, on the GUI thread.
+    finished = pyqtSignal(object)
+    command_done = pyqtSignal(object)
+
+    def __init__(self, kind: str, path: str, work: Callable[[threading.Event], CommandResult],
+                 timeout: float, parent=None):
+        super().__init__(parent)
+        self.kind = kind
+        self.path = os.path.abspath(path)
+        self.work = work
+        self.timeout = timeout
+        self.cancel_event = threading.Event()
+        self.started = time.monotonic()
+        self.result = None
+        self.outcome = None
+        self.command_done.connect(self.on_command_done)
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.expire)
+
+    def start(self, pool) -> None:
+        self.timer.start(int(self.timeout * 1000))
+        pool.submit(self.run)
+
+    def run(self) -> None:
+        try:
+            result = self.work(self.cancel_event)
+        except Exception as e:
+            result = CommandResult([], -1, "", str(e), time.monotonic() - self.started)
+        try:
+            self.command_done.emit(result)
+        except RuntimeError:
+            # The window is already gone
+            pass
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def satisfied(self, mounted: set[str]) -> bool:
+        return (self.path in mounted) == (self.kind == JOB_MOUNT)
+
+    def on_command_done(self, result: CommandResult) -> None:
+        if self.outcome is not None:
+            return
+        self.result = result
+        if self.satisfied(mounted_paths()):
+            self.finish(OUTCOME_OK)
+        elif result.cancelled:
+            self.finish(OUTCOME_CANCELLED)
+        elif not result.ok:
+            self.finish(OUTCOME_FAILED)
+        # Exit 0 without the mount table change yet: mount_table_changed() or the timeout ends it
+
+    def mount_table_changed(self, mounted: set[str]) -> None:
+        if self.outcome is None and self.satisfied(mounted):
+            self.finish(OUTCOME_OK)
+
+    def cancel(self) -> None:
+        if self.outcome is None:
+            self.cancel_event.set()
+            self.finish(OUTCOME_CANCELLED)
+
+    def expire(self) -> None:
+        if self.outcome is None:
+            self.cancel_event.set()
+            self.finish(OUTCOME_TIMEOUT)
+
+    def error_text(self) -> str:
+        if self.result is None:
+            return ""
+        return (self.result.stderr or "").strip()
+
+    def finish(self, outcome: str) -> None:
+        self.outcome = outcome
+        self.timer.stop()
+        self.finished.emit(self)
+
+class BulkRun(QObject):
+    # One action over many entries: start(item, done) launches the work of one item and calls
+    # done(item, ok, error) exactly once when it is over. At most `limit` items are in flight, so
+    # queued items do not burn their job timeout while waiting for a worker.
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal(object)
+
+    def __init__(self, items: list, start: Callable, limit: int, parent=None):
+        super().__init__(parent)
+        self.queue = list(items)
+        self.total = len(self.queue)
+        self.start = start
+        self.limit = max(1, limit)
+        self.running = []
+        self.results = []
+        self.cancelled = False
+        self.over = False
+
+    def run(self) -> None:
+        self.fill()
+
+    def fill(self) -> None:
+        while self.queue and len(self.running) < self.limit:
+            item = self.queue.pop(0)
+            self.running.append(item)
+            self.start(item, self.item_done)
+        self.finish_if_idle()
+
+    def finish_if_idle(self) -> None:
+        # start() may report back synchronously, so fill() can nest; `finished` still fires once
+        if not self.over and not self.queue and not self.running:
+            self.over = True
+            self.finished.emit(self.results)
+
+    def item_done(self, item, ok: bool, error: str | None) -> None:
+        self.running = [i for i in self.running if i is not item]
+        self.results.append((item, ok, error))
+        self.progress.emit(len(self.results), self.total)
+        self.fill()
+
+    def cancel(self, reason: str) -> None:
+        # Queued items are dropped; the caller cancels the running ones, which then report back
+        self.cancelled = True
+        dropped, self.queue = self.queue, []
+        self.results.extend((item, False, reason) for item in dropped)
+        self.progress.emit(len(self.results), self.total)
+        self.finish_if_idle()
@@ -0,0 +1,316 @@
+import time
+import threading
+from typing import Any, Callable
+from concurrent.futures import ThreadPoolExecutor
+
+from PyQt6.QtCore import Qt, QObject, QAbstractListModel, QModelIndex, QRect, QSize, QEvent, pyqtSignal
+from PyQt6.QtGui import QIcon, QColor, QPalette, QPen
+from PyQt6.QtWidgets import QApplication, QStyle, QStyledItemDelegate, QStyleOptionButton, QToolTip
+
+from netmount.config import STATUS_PROBE_WORKERS, STATUS_PROBE_TTL
+
+# 📋 Mount list: one model row per complete entry, drawn by MountItemDelegate instead of per-row widgets
+MOUNT_ROLE = Qt.ItemDataRole.UserRole + 1
+STATE_ROLE = Qt.ItemDataRole.UserRole + 2
+
+# Mount button looks, keyed by the "look" field of a row state
+LOOKS = {
+    "idle": ("#e8f5e9", "#1b5e20", "network-wired"),
+    "mounted": ("#43a047", "white", "network-connect"),
+    "error": ("#f8d7da", "#721c24", "dialog-error"),
+    "checking": ("#eeeeee", "#616161", "network-wired"),
+    "busy": ("#fff3e0", "#e65100", "process-stop"),
+}
+
+ROW_HEIGHT = 44
+BUTTON_WIDTH = 120
+TUNE_WIDTH = 28
+MARGIN = 5
+SPACING = 6
+
+def snapshot(mount: dict[str, Any], state: dict[str, Any]) -> tuple:
+    # Everything a row shows; a row is repainted only when this changes
+    return (
+        mount.get('url', ''), mount.get('path', ''), mount.get('order', 0), bool(mount.get('automount')),
+        tuple(sorted(state.items()))
+    )
+
+class MountListModel(QAbstractListModel):
+    order_changed = pyqtSignal()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.entries = []
+        self.ids = []
+        self.states = []
+        self.snapshots = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.ids)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.ids):
+            return None
+        mount = self.entries[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return mount.get('url', '')
+        if role == MOUNT_ROLE:
+            return mount
+        if role == STATE_ROLE:
+            return self.states[index.row()]
+        return None
+
+    def mount_id(self, row: int) -> str:
+        # Row -> id of the entry; MountManager resolves it through its MountIndex
+        return self.ids[row]
+
+    def sync(self, mounts: list[dict[str, Any]], states: list[dict[str, Any] | None]) -> int:
+        # Same entries in the same order: only rows whose snapshot changed are repainted.
+        # Anything else (add, remove, reorder, reload) resets the model. Returns the rows touched.
+        rows = [i for i, m in enumerate(mounts) if m.get('url') and m.get('path') and states[i] is not None]
+        entries = [mounts[i] for i in rows]
+        ids = [entry.get('id') for entry in entries]
+        row_states = [states[i] for i in rows]
+        snapshots = [snapshot(mounts[i], states[i]) for i in rows]
+
+        if ids != self.ids or any(new is not old for new, old in zip(entries, self.entries)):
+            self.beginResetModel()
+            self.entries, self.ids = entries, ids
+            self.states, self.snapshots = row_states, snapshots
+            self.endResetModel()
+            return len(rows)
+
+        self.states = row_states
+        changed = 0
+        for row, current in enumerate(snapshots):
+            if current != self.snapshots[row]:
+                index = self.index(row)
+                self.dataChanged.emit(index, index)
+                changed += 1
+        self.snapshots = snapshots
+        return changed
+
+    # --- drag and drop reordering (QListView calls moveRows for an internal move) ---
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if index.isValid():
+            return flags | Qt.ItemFlag.ItemIsDragEnabled
+        return flags | Qt.ItemFlag.ItemIsDropEnabled
+
+    def supportedDropActions(self):
+        return Qt.DropAction.MoveAction
+
+    def moveRows(self, source_parent, source_row, count, destination_parent, destination_child):
+        if count != 1 or source_parent.isValid() or destination_parent.isValid():
+            return False
+        if destination_child in (source_row, source_row + 1):
+            return False
+        if not self.beginMoveRows(source_parent, source_row, source_row, destination_parent, destination_child):
+            return False
+        target = destination_child - 1 if destination_child > source_row else destination_child
+        for items in (self.entries, self.ids, self.states, self.snapshots):
+            items.insert(target, items.pop(source_row))
+        self.endMoveRows()
+        self.order_changed.emit()
+        return True
+
+class StatusProber(QObject):
+    # Reachability checks on a worker pool; results arrive through `checked` on the GUI thread
+    checked = pyqtSignal(str, int, bool)
+
+    def __init__(self, probe: Callable[[str, int], bool], parent=None):
+        super().__init__(parent)
+        self.probe = probe
+        self.pool = ThreadPoolExecutor(max_workers=STATUS_PROBE_WORKERS)
+        self.results = {}
+        self.pending = set()
+        self.lock = threading.Lock()
+
+    def reachable(self, host: str, port: int) -> bool | None:
+        # Last known result (None before the first one); a stale result is re-checked in the background
+        key = (host, port)
+        with self.lock:
+            result = self.results.get(key)
+            if (result is None or time.monotonic() - result[1] > STATUS_PROBE_TTL) and key not in self.pending:
+                self.pending.add(key)
+                self.pool.submit(self.run, host, port)
+        return result[0] if result else None
+
+    def run(self, host: str, port: int) -> None:
+        try:
+            reachable = bool(self.probe(host, port))
+        except Exception:
+            reachable = False
+        with self.lock:
+            self.results[(host, port)] = (reachable, time.monotonic())
+            self.pending.discard((host, port))
+        try:
+            self.checked.emit(host, port, reachable)
+        except RuntimeError:
+            # The window is already gone
+            pass
+
+    def shutdown(self) -> None:
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+class MountItemDelegate(QStyledItemDelegate):
+    # Signals carry the id of the entry, not the view row
+    automount_toggled = pyqtSignal(str, int)
+    mount_clicked = pyqtSignal(str)
+    edit_clicked = pyqtSignal(str)
+    remove_clicked = pyqtSignal(str)
+    calibrate_clicked = pyqtSignal(str)
+
+    def __init__(self, T, parent=None):
+        super().__init__(parent)
+        self.T = T
+        # Theme lookups are done once here, not per row and refresh
+        self.icons = {name: QIcon.fromTheme(name) for name in
+                      ("network-wired", "network-connect", "dialog-error", "process-stop", "document-edit", "edit-delete")}
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), ROW_HEIGHT)
+
+    def parts(self, rect: QRect, state: dict[str, Any]) -> dict[str, QRect]:
+        inner = rect.adjusted(MARGIN, MARGIN, -MARGIN, -MARGIN)
+        top, height = inner.top(), inner.height()
+        right = inner.right() + 1
+        parts = {}
+        for name in ("remove", "edit", "mount"):
+            right -= BUTTON_WIDTH
+            parts[name] = QRect(right, top, BUTTON_WIDTH, height)
+            right -= SPACING
+        if state.get("tunable"):
+            right -= TUNE_WIDTH
+            parts["calibrate"] = QRect(right, top, TUNE_WIDTH, height)
+            right -= SPACING
+
+        left = inner.left()
+        parts["order"] = QRect(left, top, 40, height)
+        parts["automount"] = QRect(left + 40, top, 24, height)
+        text_left = left + 40 + 24 + MARGIN
+        text_width = max(0, right - text_left - 40)
+        parts["url"] = QRect(text_left, top, text_width // 2, height)
+        parts["arrow"] = QRect(text_left + text_width // 2, top, 40, height)
+        parts["path"] = QRect(text_left + text_width // 2 + 40, top, text_width - text_width // 2, height)
+        return parts
+
+    def buttons(self, state: dict[str, Any]) -> dict[str, dict[str, Any]]:
+        background, foreground, icon = LOOKS[state["look"]]
+        if state.get("busy"):
+            # A running operation shows its elapsed time; clicking the button cancels it
+            text = self.T['job_mounting' if state["busy"] == "mount" else 'job_unmounting'].format(seconds=state["elapsed"])
+        else:
+            text = self.T['unmount'] if state["mounted"] else self.T['mount']
+        buttons = {
+            "mount": {
+                "text": text,
+                "icon": self.icons[icon], "enabled": state["mount_enabled"],
+                "colors": (background, foreground), "tooltip": state.get("mount_tooltip", ""),
+            },
+            "edit": {"text": self.T['edit'], "icon": self.icons["document-edit"], "enabled": state.get("editable", True)},
+            "remove": {"text": self.T['remove'], "icon": self.icons["edit-delete"], "enabled": state.get("editable", True)},
+        }
+        if state.get("tunable"):
+            buttons["calibrate"] = {
+                "text": "⚡", "icon": QIcon(), "enabled": state.get("tune_enabled", True),
+                "tooltip": self.T['calibrate_tooltip'],
+            }
+        return buttons
+
+    def paint(self, painter, option, index):
+        mount = index.data(MOUNT_ROLE)
+        state = index.data(STATE_ROLE)
+        if mount is None or state is None:
+            return
+        widget = option.widget
+        style = widget.style() if widget else QApplication.style()
+        parts = self.parts(option.rect, state)
+
+        painter.save()
+        frame = option.rect.adjusted(1, 1, -1, -1)
+        if option.state & QStyle.StateFlag.State_Selected:
+            painter.setPen(QPen(option.palette.color(QPalette.ColorRole.Text), 2))
+            painter.drawRect(frame)
+        elif option.state & QStyle.StateFlag.State_MouseOver:
+            painter.setPen(QPen(option.palette.color(QPalette.ColorRole.Text), 1))
+            painter.drawRect(frame)
+
+        painter.setPen(option.palette.color(QPalette.ColorRole.Text))
+        align = Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignLeft
+        painter.drawText(parts["order"], align, f"[{mount.get('order', 0)}]")
+        painter.drawText(parts["url"], align, option.fontMetrics.elidedText(
+            mount.get('url', ''), Qt.TextElideMode.ElideMiddle, parts["url"].width()))
+        painter.drawText(parts["arrow"], Qt.AlignmentFlag.AlignCenter, "←")
+        painter.drawText(parts["path"], align, option.fontMetrics.elidedText(
+            mount.get('path', ''), Qt.TextElideMode.ElideMiddle, parts["path"].width()))
+
+        check = QStyleOptionButton()
+        check.rect = parts["automount"]
+        check.state = QStyle.StateFlag.State_On if mount.get('automount', False) else QStyle.StateFlag.State_Off
+        if state["automount_enabled"]:
+            check.state |= QStyle.StateFlag.State_Enabled
+        style.drawControl(QStyle.ControlElement.CE_CheckBox, check, painter, widget)
+
+        for name, spec in self.buttons(state).items():
+            button = QStyleOptionButton()
+            button.rect = parts[name]
+            button.text = spec["text"]
+            button.icon = spec["icon"]
+            button.iconSize = QSize(16, 16)
+            button.state = QStyle.StateFlag.State_Raised
+            button.palette = QPalette(option.palette)
+            if spec["enabled"]:
+                button.state |= QStyle.StateFlag.State_Enabled
+            if "colors" in spec:
+                button.palette.setColor(QPalette.ColorRole.Button, QColor(spec["colors"][0]))
+                button.palette.setColor(QPalette.ColorRole.ButtonText, QColor(spec["colors"][1]))
+            style.drawControl(QStyle.ControlElement.CE_PushButton, button, painter, widget)
+        painter.restore()
+
+    def hit(self, pos, option, state) -> str | None:
+        for name, rect in self.parts(option.rect, state).items():
+            if rect.contains(pos):
+                return name
+        return None
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() not in (QEvent.Type.MouseButtonPress, QEvent.Type.MouseButtonRelease):
+            return False
+        state = index.data(STATE_ROLE)
+        if state is None or event.button() != Qt.MouseButton.LeftButton:
+            return False
+        target = self.hit(event.position().toPoint(), option, state)
+        buttons = self.buttons(state)
+        if target == "automount":
+            enabled = state["automount_enabled"]
+        elif target in buttons:
+            enabled = buttons[target]["enabled"]
+        else:
+            # Text area: left to the view, so selection and dragging keep working
+            return False
+        if event.type() == QEvent.Type.MouseButtonRelease and enabled:
+            mount_id = model.mount_id(index.row())
+            if target == "automount":
+                checked = not index.data(MOUNT_ROLE).get('automount', False)
+                value = Qt.CheckState.Checked.value if checked else Qt.CheckState.Unchecked.value
+                self.automount_toggled.emit(mount_id, value)
+            else:
+                getattr(self, f"{target}_clicked").emit(mount_id)
+        return True
+
+    def helpEvent(self, event, view, option, index):
+        state = index.data(STATE_ROLE)
+        if state is None:
+            return False
+        target = self.hit(event.pos(), option, state)
+        if target == "automount":
+            tooltip = self.T['automount'] if state["automount_enabled"] else self.T['automount_disabled_not_mounted']
+        else:
+            tooltip = self.buttons(state).get(target, {}).get("tooltip", "")
+        if not tooltip:
+            QToolTip.hideText()
+            return True
+        QToolTip.showText(event.globalPos(), tooltip, view)
+        return True
@@ -1,47 +1,56 @@
 #!/usr/bin/env python3
 import sys
 import os
-import subprocess
-import json
 import re
 import urllib.parse
-import shutil
-import pwd
-import threading
-import shlex
-import tempfile
-import textwrap
 import time
 import socket
-import getpass
-import xml.etree.ElementTree as ET
-from xml.dom import minidom
+from concurrent.futures import ThreadPoolExecutor
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QLabel, QLineEdit, QPushButton,
-    QVBoxLayout, QHBoxLayout, QListWidget, QMessageBox,
-    QFileDialog, QCheckBox, QListWidgetItem, QFrame, QToolButton,
-    QDialog, QTextEdit, QInputDialog, QAbstractItemView, QSizePolicy
+    QVBoxLayout, QHBoxLayout, QListView, QMessageBox,
+    QFileDialog, QToolButton,
+    QDialog, QTextEdit, QInputDialog, QAbstractItemView, QSizePolicy,
+    QComboBox, QSpinBox, QProgressDialog
 )
-from PyQt6.QtCore import Qt, QLocale, QSize, QTimer, QObject, QThread, pyqtSignal
+from PyQt6.QtCore import Qt, QTimer, QProcess, QProcessEnvironment, pyqtSignal
 from PyQt6.QtGui import QIcon
-from datetime import datetime
-from getpass import getuser
 from pathlib import Path
 from netmount.decryptor import decrypt, encrypt
+from netmount.password_prompt import launch_with_password
+from netmount.privhelper import get_helper
+from netmount.policies import get_policy, make_policy, POLICY_ASK, POLICY_UNMOUNT, POLICY_MOUNT, POLICY_SUSPEND
 
 from netmount.config import (
-    XBEL_FILE, BOOKMARK_NS, SECURE_FILE, AUTOMOUNT_SCRIPT,
+    SECURE_FILE, AUTOMOUNT_SCRIPT,
     SMBUNMOUNT_SCRIPT_OLD, SMBUNMOUNT_SCRIPT_D_OLD,
-    AUTOMOUNT_EXEC, SMBUNMOUNT_EXEC, icon_path
+    AUTOMOUNT_EXEC, SMBUNMOUNT_EXEC, MOUNT_OP_TIMEOUT, UNMOUNT_OP_TIMEOUT, KEY_INSTALL_TIMEOUT, REFRESH_DEBOUNCE_MS, GUI_JOB_WORKERS, icon_path
+)
+from netmount.runner import run_command
+from netmount.sshtune import calibrate_mount
+from netmount.sshmux import setup_control_path
+from netmount.keyprovision import (
+    generate_key, existing_key_type, remove_key, read_public_key, install_command, verify_command, close_command,
+    pending_entries, provision_all, apply_results
+)
+from netmount.mountops import detach, cleanup_mountpoint, is_mountpoint, mounted_paths
+from netmount.mountlist import MountListModel, MountItemDelegate, StatusProber
+from netmount.configwriter import ConfigWriter
+from netmount.mountindex import MountIndex, ensure_ids, new_id, edited_entry
+from netmount.startupcache import load_snapshot, save_snapshot, snapshot_entries
+from netmount.mountjobs import MountJob, MountTableWatcher, BulkRun, JOB_MOUNT, JOB_UNMOUNT, OUTCOME_OK, OUTCOME_CANCELLED, OUTCOME_TIMEOUT
+from netmount.mount_options import (
+    build_mount_command, url_proto, needs_smb_probe, refresh_smb_capabilities, PROFILES, PROFILE_DEFAULT, get_profile,
+    split_remote, sftp_key_path, key_path, KEY_TYPES
 )
 
 def is_local_network_up() -> bool:
     try:
-        result = subprocess.run(
+        result = run_command(
             'ip -o addr show up | grep -v " lo " | grep -qE "inet(6)? "',
             shell=True
         )
-        return result.returncode == 0
+        return result.ok
     except Exception:
         return False
 
@@ -62,17 +71,60 @@ class LoadingDialog(QDialog):
         self.show()
         QApplication.processEvents()
 
+def unmounter_running() -> bool:
+    # /proc scan instead of a ps subprocess; only processes of the current user count
+    uid = os.getuid()
+    for pid in os.listdir("/proc"):
+        if not pid.isdigit():
+            continue
+        try:
+            if os.stat(f"/proc/{pid}").st_uid != uid:
+                continue
+            with open(f"/proc/{pid}/cmdline", "rb") as f:
+                cmdline = f.read().decode(errors="replace")
+        except OSError:
+            continue
+        if "net_unmounter.py" in cmdline and "python3" in cmdline:
+            return True
+    return False
+
 class MountManager(QWidget):
-    def __init__(self, T, admin_password):
+    startup_loaded = pyqtSignal(object)
+    unmounter_checked = pyqtSignal(bool)
+    keys_provisioned = pyqtSignal(object, object)
+    sftp_calibrated = pyqtSignal(str, object)
+
+    def __init__(self, T, admin_password, started=None):
         super().__init__()
-        self.network_up = is_local_network_up()
+        # Startup timing: first paint and the moment every row shows real data
+        self.started = time.monotonic() if started is None else started
+        self.startup_timing = {}
+        # Assumed until the startup loader has checked; rows stay disabled until then anyway
+        self.network_up = True
+        self.config_loaded = False
+        self.unmounter_state = None
+        # Startup loader, unmounter check and the one-off long tasks (key provisioning, cipher calibration)
+        self.background_pool = ThreadPoolExecutor(max_workers=3, thread_name_prefix="gui-background")
+        self.startup_loaded.connect(self.config_arrived)
+        self.unmounter_checked.connect(self.show_unmounter_state)
+        self.keys_provisioned.connect(self.provisioning_finished)
+        self.sftp_calibrated.connect(self.calibration_finished)
+        # Loading indicators of the running long tasks
+        self.provisioning = None
+        self.calibrations = {}
         self.T = T
         self.admin_password = admin_password
         self.setWindowTitle(self.T['title'])
         self.resize(1100, 700)
         self.setMinimumSize(1100, 700)
-        self.mounts = []
-        self.load_config()
+        # The cached snapshot is painted first; load_config() replaces it with the decrypted entries
+        self.mounts = load_snapshot()
+        self.mount_index = MountIndex(self.mounts)
+        # The entry taken out by edit_mount() until add_mount() puts it back
+        self.editing = None
+        self.config_writer = ConfigWriter(admin_password, self)
+        self.config_writer.failed.connect(self.config_save_failed)
+        QApplication.instance().aboutToQuit.connect(self.config_writer.close)
 
         layout = QVBoxLayout()
 
@@ -96,6 +148,36 @@ class MountManager(QWidget):
         self.smb_version_input.setEnabled(False)
         self.smb_version_input.setStyleSheet("background-color: #2a2a2a; color: #aaa;")
 
+        self.profile_input = QComboBox()
+        for profile in PROFILES:
+            self.profile_input.addItem(self.T[f'profile_{profile}'], profile)
+        profile_tip = QToolButton()
+        profile_tip.setText("?")
+        profile_tip.setToolTip(self.T['profile_tip'])
+
+        self.unreachable_policy_input = QComboBox()
+        self.unreachable_policy_input.addItem(self.T['policy_unreachable_ask'], POLICY_ASK)
+        self.unreachable_policy_input.addItem(self.T['policy_unreachable_unmount'], POLICY_UNMOUNT)
+        self.unreachable_policy_input.addItem(self.T['policy_unreachable_suspend'], POLICY_SUSPEND)
+        self.unreachable_after_input = QSpinBox()
+        self.unreachable_after_input.setRange(0, 86400)
+        self.unreachable_after_input.setSingleStep(30)
+        self.unreachable_after_input.setPrefix(self.T['policy_unreachable_after'] + " ")
+        self.unreachable_after_input.setSuffix(" s")
+        self.reachable_policy_input = QComboBox()
+        self.reachable_policy_input.addItem(self.T['policy_reachable_ask'], POLICY_ASK)
+        self.reachable_policy_input.addItem(self.T['policy_reachable_mount'], POLICY_MOUNT)
+        self.fail_threshold_input = QSpinBox()
+        self.fail_threshold_input.setRange(1, 100)
+        self.fail_threshold_input.setPrefix(self.T['policy_fail_threshold'] + " ")
+        self.success_threshold_input = QSpinBox()
+        self.success_threshold_input.setRange(1, 100)
+        self.success_threshold_input.setPrefix(self.T['policy_success_threshold'] + " ")
+        policy_tip = QToolButton()
+        policy_tip.setText("?")
+        policy_tip.setToolTip(self.T['policy_tip'])
+        self.set_policy_fields(get_policy({}))
+
         self.user_input = QLineEdit()
         self.user_input.setPlaceholderText(self.T['user'])
         self.pass_input = QLineEdit()
@@ -114,6 +196,8 @@ class MountManager(QWidget):
 
         self.unmounter_btn = QPushButton()
         self.unmounter_btn.setFixedWidth(250)
+        self.unmounter_btn.setText("⏳ " + self.T["start_unmounter"])
+        self.unmounter_btn.setEnabled(False)
         self.update_unmounter_button()
         self.unmounter_btn.setToolTip(self.T['smb_unmounter_tooltip'])
         self.unmounter_btn.clicked.connect(self.toggle_unmounter)
@@ -135,6 +219,11 @@ class MountManager(QWidget):
         import_btn.setToolTip(self.T['import_tooltip'])
         import_btn.clicked.connect(self.import_secure_config)
 
+        # Everything that changes the config waits for the decrypted one
+        self.config_widgets = [add_btn, export_btn, import_btn]
+        for widget in self.config_widgets:
+            widget.setEnabled(False)
+
         user_row = QHBoxLayout()
         user_row.addWidget(self.user_input)
         user_row.addSpacing(5)
@@ -151,7 +240,46 @@ class MountManager(QWidget):
         btn_row.addSpacing(5)
         btn_row.addWidget(self.unmounter_btn)
 
-        self.list_widget = QListWidget()
+        self.status_prober = StatusProber(self.is_host_reachable, self)
+        self.status_prober.checked.connect(lambda *_: self.request_refresh(quiet=True))
+        self.loading_dialog = None
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setSingleShot(True)
+        self.refresh_timer.setInterval(REFRESH_DEBOUNCE_MS)
+        self.refresh_timer.timeout.connect(self.run_pending_refresh)
+        self.jobs = {}
+        self.job_pool = ThreadPoolExecutor(max_workers=GUI_JOB_WORKERS)
+        # While operations run, their rows are repainted once a second with the elapsed time
+        self.job_ticker = QTimer(self)
+        self.job_ticker.setInterval(1000)
+        self.job_ticker.timeout.connect(lambda: self.request_refresh(quiet=True))
+        self.mount_watcher = MountTableWatcher(self)
+        self.mount_watcher.changed.connect(self.mount_table_changed)
+        self.mount_model = MountListModel(self)
+        self.mount_delegate = MountItemDelegate(self.T, self)
+        self.mount_delegate.automount_toggled.connect(self.toggle_automount)
+        self.mount_delegate.mount_clicked.connect(self.toggle_mount)
+        self.mount_delegate.edit_clicked.connect(self.edit_mount)
+        self.mount_delegate.remove_clicked.connect(self.remove_mount)
+        self.mount_delegate.calibrate_clicked.connect(self.calibrate_sftp)
+        self.list_view = QListView()
+        self.list_view.setModel(self.mount_model)
+        self.list_view.setItemDelegate(self.mount_delegate)
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setMouseTracking(True)
+
+        self.bulk = None
+        self.bulk_dialog = None
+        bulk_row = QHBoxLayout()
+        self.bulk_buttons = {}
+        for action, icon in (("mount", "network-connect"), ("unmount", "network-disconnect"), ("remount", "view-refresh")):
+            button = QPushButton(self.T[f'bulk_{action}'])
+            button.setIcon(QIcon.fromTheme(icon))
+            button.setToolTip(self.T['bulk_tooltip'])
+            button.setEnabled(False)
+            button.clicked.connect(lambda _, a=action: self.bulk_action(a))
+            bulk_row.addWidget(button)
+            self.bulk_buttons[action] = button
 
         url_h = QHBoxLayout()
         url_h.addWidget(self.url_input)
@@ -164,16 +292,28 @@ class MountManager(QWidget):
         smb_h = QHBoxLayout()
         smb_h.addWidget(self.smb_version_input)
         smb_h.addWidget(smb_version_tip)
+        smb_h.addWidget(self.profile_input)
+        smb_h.addWidget(profile_tip)
 
         layout.addLayout(url_h)
         layout.addLayout(path_h)
+        policy_h = QHBoxLayout()
+        policy_h.addWidget(self.unreachable_policy_input)
+        policy_h.addWidget(self.unreachable_after_input)
+        policy_h.addWidget(self.reachable_policy_input)
+        policy_h.addWidget(self.fail_threshold_input)
+        policy_h.addWidget(self.success_threshold_input)
+        policy_h.addWidget(policy_tip)
+
         layout.addLayout(smb_h)
+        layout.addLayout(policy_h)
         layout.addLayout(user_row)
         layout.addLayout(pass_row)
         layout.addLayout(btn_row)
-        layout.addWidget(self.list_widget)
+        layout.addWidget(self.list_view)
+        layout.addLayout(bulk_row)
 
-        current_year = datetime.now().year
+        current_year = time.localtime().tm_year
         footer = QLabel()
         footer.setTextFormat(Qt.TextFormat.RichText)
         footer.setTextInteractionFlags(Qt.TextInteractionFlag.TextBrowserInteraction)
@@ -202,80 +342,70 @@ class MountManager(QWidget):
         self.remove_old_services()
         self.create_autostart_service()
         self.enable_reordering_features()
+        self.list_view.setDragEnabled(False)
+        self.start_loading()
 
     def enable_reordering_features(self):
-        self.list_widget.setDragDropMode(QAbstractItemView.DragDropMode.InternalMove)
-        self.list_widget.model().rowsMoved.connect(self.save_current_order)
-
-        self.list_widget.setStyleSheet("""
-QListWidget::item {
-    border: 1px solid transparent;
-    padding: 5px;
-}
-
-QListWidget::item:selected {
-    border: 2px solid;
-    background-color: transparent;
-}
-
-QListWidget::item:hover {
-    border: 1px solid;
-    background-color: transparent;
-}
-        """)
+        self.list_view.setDragDropMode(QAbstractItemView.DragDropMode.InternalMove)
+        self.list_view.setDefaultDropAction(Qt.DropAction.MoveAction)
+        self.list_view.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.list_view.selectionModel().selectionChanged.connect(self.update_bulk_buttons)
+        self.mount_model.modelReset.connect(self.update_bulk_buttons)
+        self.mount_model.order_changed.connect(self.save_current_order)
 
     def save_current_order(self):
-        for i in range(self.list_widget.count()):
-            item = self.list_widget.item(i)
-            widget = self.list_widget.itemWidget(item)
-            if widget:
-                labels = widget.findChildren(QLabel)
-                path = ""
-                url = ""
-                for label in labels:
-                    text = label.text()
-                    if text.startswith("smb://") or text.startswith("ftp://") or text.startswith("sftp://"):
-                        url = text
-                    elif text.startswith("/"):
-                        path = text
-
-                for mount in self.mounts:
-                    if mount['path'] == path and mount['url'] == url:
-                        mount['order'] = i
-                        break
+        for row in range(self.mount_model.rowCount()):
+            self.mount_index.get(self.mount_model.mount_id(row))['order'] = row
 
         self.save_config()
-        self.refresh_with_loading()
+        self.request_refresh()
         self.regenerate_bookmarks_from_active_mounts()
 
+    def closeEvent(self, event):
+        # Running operations are stopped without their result dialogs
+        for job in list(self.jobs.values()):
+            job.finished.disconnect()
+            job.cancel()
+        self.job_pool.shutdown(wait=False, cancel_futures=True)
+        self.background_pool.shutdown(wait=False, cancel_futures=True)
+        self.mount_watcher.close()
+        self.status_prober.shutdown()
+        self.config_writer.close()
+        super().closeEvent(event)
+
     def is_unmounter_running(self):
         try:
-            user = getpass.getuser()
-            result = subprocess.run(
-                ["ps", "-u", user, "-o", "pid,cmd"],
-                stdout=subprocess.PIPE,
-                text=True
-            )
-            for line in result.stdout.splitlines():
-                if "net_unmounter.py" in line and "python3" in line:
-                    return True
-            return False
+            return unmounter_running()
         except Exception:
             return False
 
     def update_unmounter_button(self):
-        if self.is_unmounter_running():
+        # The process scan runs off the GUI thread; the button follows through unmounter_checked
+        def check():
+            try:
+                self.unmounter_checked.emit(self.is_unmounter_running())
+            except RuntimeError:
+                # The window is already gone
+                pass
+
+        self.background_pool.submit(check)
+
+    def show_unmounter_state(self, running):
+        first = self.unmounter_state is None
+        self.unmounter_state = running
+        self.unmounter_btn.setEnabled(True)
+        if running:
             self.unmounter_btn.setText("🟢 " + self.T["stop_unmounter"])
         else:
             self.unmounter_btn.setText("🛑 " + self.T["start_unmounter"])
+        if first:
+            self.request_refresh(quiet=True)
 
     def toggle_unmounter(self):
         if self.is_unmounter_running():
-            subprocess.run(["pkill", "-f", "net_unmounter.py"])
+            run_command(["pkill", "-f", "net_unmounter.py"])
         else:
-            env = os.environ.copy()
-            env["NETMOUNT_PW"] = self.admin_password
-            subprocess.Popen(["python3", SMBUNMOUNT_EXEC], env=env)
+            launch_with_password(["python3", str(SMBUNMOUNT_EXEC)], self.admin_password)
 
         QTimer.singleShot(1000, self.update_unmounter_button)
 
@@ -285,21 +415,41 @@ QListWidget::item:hover {
         self.smb_version_input.clear()
         self.user_input.clear()
         self.pass_input.clear()
+        self.set_policy_fields(get_policy({}))
+        self.profile_input.setCurrentIndex(self.profile_input.findData(PROFILE_DEFAULT))
         self.smb_version_input.setEnabled(False)
         self.smb_version_input.setStyleSheet("background-color: #2a2a2a; color: #aaa;")
 
-    def refresh_with_loading(self, external_dialog=None):
-        if external_dialog:
-            self.loading_dialog = external_dialog
-        else:
-            self.loading_dialog = LoadingDialog(self.T, self)
-            self.loading_dialog.show()
-            QApplication.processEvents()
+    def set_policy_fields(self, policy):
+        self.unreachable_policy_input.setCurrentIndex(self.unreachable_policy_input.findData(policy['on_unreachable']))
+        self.unreachable_after_input.setValue(policy['unreachable_after'])
+        self.reachable_policy_input.setCurrentIndex(self.reachable_policy_input.findData(policy['on_reachable']))
+        self.fail_threshold_input.setValue(policy['fail_threshold'])
+        self.success_threshold_input.setValue(policy['success_threshold'])
+
+    def policy_from_fields(self):
+        return make_policy(
+            self.unreachable_policy_input.currentData(),
+            self.unreachable_after_input.value(),
+            self.reachable_policy_input.currentData(),
+            self.fail_threshold_input.value(),
+            self.success_threshold_input.value()
+        )
 
-        self.refresh_list()
+    def request_refresh(self, quiet=False):
+        # Every request inside the debounce window ends in a single refresh_list(); the one
+        # loading indicator stays up until it has run
+        if not quiet:
+            if self.loading_dialog is None:
+                self.loading_dialog = LoadingDialog(self.T, self)
+            else:
+                self.loading_dialog.show()
+        self.refresh_timer.start()
 
-        if not external_dialog:
-            QTimer.singleShot(200, self.loading_dialog.close)
+    def run_pending_refresh(self):
+        self.refresh_list()
+        if self.loading_dialog is not None:
+            self.loading_dialog.hide()
 
     def on_url_changed(self, text):
         url = text.strip().lower()
@@ -322,11 +472,44 @@ QListWidget::item:hover {
             self.pass_input.setStyleSheet("")
             self.pass_input.setPlaceholderText(self.T['password'])
 
-    def load_config(self):
+    def start_loading(self):
+        # PBKDF2 decryption and the network check run on a worker; the snapshot stays on screen meanwhile
+        def load():
+            network_up = is_local_network_up()
+            try:
+                loaded = (network_up, decrypt(self.admin_password), None)
+            except Exception as e:
+                loaded = (network_up, None, e)
+            try:
+                self.startup_loaded.emit(loaded)
+            except RuntimeError:
+                # The window is already gone
+                pass
+
+        self.background_pool.submit(load)
+
+    def config_arrived(self, loaded):
+        network_up, data, error = loaded
+        self.network_up = network_up
+        self.startup_timing["config_ms"] = (time.monotonic() - self.started) * 1000
+        self.load_config(data, error)
+
+        self.config_loaded = True
+        for widget in self.config_widgets:
+            widget.setEnabled(True)
+        self.list_view.setDragEnabled(True)
+        self.update_bulk_buttons()
+        self.background_pool.submit(save_snapshot, snapshot_entries(self.mounts))
+        self.refresh_list()
+
+    def load_config(self, data, error=None):
+        # data/error: the result of decrypt() on the startup loader
         try:
             self.mounts = []
 
-            self.mounts = decrypt(self.admin_password)
+            if error is not None:
+                raise error
+            self.mounts = data
 
             if not isinstance(self.mounts, list):
                 raise ValueError(self.T.get('secure_not_list', 'Configuration data is not of list type.'))
@@ -337,6 +520,8 @@ QListWidget::item:hover {
                 if 'order' not in mount:
                     mount['order'] = i
                     updated = True
+            if ensure_ids(self.mounts):
+                updated = True
 
             self.mounts.sort(key=lambda x: x.get('order', 0))
 
@@ -378,123 +563,95 @@ QListWidget::item:hover {
                 QMessageBox.critical(self, self.T['error'], self.T['config_load_failed'].format(str(e)))
                 self.mounts = []
 
+        self.mount_index.rebuild(self.mounts)
+
     def save_config(self):
-        try:
-            encrypt(self.admin_password, self.mounts)
-        except Exception as e:
-            QMessageBox.critical(self, self.T['error'], self.T['config_save_failed'].format(str(e)))
+        # Queued for the background writer; only the newest snapshot of a burst gets encrypted.
+        # Before the decrypted config arrives self.mounts is only the cached snapshot: never saved.
+        if not self.config_loaded:
+            return
+        self.config_writer.save(self.mounts)
+
+    def config_save_failed(self, error):
+        QMessageBox.critical(self, self.T['error'], self.T['config_save_failed'].format(error))
 
     def refresh_list(self):
-        self.list_widget.clear()
-        self.smb_check_threads = []
         self.mounts.sort(key=lambda x: x.get('order', 0))
+        # One mount table read per refresh instead of ismount() calls for every row
+        mounted = self.mount_watcher.read() if self.network_up else set()
+        states = [self.row_state(mount, mounted) for mount in self.mounts]
+        self.mount_model.sync(self.mounts, states)
+        if "accurate_ms" not in self.startup_timing:
+            self.check_startup_accurate(states)
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if "first_paint_ms" not in self.startup_timing:
+            self.startup_timing["first_paint_ms"] = (time.monotonic() - self.started) * 1000
+            print(self.T['console_startup_first_paint'].format(ms=self.startup_timing["first_paint_ms"]), file=sys.stderr)
+
+    def check_startup_accurate(self, states):
+        # Fully accurate: decrypted config, daemon state known and no row still waiting for a probe
+        if not self.config_loaded or self.unmounter_state is None:
+            return
+        if any(state is not None and state["look"] == "checking" for state in states):
+            return
+        self.startup_timing["accurate_ms"] = (time.monotonic() - self.started) * 1000
+        print(self.T['console_startup_accurate'].format(
+            ms=self.startup_timing["accurate_ms"], config_ms=self.startup_timing["config_ms"]), file=sys.stderr)
 
-        for i, mount in enumerate(self.mounts):
-            try:
-                url = mount.get('url', '')
-                path = mount.get('path', '')
-                order = mount.get('order', 0)
-                last_known_status = mount.get('last_known_status', 'unknown')
-                if not url or not path:
-                    continue
-
-                label_order = QLabel(f"[{order}]")
-                label_order.setFixedWidth(40)
-
-                item = QListWidgetItem()
-                widget = QWidget()
-                h = QHBoxLayout()
-
-                label_order = QLabel(f"[{order}]")
-                label_order.setFixedWidth(40)
-
-                checkbox = QCheckBox()
-                checkbox.setChecked(mount.get('automount', False))
-                checkbox.setToolTip(self.T['automount'])
+    def row_state(self, mount, mounted):
+        # What the delegate draws for one entry; None hides the row
+        try:
+            url = mount.get('url', '')
+            path = mount.get('path', '')
+            if not url or not path:
+                return None
+
+            is_mounted = os.path.abspath(path) in mounted
+            is_sftp = url.startswith("sftp://")
+            has_key = is_sftp and self.has_keyfile(mount)
+            job = self.jobs.get(os.path.abspath(path))
+            state = {
+                "busy": job.kind if job else None,
+                "elapsed": int(job.elapsed()) if job else 0,
+                "mounted": is_mounted,
+                "automount_enabled": is_mounted and self.network_up,
+                "mount_enabled": True,
+                "look": "idle",
+                "mount_tooltip": "",
+                "tunable": has_key,
+                "tune_enabled": self.network_up,
+                "editable": True,
+            }
 
-                if not self.is_mounted(path) or not self.network_up:
-                    checkbox.setEnabled(False)
-                    checkbox.setToolTip(self.T['automount_disabled_not_mounted'])
-                else:
-                    checkbox.stateChanged.connect(lambda state, idx=i: self.toggle_automount(idx, state))
-
-                label_url = QLabel(f"{url}")
-                label_url.setStyleSheet("QLabel { padding-left: 5px; }")
-                label_url.setMinimumWidth(130)
-
-                label_arrow = QLabel(f"←")
-                label_arrow.setFixedWidth(40)
-                label_arrow.setStyleSheet("QLabel { padding-left: 5px; padding-right: 5px;}")
-
-                label_path = QLabel(f"{path}")
-                label_path.setMinimumWidth(130)
-
-                mount_btn = QPushButton(self.T['mount'] if not self.is_mounted(path) else self.T['unmount'])
-                mount_btn.setFixedWidth(120)
-                mount_btn.clicked.connect(lambda _, idx=i, b=mount_btn: self.toggle_mount(idx, b))
-
-                edit_btn = QPushButton(self.T['edit'])
-                edit_btn.setFixedWidth(120)
-                edit_btn.setIcon(QIcon.fromTheme("document-edit"))
-                edit_btn.clicked.connect(lambda _, idx=i: self.edit_mount(idx))
-
-                del_btn = QPushButton(self.T['remove'])
-                del_btn.setFixedWidth(120)
-                del_btn.setIcon(QIcon.fromTheme("edit-delete"))
-                del_btn.clicked.connect(lambda _, idx=i: self.remove_mount(idx))
-
-                h.addWidget(label_order)
-                h.addWidget(checkbox)
-                h.addWidget(label_url)
-                h.addWidget(label_arrow)
-                h.addWidget(label_path)
-                h.addStretch()
-                h.addWidget(mount_btn)
-                h.addWidget(edit_btn)
-                h.addWidget(del_btn)
-                h.setContentsMargins(5, 5, 5, 5)
-
-                widget.setLayout(h)
-                item.setSizeHint(widget.sizeHint())
-                self.list_widget.addItem(item)
-                self.list_widget.setItemWidget(item, widget)
-
-                mount_btn.setEnabled(True)
-                mount_btn.setToolTip("")
-                mount_btn.setIcon(QIcon.fromTheme("network-wired"))
-                mount_btn.setStyleSheet("background-color: #e8f5e9; color: #1b5e20;")
-
-                if not self.network_up:
-                    mount_btn.setEnabled(False)
-                    mount_btn.setToolTip(self.T['network_unavailable_tooltip'])
-
-                elif self.is_mounted(mount['path']):
-                    mount_btn.setIcon(QIcon.fromTheme("network-connect"))
-                    mount_btn.setStyleSheet("background-color: #43a047; color: white;")
-
-                elif url.startswith("sftp://") and not self.has_keyfile(mount):
-                    mount_btn.setEnabled(False)
-                    mount_btn.setIcon(QIcon.fromTheme("dialog-error"))
-                    mount_btn.setToolTip(self.T['no_installed_ssh_key'])
-                    mount_btn.setStyleSheet("background-color: #f8d7da; color: #721c24;")
-
-                elif url.startswith("sftp://") and mount.get("sshkeyvalid") is False:
-                    mount_btn.setEnabled(False)
-                    mount_btn.setIcon(QIcon.fromTheme("dialog-error"))
-                    mount_btn.setToolTip(self.T['sshkey_invalid_tooltip'])
-                    mount_btn.setStyleSheet("background-color: #f8d7da; color: #721c24;")
-
-                elif url.startswith("smb://"):
-                    host = url[6:].split('/')[0].split(':')[0]
-                    if not self.is_host_reachable(host):
-                        mount_btn.setEnabled(False)
-                        mount_btn.setIcon(QIcon.fromTheme("dialog-error"))
-                        mount_btn.setToolTip(self.T['host_unreachable_smb'])
-                        mount_btn.setStyleSheet("background-color: #f8d7da; color: #721c24;")
+            if job:
+                state.update(look="busy", mount_tooltip=self.T['job_cancel_tooltip'])
+            elif not self.network_up:
+                state.update(mount_enabled=False, mount_tooltip=self.T['network_unavailable_tooltip'])
+            elif is_mounted:
+                state["look"] = "mounted"
+            elif is_sftp and not has_key:
+                state.update(mount_enabled=False, look="error", mount_tooltip=self.T['no_installed_ssh_key'])
+            elif is_sftp and mount.get("sshkeyvalid") is False:
+                state.update(mount_enabled=False, look="error", mount_tooltip=self.T['sshkey_invalid_tooltip'])
+            elif url.startswith("smb://"):
+                host, port, _ = split_remote(url, "smb")
+                reachable = self.status_prober.reachable(host, int(port)) if port.isdigit() else False
+                if reachable is None:
+                    state.update(mount_enabled=False, look="checking", mount_tooltip=self.T['status_checking'])
+                elif not reachable:
+                    state.update(mount_enabled=False, look="error", mount_tooltip=self.T['host_unreachable_smb'])
+
+            if not self.config_loaded:
+                # A row of the cached snapshot: shown, but nothing can be done with it yet
+                state.update(mount_enabled=False, automount_enabled=False, tune_enabled=False, editable=False,
+                             mount_tooltip=self.T['loading_check'])
+            return state
 
-            except Exception as e:
-                print(f"{self.T.get('warning','Warning')} {self.T.get('mount_item_error','Mount item error')} {e}")
-                continue
+        except Exception as e:
+            print(f"{self.T.get('warning','Warning')} {self.T.get('mount_item_error','Mount item error')} {e}")
+            return None
 
     def export_secure_config(self):
         path, _ = QFileDialog.getSaveFileName(
@@ -511,6 +668,8 @@ QListWidget::item:hover {
             if dest_path.suffix.lower() != ".secure":
                 dest_path = dest_path.with_suffix(".secure")
 
+            # The exported file must match the list as it is now, not as the writer last saw it
+            self.config_writer.flush()
             encrypt(self.admin_password, self.mounts)
 
             if not os.path.exists(SECURE_FILE):
@@ -518,6 +677,7 @@ QListWidget::item:hover {
                 QMessageBox.critical(self, self.T['error'], self.T['export_failed'].format(missing_msg))
                 return
 
+            import shutil
             shutil.copy2(SECURE_FILE, str(dest_path))
 
             QMessageBox.information(self, self.T['success'], self.T['export_success'].format(str(dest_path)))
@@ -550,15 +710,13 @@ QListWidget::item:hover {
             if not isinstance(imported, list):
                 raise ValueError("Invalid configuration format.")
 
-            existing = {(m.get("url"), m.get("path")): i for i, m in enumerate(self.mounts)}
             added, replaced = 0, 0
+            touched = []
 
             for item in imported:
                 key = (item.get("url"), item.get("path"))
-                if key in existing:
-                    idx = existing[key]
-                    existing_entry = self.mounts[idx]
-
+                existing_entry = self.mount_index.find(*key)
+                if existing_entry is not None:
                     reply = QMessageBox.question(
                         self,
                         self.T['duplicate_entry_title'],
@@ -567,50 +725,147 @@ QListWidget::item:hover {
                     )
 
                     if reply == QMessageBox.StandardButton.Yes:
-                        self.mounts[idx] = item
+                        # Replaced in place, so the entry keeps its id and its row
+                        mount_id = existing_entry['id']
+                        existing_entry.clear()
+                        existing_entry.update(item, id=mount_id)
+                        touched.append(existing_entry)
                         replaced += 1
                 else:
                     self.mounts.append(item)
-                    existing[key] = len(self.mounts) - 1
+                    self.mount_index.add(item)
+                    touched.append(item)
                     added += 1
 
             if added == 0 and replaced == 0:
                 QMessageBox.information(self, self.T['info'], self.T['import_no_new'])
             else:
-                encrypt(self.admin_password, self.mounts)
-                self.refresh_with_loading()
+                self.save_config()
+                self.request_refresh()
                 QMessageBox.information(
                     self, self.T['success'],
                     self.T['import_result_summary'].format(added=added, replaced=replaced)
                 )
+                self.provision_keys(touched)
 
         except Exception as e:
             QMessageBox.critical(self, self.T['error'], self.T['import_failed'].format(str(e)))
 
-    def run_with_sudo(self, command: list[str]) -> bool:
-        try:
-            proc = subprocess.run(
-                ["sudo", "-S"] + command,
-                input=self.admin_password + "\n",
-                capture_output=True,
-                text=True
-            )
-            if proc.returncode == 0:
-                return True
+    def provision_keys(self, entries):
+        # Bulk counterpart of KeySetupWizard: every SFTP entry without a working key, in parallel
+        pending = pending_entries(entries)
+        if not pending or self.provisioning is not None:
+            return
+
+        reply = QMessageBox.question(
+            self, self.T['provision_title'], self.T['provision_prompt'].format(count=len(pending)),
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+        password, ok = QInputDialog.getText(
+            self, self.T['provision_title'], self.T['provision_password'], QLineEdit.EchoMode.Password
+        )
+        if not ok:
+            return
+
+        self.provisioning = LoadingDialog(self.T, self)
+
+        def work():
+            results = provision_all(pending, password)
+            try:
+                self.keys_provisioned.emit(pending, results)
+            except RuntimeError:
+                # The window is already gone
+                pass
+
+        self.background_pool.submit(work)
+
+    def provisioning_finished(self, pending, results):
+        self.provisioning.close()
+        self.provisioning = None
+        succeeded = apply_results(pending, results)
+        self.save_config()
+
+        lines = []
+        for outcome in results:
+            where = f"{outcome['host']}:{outcome['port']}" if outcome['host'] else outcome['url']
+            if outcome['ok']:
+                lines.append(self.T['provision_host_ok'].format(
+                    host=where, key_type=outcome['key_type'], duration=outcome['duration']))
             else:
-                QMessageBox.critical(
-                    self,
-                    self.T['error'],
-                    self.T['admin_error'].format(proc.stderr)
-                )
-                return False
-        except Exception as e:
-            QMessageBox.critical(
-                self,
-                self.T['error'],
-                self.T['admin_error'].format(str(e))
-            )
-            return False
+                lines.append(self.T['provision_host_failed'].format(
+                    host=where, stage=outcome['stage'], error=outcome['error'], duration=outcome['duration']))
+        summary = self.T['provision_summary'].format(ok=succeeded, total=len(results))
+        QMessageBox.information(self, self.T['provision_title'], summary + "\n\n" + "\n".join(lines))
+        self.request_refresh()
+
+    def start_job(self, kind, mount, work, timeout, on_done):
+        # Runs `work` on the job pool; on_done(job) is called on the GUI thread once the job has an outcome
+        job = MountJob(kind, mount['path'], work, timeout, self)
+        job.finished.connect(lambda finished_job: self.job_finished(finished_job, on_done))
+        self.jobs[job.path] = job
+        job.start(self.job_pool)
+        self.job_ticker.start()
+        self.request_refresh(quiet=True)
+        return job
+
+    def job_finished(self, job, on_done):
+        self.jobs.pop(job.path, None)
+        if not self.jobs:
+            self.job_ticker.stop()
+        self.request_refresh(quiet=True)
+        on_done(job)
+
+    def mount_table_changed(self, mounted):
+        for job in list(self.jobs.values()):
+            job.mount_table_changed(mounted)
+        self.request_refresh(quiet=True)
+
+    def job_failure_text(self, job, failed_text):
+        if job.outcome == OUTCOME_CANCELLED:
+            return self.T['job_cancelled']
+        if job.outcome == OUTCOME_TIMEOUT:
+            return self.T['job_timeout'].format(seconds=int(job.timeout))
+        return f"{failed_text}\n\n{job.error_text()}".strip()
+
+    def report_job_failure(self, job, failed_text):
+        if job.outcome == OUTCOME_CANCELLED:
+            QMessageBox.information(self, self.T['info'], self.T['job_cancelled'])
+        else:
+            QMessageBox.critical(self, self.T['error'], self.job_failure_text(job, failed_text))
+
+    def unmount_job(self, mount, on_done):
+        # umount -> umount -f -> umount -l (fusermount -u -> -uz) on the job pool
+        path = mount['path']
+        is_smb = mount['url'].startswith("smb://")
+        helper = get_helper(self.admin_password)
+
+        def work(cancel):
+            result, _ = detach(path, not is_smb, helper.run, cancel=cancel)
+            return result
+
+        return self.start_job(JOB_UNMOUNT, mount, work, UNMOUNT_OP_TIMEOUT, on_done)
+
+    def start_unmount(self, mount, then):
+        # then() runs once the path has left the mount table, a failure is reported here
+        def done(job):
+            if job.outcome == OUTCOME_OK:
+                then()
+            else:
+                self.report_job_failure(job, self.T['admin_error'].format("").strip())
+                self.request_refresh()
+
+        self.unmount_job(mount, done)
+
+    def detach_then(self, mount, then):
+        if os.path.abspath(mount['path']) in self.jobs:
+            QMessageBox.warning(self, self.T['error'], self.T['job_busy'])
+            return
+        if self.is_mounted(mount['path']):
+            self.start_unmount(mount, then)
+        else:
+            then()
 
     def is_host_reachable(self, host: str, port: int = 445, attempts: int = 2, timeout: float = 0.5, max_total_time: float = 1.0) -> bool:
         if self.network_up:
@@ -627,22 +882,40 @@ QListWidget::item:hover {
         else:
             return False
 
-    def toggle_automount(self, index, state):
+    def entry_for(self, mount_id):
+        # The entry behind a row action; None (after a warning) if it was removed meanwhile
+        mount = self.mount_index.get(mount_id)
+        if mount is None:
+            QMessageBox.warning(self, self.T['error'], self.T['entry_missing'])
+            self.request_refresh()
+        return mount
+
+    def toggle_automount(self, mount_id, state):
+        mount = self.entry_for(mount_id)
+        if mount is None:
+            return
         if state == Qt.CheckState.Checked.value:
-            self.mounts[index]['automount'] = True
+            mount['automount'] = True
             self.save_config()
             QMessageBox.information(self, self.T['success'], self.T['autostart_created'])
         elif state == Qt.CheckState.Unchecked.value:
-            self.mounts[index]['automount'] = False
+            mount['automount'] = False
             self.save_config()
             QMessageBox.information(self, self.T['success'], self.T['autostart_removed'])
 
-        self.refresh_with_loading()
+        self.request_refresh()
 
-    def toggle_mount(self, index, button):
-        mount = self.mounts[index]
+    def toggle_mount(self, mount_id):
+        mount = self.entry_for(mount_id)
+        if mount is None:
+            return
         path = mount['path']
-        is_smb = mount['url'].startswith("smb://")
+
+        # A click on a row with a running operation cancels it
+        job = self.jobs.get(os.path.abspath(path))
+        if job is not None:
+            job.cancel()
+            return
 
         try:
             if self.is_mounted(path):
@@ -656,54 +929,85 @@ QListWidget::item:hover {
                 if reply != QMessageBox.StandardButton.Yes:
                     return
 
-                if is_smb:
-                    if not self.run_with_sudo(["umount", path]):
-                        self.refresh_with_loading()
-                        return
-                else:
-                    try:
-                        QTimer.singleShot(100, self.refresh_with_loading)
-                        subprocess.run(["fusermount", "-u", path], check=True)
-                        self.refresh_with_loading()
-                    except subprocess.CalledProcessError as e:
-                        QMessageBox.critical(self, self.T['error'], self.T['admin_error'].format(str(e)))
-                        return
-
-                QMessageBox.information(self, self.T['success'], self.T['unmount_success'])
-
-                self.mounts[index]['automount'] = False
-                self.mounts[index]["last_known_status"] = "unmounted"
-                self.save_config()
-
-                try:
-                    QTimer.singleShot(100, self.refresh_with_loading)
-                    if os.path.exists(path) and not os.path.ismount(path):
-                        shutil.rmtree(path)
-                    self.refresh_with_loading()
-                except Exception as e:
-                    QMessageBox.warning(self, self.T['error'], self.T['delete_dir_failed'].format(e))
-                    return
-
-                button.setText(self.T['unmount'])
-                self.refresh_with_loading()
-                self.regenerate_bookmarks_from_active_mounts()
+                self.start_unmount(mount, lambda: self.unmount_done(mount))
 
             else:
                 try:
                     if not os.path.exists(path):
                         os.makedirs(path, exist_ok=True)
-                    self.refresh_with_loading()
                 except Exception as e:
                     QMessageBox.critical(self, self.T['error'], self.T['admin_error'].format(str(e)))
                     return
-                self.mounts[index]['automount'] = True
-                self.mounts[index]["last_known_status"] = "mounted"
+                # Put back if the mount job does not succeed
+                previous = {key: mount[key] for key in ('automount', 'last_known_status') if key in mount}
+
+                def restore():
+                    for key in ('automount', 'last_known_status'):
+                        if key in previous:
+                            mount[key] = previous[key]
+                        else:
+                            mount.pop(key, None)
+                    self.save_config()
+
+                mount['automount'] = True
+                mount["last_known_status"] = "mounted"
                 self.save_config()
-                self.mount_entry(mount)
+                self.mount_entry(mount, restore)
         except Exception as e:
             QMessageBox.critical(self, self.T['error'], f"{self.T['mount']}/{self.T['mount_failed']}\n\n{str(e)}")
             return
 
+    def unmount_done(self, mount):
+        QMessageBox.information(self, self.T['success'], self.T['unmount_success'])
+
+        mount['automount'] = False
+        mount["last_known_status"] = "unmounted"
+        self.save_config()
+
+        try:
+            cleanup_mountpoint(mount['path'])
+        except Exception as e:
+            QMessageBox.warning(self, self.T['error'], self.T['delete_dir_failed'].format(e))
+
+        self.request_refresh()
+        self.regenerate_bookmarks_from_active_mounts()
+
+    def calibrate_sftp(self, mount_id):
+        mount = self.entry_for(mount_id)
+        if mount is None or mount_id in self.calibrations:
+            return
+        self.calibrations[mount_id] = LoadingDialog(self.T, self)
+
+        def work():
+            try:
+                tuning = calibrate_mount(mount)
+            except Exception:
+                tuning = None
+            try:
+                self.sftp_calibrated.emit(mount_id, tuning)
+            except RuntimeError:
+                # The window is already gone
+                pass
+
+        self.background_pool.submit(work)
+
+    def calibration_finished(self, mount_id, tuning):
+        self.calibrations.pop(mount_id).close()
+        mount = self.mount_index.get(mount_id)
+        if mount is None:
+            # Removed while it was being measured
+            return
+        if tuning is None:
+            QMessageBox.warning(self, self.T['error'], self.T['calibration_failed'])
+            return
+
+        mount['ssh_tuning'] = tuning
+        self.save_config()
+        QMessageBox.information(
+            self, self.T['success'],
+            self.T['calibration_result'].format(cipher=tuning['cipher'], mbps=tuning['mbps'])
+        )
+
     def show_key_setup_wizard(self, entry):
         try:
             dialog = KeySetupWizard(entry, self.T, self)
@@ -711,21 +1015,21 @@ QListWidget::item:hover {
 
             if dialog.success:
                 QMessageBox.information(self, self.T['success'], self.T['mount_success'])
-                self.refresh_with_loading()
+                self.request_refresh()
             else:
                 QMessageBox.warning(self, self.T['error'], self.T['mount_failed'])
-                self.refresh_with_loading()
+                self.request_refresh()
 
         except Exception as e:
             QMessageBox.critical(self, self.T['error'], f"{self.T['mount_failed']}\n\n{str(e)}")
-            self.refresh_with_loading()
+            self.request_refresh()
 
 
     def add_mount(self):
         raw_path = self.path_input.text().strip()
         if not re.match(r'^[a-zA-Z0-9]+$', raw_path):
             QMessageBox.critical(self, self.T['error'], self.T['invalid_path'])
-            self.refresh_with_loading()
+            self.request_refresh()
             return
 
         try:
@@ -746,7 +1050,7 @@ QListWidget::item:hover {
 
             if not re.match(r'^(sftp|ftp|smb)://.+', url):
                 QMessageBox.critical(self, self.T['error'], self.T['invalid_url'])
-                self.refresh_with_loading()
+                self.request_refresh()
                 return
 
             max_order = max((m.get('order', 0) for m in self.mounts), default=-1)
@@ -759,59 +1063,52 @@ QListWidget::item:hover {
                 'password': self.pass_input.text(),
                 'automount': False,
                 'order': max_order + 1,
-                'last_known_status': 'unknown'
+                'last_known_status': 'unknown',
+                'policy': self.policy_from_fields(),
+                'profile': self.profile_input.currentData(),
+                'id': new_id()
             }
+            if self.editing is not None:
+                entry = edited_entry(self.editing, entry)
+                self.editing = None
 
             self.mounts.append(entry)
+            self.mount_index.add(entry)
             self.save_config()
-            self.refresh_with_loading()
+            if needs_smb_probe(entry):
+                # Up to SMB_PROBE_TIMEOUT against an unreachable server: the worker fills the cache meanwhile
+                self.background_pool.submit(refresh_smb_capabilities, entry)
+            self.request_refresh()
 
-            if url.startswith("sftp://"):
+            if url.startswith("sftp://") and not entry.get('sshkeyvalid'):
                 self.show_key_setup_wizard(entry)
 
         except Exception as e:
             QMessageBox.critical(self, self.T['error'], f"{self.T['add_failed']}\n\n{str(e)}")
 
-    def edit_mount(self, index):
+    def edit_mount(self, mount_id):
+        mount = self.entry_for(mount_id)
+        if mount is None:
+            return
+        self.detach_then(mount, lambda: self.edit_detached(mount))
+
+    def edit_detached(self, mount):
         try:
-            mount = self.mounts[index]
             path = mount['path']
-            is_smb = mount['url'].startswith("smb://")
             mnt_root = os.path.expanduser("~/mnt").rstrip("/") + "/"
 
-            if self.is_mounted(path):
-                if is_smb:
-                    if not self.run_with_sudo(["umount", path]):
-                        self.refresh_with_loading()
-                        return
-                else:
-                    try:
-                        subprocess.run(["fusermount", "-u", path], check=True)
-                        self.refresh_with_loading
-                        return
-                    except Exception:
-                        return
-
-            if self.network_up:
-                if os.path.exists(path) and not os.path.ismount(path):
-                    try:
-                        shutil.rmtree(path)
-                    except Exception as e:
-                        QMessageBox.warning(self, self.T['error'], self.T['delete_dir_failed'].format(str(e)))
-                        self.refresh_with_loading()
-                        return
-            else:
-                if os.path.exists(path):
-                    try:
-                        shutil.rmtree(path)
-                    except Exception as e:
-                        QMessageBox.warning(self, self.T['error'], self.T['delete_dir_failed'].format(str(e)))
-                        self.refresh_with_loading()
-                        return
+            try:
+                cleanup_mountpoint(path)
+            except Exception as e:
+                QMessageBox.warning(self, self.T['error'], self.T['delete_dir_failed'].format(str(e)))
+                self.request_refresh()
+                return
 
             mount['automount'] = False
             mount["last_known_status"] = "unmounted"
-            del self.mounts[index]
+            self.mounts.remove(mount)
+            self.mount_index.remove(mount)
+            self.editing = mount
             self.save_config()
 
             self.url_input.setText(mount['url'])
@@ -819,21 +1116,24 @@ QListWidget::item:hover {
             self.smb_version_input.setText(mount.get('smb_version', ''))
             self.user_input.setText(mount['user'])
             self.pass_input.setText(mount['password'])
+            self.set_policy_fields(get_policy(mount))
+            self.profile_input.setCurrentIndex(self.profile_input.findData(get_profile(mount)))
 
-            self.refresh_with_loading()
+            self.request_refresh()
             self.regenerate_bookmarks_from_active_mounts()
 
-        except IndexError:
+        except ValueError:
             QMessageBox.critical(self, self.T['error'], self.T['invalid_index'])
         except Exception as e:
             QMessageBox.critical(self, self.T['error'], f"{self.T['edit_failed']}\n\n{str(e)}")
 
 
-    def remove_mount(self, index):
+    def remove_mount(self, mount_id):
+        mount = self.entry_for(mount_id)
+        if mount is None:
+            return
         try:
-            mount = self.mounts[index]
             path = mount['path']
-            url = mount.get('url', '')
 
             confirm = QMessageBox.question(
                 self,
@@ -844,56 +1144,32 @@ QListWidget::item:hover {
             if confirm != QMessageBox.StandardButton.Yes:
                 return
 
-            is_smb = mount['url'].startswith("smb://")
-            is_ftp = mount['url'].startswith("ftp://")
+            self.detach_then(mount, lambda: self.remove_detached(mount))
 
-            if self.is_mounted(path):
-                if is_smb:
-                    if not self.run_with_sudo(["umount", path]):
-                        self.refresh_with_loading()
-                        return
-                else:
-                    try:
-                        subprocess.run(["fusermount", "-u", path], check=True)
-                        self.refresh_with_loading
-                        return
-                    except Exception:
-                        return
-
-            if self.network_up:
-                if os.path.exists(path) and not os.path.ismount(path):
-                    try:
-                        shutil.rmtree(path)
-                    except Exception as e:
-                        QMessageBox.warning(self, self.T['error'], self.T['delete_dir_failed'].format(str(e)))
-                        self.refresh_with_loading()
-                        return
-            else:
-                if os.path.exists(path):
-                    try:
-                        shutil.rmtree(path)
-                    except Exception as e:
-                        QMessageBox.warning(self, self.T['error'], self.T['delete_dir_failed'].format(str(e)))
-                        self.refresh_with_loading()
-                        return
-
-            mount['automount'] = False
-            mount["last_known_status"] = "unmounted"
-
-            del self.mounts[index]
+        except Exception as e:
+            QMessageBox.critical(self, self.T['error'], f"{self.T['remove_failed']}\n\n{str(e)}")
 
+    def remove_detached(self, mount):
+        try:
             try:
-                self.save_config()
+                cleanup_mountpoint(mount['path'])
             except Exception as e:
-                QMessageBox.critical(self, self.T['error'], self.T['config_save_failed'].format(str(e)))
-                self.refresh_with_loading()
+                QMessageBox.warning(self, self.T['error'], self.T['delete_dir_failed'].format(str(e)))
+                self.request_refresh()
                 return
 
+            mount['automount'] = False
+            mount["last_known_status"] = "unmounted"
+
+            self.mounts.remove(mount)
+            self.mount_index.remove(mount)
+            self.save_config()
+
             self.reassign_orders()
-            self.refresh_with_loading()
+            self.request_refresh()
             self.regenerate_bookmarks_from_active_mounts()
 
-        except IndexError:
+        except ValueError:
             QMessageBox.critical(self, self.T['error'], self.T['invalid_index'])
         except Exception as e:
             QMessageBox.critical(self, self.T['error'], f"{self.T['remove_failed']}\n\n{str(e)}")
@@ -904,202 +1180,210 @@ QListWidget::item:hover {
         self.save_config()
 
     def is_mounted(self, path):
+        # The mount table, never a stat() of the mountpoint: a dead CIFS/sshfs mount would block the GUI thread
         if not self.network_up:
             return False
         else:
-            return os.path.ismount(path)
+            return is_mountpoint(path)
 
     def has_keyfile(self, entry):
-        host_port = entry['url'][7:].split('/')[0]
-        host = host_port.split(':')[0]
-        port = host_port.split(':')[1] if ':' in host_port else '22'
-        key_path = os.path.expanduser(f"~/.ssh/netmount_keys/id_rsa_{host}_{port}")
-        return os.path.exists(key_path)
-
-    def escape_url_for_protocol(self, url: str, proto: str) -> str:
-        if proto == "ftp":
-            return url.replace(' ', '%20')
-        elif proto == "smb":
-            return url.replace(' ', r'\040')
-        return url
-
-    def prettify(self, elem):
-        rough_string = ET.tostring(elem, 'utf-8')
-        reparsed = minidom.parseString(rough_string)
-        pretty = reparsed.toprettyxml(indent="  ")
-        return '\n'.join([line for line in pretty.split('\n') if line.strip()])
+        host, port, _ = split_remote(entry['url'], "sftp")
+        return os.path.exists(sftp_key_path(host, port))
 
     def regenerate_bookmarks_from_active_mounts(self):
-        if not os.path.exists(XBEL_FILE):
-            return
-
-        tree = ET.parse(XBEL_FILE)
-        root = tree.getroot()
-
-        to_remove = []
-        for bookmark in root.findall("bookmark"):
-            title_elem = bookmark.find("title")
-            if title_elem is not None and title_elem.text and title_elem.text.startswith("MNT-"):
-                to_remove.append(bookmark)
-
-        for bm in to_remove:
-            root.remove(bm)
+        # The bookmark/XML stack is loaded on the first rewrite, not at startup
+        from netmount.bookmarks import regenerate_bookmarks_from_active_mounts
+        mounted = mounted_paths() if self.network_up else set()
+        regenerate_bookmarks_from_active_mounts(self.mounts, lambda path: os.path.abspath(path) in mounted)
 
-        for mount in sorted(self.mounts, key=lambda m: m.get("order", 0)):
-            url = mount.get("url", "")
-            path = mount.get("path", "")
-            if self.is_mounted(path):
-                title = path.split('/')[-1]
-                full_title = "MNT-" + title
-                unique_id = f"{int(time.time())}/0"
-
-                bm = ET.Element("bookmark", href=f"file://{path}")
-                ET.SubElement(bm, "title").text = full_title
-                info = ET.SubElement(bm, "info")
-                metadata = ET.SubElement(info, "metadata", owner="http://freedesktop.org")
-                ET.SubElement(metadata, f"{{{BOOKMARK_NS}}}icon", name="folder")
-                metadata_kde = ET.SubElement(info, "metadata", owner="http://www.kde.org")
-                ET.SubElement(metadata_kde, "ID").text = unique_id
-                ET.SubElement(metadata_kde, "isSystemItem").text = "false"
-                ET.SubElement(bm, f"{{{BOOKMARK_NS}}}category").text = "mounts"
-                ET.SubElement(bm, f"{{{BOOKMARK_NS}}}position").text = "0"
-
-                root.append(bm)
-
-        pretty_xml = self.prettify(root)
-        with open(XBEL_FILE, "w", encoding="utf-8") as f:
-            f.write(pretty_xml)
-
-    def mount_entry(self, entry):
+    def mount_problem(self, entry):
+        # The reason an entry cannot be mounted at all, checked on the GUI thread before a job starts
         try:
             if not os.path.exists(entry['path']):
-                if not subprocess.run(["mkdir", "-p", entry['path']]):
-                    self.refresh_with_loading()
-                    return
+                os.makedirs(entry['path'], exist_ok=True)
         except Exception as e:
-            QMessageBox.critical(self, self.T['error'], self.T['admin_error'].format(str(e)))
-            self.refresh_with_loading()
+            return self.T['admin_error'].format(str(e))
+        if url_proto(entry.get('url', '')) == "unknown":
+            return self.T['invalid_url']
+        if not build_mount_command(entry, os.getuid(), os.getgid()):
+            return self.T['invalid_data']
+        return None
+
+    def mount_job(self, entry, on_done):
+        proto = url_proto(entry.get('url', ''))
+        helper = get_helper(self.admin_password)
+
+        def work(cancel):
+            # Worker thread: the SMB probe and the mount itself, no Qt calls
+            if needs_smb_probe(entry):
+                refresh_smb_capabilities(entry)
+            cmd = build_mount_command(entry, os.getuid(), os.getgid())
+            if proto != "smb":
+                return run_command(cmd, timeout=MOUNT_OP_TIMEOUT, cancel=cancel)
+            result = helper.run(cmd, timeout=MOUNT_OP_TIMEOUT, cancel=cancel)
+            if not result.ok and not result.cancelled:
+                refresh_smb_capabilities(entry)
+            return result
+
+        return self.start_job(JOB_MOUNT, entry, work, MOUNT_OP_TIMEOUT, on_done)
+
+    def mount_failed_text(self, entry):
+        return self.T['sftp_mount_failed'] if url_proto(entry.get('url', '')) == "sftp" else self.T['mount_failed']
+
+    def mount_entry(self, entry, on_failed=None):
+        # on_failed() runs when the mount does not happen: refused up front, failed, cancelled or timed out
+        problem = self.mount_problem(entry)
+        if problem:
+            if on_failed:
+                on_failed()
+            QMessageBox.critical(self, self.T['error'], problem)
+            self.request_refresh()
             return
 
-        uid = os.getuid()
-        gid = os.getgid()
-
-        try:
-            if entry['url'].startswith("sftp://"):
-                sftp_path = entry.get("path", "")
-                def do_sftp_mount():
-                    QTimer.singleShot(100, self.refresh_with_loading)
-                    sftp_user = entry.get("user", "")
-                    sftp_url = entry.get("url", "")
-                    sftp_remote = sftp_url[7:]
-                    sftp_host_path = sftp_remote.split('/', 1)
-                    sftp_host = sftp_host_path[0]
-                    sftp_remote_path = '/' + sftp_host_path[1] if len(sftp_host_path) > 1 else ''
-
-                    sftp_port = sftp_host.split(':')[1] if ':' in sftp_host else '22'
-                    sftp_host = sftp_host.split(':')[0] if ':' in sftp_host else sftp_host
-
-                    sftp_key_path = os.path.expanduser(f"~/.ssh/netmount_keys/id_rsa_{sftp_host}_{sftp_port}")
-
-                    if not sftp_user or not sftp_host or not sftp_remote_path or not sftp_path or not sftp_port or not os.path.exists(sftp_key_path):
-                        QMessageBox.critical(self, self.T['error'], self.T['invalid_data'])
-                        return
+        def done(job):
+            if job.outcome == OUTCOME_OK:
+                QMessageBox.information(self, self.T['success'], self.T['mount_success'])
+                self.regenerate_bookmarks_from_active_mounts()
+            else:
+                if on_failed:
+                    on_failed()
+                self.report_job_failure(job, self.mount_failed_text(entry))
+            self.request_refresh()
+
+        self.mount_job(entry, done)
+
+    def selected_mounts(self):
+        rows = sorted(index.row() for index in self.list_view.selectionModel().selectedIndexes())
+        return [self.mount_index.get(self.mount_model.mount_id(row)) for row in rows]
+
+    def update_bulk_buttons(self):
+        count = len(self.list_view.selectionModel().selectedIndexes())
+        for button in self.bulk_buttons.values():
+            button.setEnabled(count > 1 and self.bulk is None and self.config_loaded)
+
+    def bulk_action(self, action):
+        # Mount, unmount or remount every selected entry: one confirmation, at most GUI_JOB_WORKERS
+        # operations at a time, one config save and one bookmark regeneration at the end
+        mounted = self.mount_watcher.read()
+        targets, skipped = [], []
+        for mount in self.selected_mounts():
+            state = self.row_state(mount, mounted)
+            if state is None or state["busy"]:
+                skipped.append(mount)
+            elif action == "mount" and not state["mounted"] and state["mount_enabled"]:
+                targets.append(mount)
+            elif action in ("unmount", "remount") and state["mounted"]:
+                targets.append(mount)
+            else:
+                skipped.append(mount)
 
-                    try:
-                        subprocess.run([
-                            "sshfs", f"{sftp_user}@{sftp_host}:{sftp_remote_path}", sftp_path,
-                            "-p", sftp_port,
-                            "-o", f"IdentityFile={sftp_key_path},uid={uid},gid={gid},StrictHostKeyChecking=no"
-                        ], check=True)
-                    except Exception as e:
-                        QMessageBox.critical(self, self.T['error'], f"{self.T['sftp_mount_failed']}\n\n{str(e)}")
-
-                threading.Thread(target=do_sftp_mount, daemon=True).start()
-                self.check_sftp_mount(sftp_path)
+        if not targets:
+            QMessageBox.information(self, self.T['info'], self.T['bulk_nothing_to_do'])
+            return
+        if action != "mount":
+            reply = QMessageBox.question(
+                self,
+                self.T['confirm_unmount_title'],
+                self.T[f'bulk_confirm_{action}'].format(count=len(targets)),
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+            )
+            if reply != QMessageBox.StandardButton.Yes:
                 return
 
-            elif entry['url'].startswith("ftp://"):
-                ftp_path = entry.get("path", "")
-                ftp_url = entry.get("url", "")
-                ftp_url = self.escape_url_for_protocol(ftp_url, "ftp")
-                ftp_user = entry.get("user", "")
-                ftp_password = entry.get("password", "")
-                ftp_remote = ftp_url[6:]
-                ftp_host_path = ftp_remote.split('/', 1)
-                ftp_host = ftp_host_path[0]
-
-                ftp_port = ftp_host.split(':')[1] if ':' in ftp_host else '21'
-                ftp_host = ftp_host.split(':')[0] if ':' in ftp_host else ftp_host
-                full_ftp_host = f"{ftp_host}:{ftp_port}" if ftp_port != "21" else ftp_host
-
-                if not ftp_host or not ftp_path or not ftp_user or not ftp_password or not ftp_port:
-                    QMessageBox.critical(self, self.T['error'], self.T['invalid_data'])
-                    return
-
-                cmd = [
-                    "curlftpfs", full_ftp_host, ftp_path,
-                    "-o", f"user={ftp_user}:{ftp_password},uid={uid},gid={gid}"
-                ]
-
-            elif entry['url'].startswith("smb://"):
-                smb_url = entry.get("url", "")
-                smb_path = entry.get("path", "")
-                smb_user = entry.get("user", "")
-                smb_password = entry.get("password", "")
-                vers_opt = f",vers={entry['smb_version']}" if entry.get('smb_version') else ""
-                unc = "//" + self.escape_url_for_protocol(entry['url'][6:], "smb")
-
-                if not smb_path or not smb_url or not smb_user or not smb_password:
-                    QMessageBox.critical(self, self.T['error'], self.T['invalid_data'])
-                    return
-
-                cmd = [
-                    "mount", "-t", "cifs", unc, entry['path'], "-o",
-                    f"username={entry['user']},password={entry['password']},uid={uid},gid={gid}{vers_opt}"
-                ]
-
+        self.bulk = BulkRun(targets, lambda mount, done: self.bulk_step(action, mount, done), GUI_JOB_WORKERS, self)
+        self.bulk.progress.connect(self.bulk_progress_changed)
+        self.bulk.finished.connect(lambda results: self.bulk_finished(action, results, skipped))
+
+        self.bulk_dialog = QProgressDialog(
+            self.T['bulk_progress'].format(done=0, total=len(targets)), self.T['cancel'], 0, len(targets), self)
+        self.bulk_dialog.setWindowTitle(self.T[f'bulk_{action}'])
+        self.bulk_dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        self.bulk_dialog.setMinimumDuration(0)
+        self.bulk_dialog.setAutoClose(False)
+        self.bulk_dialog.setAutoReset(False)
+        self.bulk_dialog.canceled.connect(self.cancel_bulk)
+        self.bulk_dialog.show()
+        self.update_bulk_buttons()
+        self.bulk.run()
+
+    def bulk_step(self, action, mount, done):
+        def mounted(job):
+            done(mount, job.outcome == OUTCOME_OK,
+                 None if job.outcome == OUTCOME_OK else self.job_failure_text(job, self.mount_failed_text(mount)))
+
+        def unmounted(job):
+            if job.outcome != OUTCOME_OK:
+                done(mount, False, self.job_failure_text(job, self.T['admin_error'].format("").strip()))
+            elif action == "unmount":
+                done(mount, True, None)
+            elif self.bulk is not None and self.bulk.cancelled:
+                done(mount, False, self.T['job_cancelled'])
             else:
-                QMessageBox.critical(self, self.T['error'], self.T['invalid_url'])
-                return
+                start_mount()
 
-            try:
-                QTimer.singleShot(100, self.refresh_with_loading)
-                if entry['url'].startswith("smb://"):
-                    if not self.run_with_sudo(cmd):
-                        QMessageBox.critical(self, self.T['error'], f"{self.T['admin_error']}\n{self.T['mount_failed']}")
-                        return
-                else:
-                    subprocess.run(cmd, check=True)
-            except Exception as e:
-                QMessageBox.critical(self, self.T['error'], self.T['admin_error'].format(str(e)))
-                return
-
-            if self.is_mounted(entry['path']):
-                QMessageBox.information(self, self.T['success'], self.T['mount_success'])
+        def start_mount():
+            problem = self.mount_problem(mount)
+            if problem:
+                done(mount, False, problem)
             else:
-                QMessageBox.information(self, self.T['error'], self.T['unmount_success'])
+                self.mount_job(mount, mounted)
 
-            self.refresh_with_loading()
-            self.regenerate_bookmarks_from_active_mounts()
+        if action == "mount":
+            start_mount()
+        else:
+            self.unmount_job(mount, unmounted)
 
-        except Exception as e:
-            QMessageBox.critical(self, self.T['error'], f"{self.T['mount_failed']}\n\n{str(e)}")
+    def bulk_progress_changed(self, done, total):
+        dialog = self.bulk_dialog
+        if dialog is not None:
+            dialog.setLabelText(self.T['bulk_progress'].format(done=done, total=total))
+            # A window-modal setValue() processes events, the run may finish inside it
+            dialog.setValue(done)
+
+    def cancel_bulk(self):
+        if self.bulk is None or self.bulk.cancelled:
             return
+        running = list(self.bulk.running)
+        self.bulk.cancel(self.T['job_cancelled'])
+        for mount in running:
+            job = self.jobs.get(os.path.abspath(mount['path']))
+            if job is not None:
+                job.cancel()
+
+    def bulk_finished(self, action, results, skipped):
+        self.bulk = None
+        dialog, self.bulk_dialog = self.bulk_dialog, None
+        if dialog is not None:
+            dialog.canceled.disconnect(self.cancel_bulk)
+            dialog.close()
+
+        failures = []
+        for mount, ok, error in results:
+            if not ok:
+                failures.append(f"{mount['path']}: {error}")
+                continue
+            if action == "unmount":
+                mount['automount'] = False
+                mount["last_known_status"] = "unmounted"
+                try:
+                    cleanup_mountpoint(mount['path'])
+                except Exception as e:
+                    failures.append(f"{mount['path']}: {self.T['delete_dir_failed'].format(e)}")
+            else:
+                mount['automount'] = True
+                mount["last_known_status"] = "mounted"
 
+        self.save_config()
+        self.request_refresh()
+        self.regenerate_bookmarks_from_active_mounts()
+        self.update_bulk_buttons()
 
-    def check_sftp_mount(self, path, attempt=0):
-        try:
-            if os.path.ismount(path):
-                self.refresh_with_loading()
-                QMessageBox.information(self, self.T['success'], self.T['add_success'])
-            elif attempt < 5:
-                QTimer.singleShot(600, lambda: self.check_sftp_mount(path, attempt + 1))
-            else:
-                self.refresh_with_loading()
-                QMessageBox.critical(self, self.T['error'], self.T['add_failed'])
-        except Exception as e:
-            self.refresh_with_loading()
-            QMessageBox.critical(self, self.T['error'], f"{self.T['add_failed']}\n\n{str(e)}")
+        succeeded = sum(1 for _, ok, _ in results if ok)
+        summary = self.T['bulk_summary'].format(ok=succeeded, total=len(results), skipped=len(skipped))
+        if failures:
+            QMessageBox.warning(self, self.T[f'bulk_{action}'], summary + "\n\n" + "\n".join(failures))
+        else:
+            QMessageBox.information(self, self.T[f'bulk_{action}'], summary)
 
     def create_autostart_service(self):
         try:
@@ -1157,9 +1441,9 @@ Comment={self.T['autounmount_comment']}
 
     def remove_old_services(self):
         if os.path.exists(SMBUNMOUNT_SCRIPT_OLD):
-            subprocess.run(["systemctl", "--user", "disable", "--now", "smb-unmount.service"], check=False)
+            run_command(["systemctl", "--user", "disable", "--now", "smb-unmount.service"])
             os.remove(SMBUNMOUNT_SCRIPT_OLD)
-            subprocess.run(["systemctl", "--user", "daemon-reload"], check=True)
+            run_command(["systemctl", "--user", "daemon-reload"], check=True)
 
         if os.path.exists(SMBUNMOUNT_SCRIPT_D_OLD):
             os.remove(SMBUNMOUNT_SCRIPT_D_OLD)
@@ -1190,6 +1474,12 @@ class KeySetupWizard(QDialog):
         self.lang = lang_data
         self.entry = entry
         self.step = 0
+        self.process = None
+        self.control_path = None
+        self.timed_out = False
+        self.process_timer = QTimer(self)
+        self.process_timer.setSingleShot(True)
+        self.process_timer.timeout.connect(self.process_timeout)
 
         self.layout = QVBoxLayout()
 
@@ -1214,46 +1504,39 @@ class KeySetupWizard(QDialog):
 
         self.next_step()
 
+    def generate_key(self, key_type):
+        generate_key(self.host, self.port, key_type)
+        self.key_type = key_type
+
     def next_step(self):
         self.step += 1
         if self.step == 1:
             self.instructions.append(self.lang['wizard_step1'])
             self.next_btn.setEnabled(False)
 
-            ssh_dir = os.path.expanduser("~/.ssh/netmount_keys")
-            os.makedirs(ssh_dir, exist_ok=True)
-
             try:
-                host, port, safe_host, _, _ = self._connection_details()
+                self.host, self.port, _, _, _ = self._connection_details()
             except ValueError as error:
                 self.instructions.append(str(error))
                 self.next_btn.setEnabled(True)
                 self.step -= 1
                 return
 
-            key_base = f"id_rsa_{safe_host}_{port}"
-
-            key_path = os.path.join(ssh_dir, key_base)
-            pubkey_path = key_path + ".pub"
-
-            self.key_path = key_path
-            self.pubkey_path = pubkey_path
-
-            if not Path(pubkey_path).exists():
+            existing = existing_key_type(self.host, self.port)
+            if existing:
+                self.key_type = existing
+                self.instructions.append(self.lang['wizard_already_exists'])
+            else:
                 self.instructions.append(self.lang['wizard_generating'])
                 QApplication.processEvents()
 
                 try:
-                    subprocess.run([
-                        "ssh-keygen", "-t", "rsa", "-b", "2048", "-f", key_path, "-N", ""
-                    ], check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                    self.generate_key(KEY_TYPES[0])
                     self.instructions.append(self.lang['wizard_generated'])
                 except Exception as e:
                     self.instructions.append(f"[ERROR] {str(e)}")
                     self.next_btn.setEnabled(True)
                     return
-            else:
-                self.instructions.append(self.lang['wizard_already_exists'])
 
             self.next_btn.setEnabled(True)
 
@@ -1261,122 +1544,127 @@ class KeySetupWizard(QDialog):
             self.instructions.append(self.lang['wizard_step2'])
 
             try:
-                _, port, _, ssh_host, user = self._connection_details()
+                _, _, _, self.ssh_host, self.user = self._connection_details()
             except ValueError as error:
                 self.instructions.append(str(error))
                 self.step -= 1
                 return
 
-            ssh_target = f"{user}@{ssh_host}"
-            pubkey_path = self.pubkey_path
-            marker_file = os.path.expanduser("~/.netmount_result.tmp")
-
-            if os.path.exists(marker_file):
-                os.remove(marker_file)
-
             pw, ok = QInputDialog.getText(self, self.lang["password"], self.lang["password"], QLineEdit.EchoMode.Password)
             if not ok or not pw:
                 self.instructions.append("[ABORTED] Nincs megadott jelszó.")
+                self.step -= 1
                 return
 
-            self.instructions.append(self.lang['wizard_copying'])
-            QApplication.processEvents()
-
-            marker_file_quoted = shlex.quote(marker_file)
-            script_content = textwrap.dedent(f"""
-                #!/bin/bash
-                set -e
-
-                # 1. {self.lang['step1']}
-                sshpass -p {shlex.quote(pw)} ssh -p {port} -o PreferredAuthentications=password -o PubkeyAuthentication=no -o StrictHostKeyChecking=no -o ConnectTimeout=5 {shlex.quote(ssh_target)} "echo '{self.lang['step1_ok']}'" || exit 1
-
-                # 2. {self.lang['step2']}
-                sshpass -p {shlex.quote(pw)} ssh -p {port} -o PreferredAuthentications=password -o PubkeyAuthentication=no -o StrictHostKeyChecking=no {shlex.quote(ssh_target)} "mkdir -p ~/.ssh && chmod 700 ~/.ssh && echo '{self.lang['step2_ok']}'" || exit 1
-
-                # 3. {self.lang['step3']}
-                sshpass -p {shlex.quote(pw)} scp -P {port} -o PreferredAuthentications=password -o PubkeyAuthentication=no -o StrictHostKeyChecking=no {shlex.quote(pubkey_path)} {shlex.quote(ssh_target + ':/tmp/netmount_tmp_key.pub')} && echo '{self.lang['step3_ok']}' || exit 1
-
-                # 4. {self.lang['step4']}
-                sshpass -p {shlex.quote(pw)} ssh -p {port} -o PreferredAuthentications=password -o PubkeyAuthentication=no -o StrictHostKeyChecking=no {shlex.quote(ssh_target)} '
-                    touch ~/.ssh/authorized_keys && chmod 600 ~/.ssh/authorized_keys &&
-                    grep -qxF "$(cat /tmp/netmount_tmp_key.pub)" ~/.ssh/authorized_keys || cat /tmp/netmount_tmp_key.pub >> ~/.ssh/authorized_keys;
-                    rm /tmp/netmount_tmp_key.pub
-                    echo "{self.lang['step4_ok']}"
-                ' || exit 1
-
-                # 5. {self.lang['step5']}
-                echo "__OK__" > {marker_file_quoted}
-            """).lstrip()
+            # sshpass -e reads the password from the environment, never from argv
+            self.process_env = QProcessEnvironment.systemEnvironment()
+            self.process_env.insert("SSHPASS", pw)
+            self.next_btn.setEnabled(False)
+            self.install_key()
 
-            try:
-                with tempfile.NamedTemporaryFile(mode='w', suffix='.sh', delete=False) as tmpfile:
-                    tmpfile.write(script_content)
-                    tmpfile_path = tmpfile.name
-                os.chmod(tmpfile_path, 0o700)
-            except Exception as e:
-                self.instructions.append(self.lang['wizard_tempfile_error'] + f"\n{str(e)}")
-                self.next_btn.setEnabled(False)
-                return
+    def start_process(self, program, args, on_finished, stdin_data=None):
+        self.process = QProcess(self)
+        self.process.setProcessEnvironment(self.process_env)
+        self.process.readyReadStandardOutput.connect(
+            lambda: self.append_output(self.process.readAllStandardOutput())
+        )
+        self.process.readyReadStandardError.connect(
+            lambda: self.append_output(self.process.readAllStandardError())
+        )
+        self.process.finished.connect(on_finished)
+        self.process.errorOccurred.connect(self.process_error)
+        self.process_timer.start(KEY_INSTALL_TIMEOUT * 1000)
+        self.process.start(program, args)
+        if stdin_data is not None:
+            self.process.write(stdin_data.encode("utf-8"))
+            self.process.closeWriteChannel()
+
+    def append_output(self, data):
+        text = data.data().decode(errors="replace").strip()
+        if text:
+            self.instructions.append(text)
+
+    def process_error(self, error):
+        if error == QProcess.ProcessError.FailedToStart:
+            self.process_timer.stop()
+            self.instructions.append(self.lang['wizard_start_error'] + f" {self.process.program()}")
+            self.finish(False)
+
+    def process_timeout(self):
+        if self.process is not None and self.process.state() != QProcess.ProcessState.NotRunning:
+            self.timed_out = True
+            self.process.kill()
+
+    def install_key(self):
+        self.instructions.append(self.lang['wizard_copying'])
+        self.control_path = self.control_path or setup_control_path()
+        cmd = install_command(
+            self.user, self.ssh_host, self.port, self.control_path,
+            (self.lang['step1_ok'], self.lang['step2_ok'], self.lang['step4_ok'])
+        )
+        pubkey = read_public_key(self.host, self.port, self.key_type)
+        self.timed_out = False
+        self.start_process(cmd[0], cmd[1:], self.install_finished, pubkey + "\n")
+
+    def install_finished(self, code, status):
+        self.process_timer.stop()
+        if self.timed_out:
+            self.instructions.append(self.lang['wizard_timeout_warn'])
+            self.finish(False)
+            return
+        if status != QProcess.ExitStatus.NormalExit or code != 0:
+            self.instructions.append(self.lang['wizard_install_failed'].format(code=code))
+            self.finish(False)
+            return
 
-            os.chmod(tmpfile_path, 0o700)
+        self.instructions.append(self.lang['wizard_verifying'])
+        cmd = verify_command(self.user, self.ssh_host, self.port, key_path(self.host, self.port, self.key_type))
+        self.start_process(cmd[0], cmd[1:], self.verify_finished)
 
+    def verify_finished(self, code, status):
+        self.process_timer.stop()
+        if status == QProcess.ExitStatus.NormalExit and code == 0:
+            self.finish(True)
+            return
+        if self.key_type != "rsa" and not self.timed_out:
+            # Servers older than OpenSSH 6.5 ignore Ed25519 keys: retry once with RSA
+            self.instructions.append(self.lang['wizard_rsa_fallback'])
+            remove_key(self.host, self.port, self.key_type)
             try:
-                subprocess.Popen(["bash", tmpfile_path], stderr=subprocess.DEVNULL)
+                self.generate_key("rsa")
             except Exception as e:
-                self.instructions.append(self.lang['wizard_script_start_error'] + f"\n{e}")
+                self.instructions.append(f"[ERROR] {str(e)}")
+                self.finish(False)
                 return
-
-            self._marker_timer_count = 0
-            self._marker_timer_limit = 30
-            self._marker_timer = QTimer(self)
-            self._marker_timer.setInterval(1000)
-
-            def check_marker_file():
-                self._marker_timer_count += 1
-                if os.path.exists(marker_file):
-                    try:
-                        with open(marker_file) as f:
-                            if "__OK__" in f.read():
-                                self.instructions.append(self.lang['wizard_success'])
-                                self.success = True
-                                self.entry['sshkeyvalid'] = True
-                                self.manager.save_config()
-                    except Exception as e:
-                        self.instructions.append(self.lang['wizard_marker_read_error'] + f" {str(e)}")
-                        self.success = False
-                        self.entry['sshkeyvalid'] = False
-                        self.manager.save_config()
-                    finally:
-                        self._marker_timer.stop()
-                        try:
-                            os.remove(marker_file)
-                            os.remove(tmpfile_path)
-                        except Exception:
-                            pass
-                    self.next_btn.setEnabled(False)
-                    return
-
-                if self._marker_timer_count >= self._marker_timer_limit:
-                    self._marker_timer.stop()
-                    self.instructions.append(self.lang['wizard_timeout_warn'])
-                    self.success = False
-                    self.entry['sshkeyvalid'] = False
-                    self.manager.save_config()
-                    try:
-                        if os.path.exists(marker_file):
-                            os.remove(marker_file)
-                        os.remove(tmpfile_path)
-                    except Exception:
-                        pass
-                    self.next_btn.setEnabled(False)
-
-            self._marker_timer.timeout.connect(check_marker_file)
-            self._marker_timer.start()
+            self.install_key()
+            return
+        self.instructions.append(self.lang['wizard_timeout_warn'])
+        self.finish(False)
+
+    def finish(self, success):
+        if self.control_path:
+            run_command(close_command(self.user, self.ssh_host, self.port, self.control_path), timeout=5)
+            self.control_path = None
+        if success:
+            self.instructions.append(self.lang['wizard_success'])
+        self.success = success
+        self.entry['sshkeyvalid'] = success
+        self.manager.save_config()
+        self.next_btn.setEnabled(False)
+
+    def closeEvent(self, event):
+        if self.process is not None and self.process.state() != QProcess.ProcessState.NotRunning:
+            self.process.kill()
+            self.process.waitForFinished(1000)
+        if self.control_path:
+            run_command(close_command(self.user, self.ssh_host, self.port, self.control_path), timeout=5)
+            self.control_path = None
+        super().closeEvent(event)
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
     app.setWindowIcon(QIcon(icon_path))
     window = MountManager()
-    window.refresh_with_loading()
+    window.refresh_list()
     window.show()
     sys.exit(app.exec())
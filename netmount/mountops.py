@@ -0,0 +1,87 @@
+import errno
+import os
+import time
+import threading
+from typing import Callable
+
+from netmount.config import UNMOUNT_STEP_TIMEOUT, UNMOUNT_FAST_STEP_TIMEOUT
+from netmount.runner import run_command, CommandResult
+
+MOUNTINFO = "/proc/self/mountinfo"
+
+# Escalation ladders: (stage name, argv prefix); the mount path is appended
+CIFS_LADDER = [("normal", ["umount"]), ("force", ["umount", "-f"]), ("lazy", ["umount", "-l"])]
+FUSE_LADDER = [("normal", ["fusermount", "-u"]), ("lazy", ["fusermount", "-uz"])]
+
+def unescape_mountinfo(field: str) -> str:
+    # The kernel writes space, tab, newline and backslash as \\ooo octal escapes
+    out, i = [], 0
+    while i < len(field):
+        if field[i] == "\\" and field[i + 1:i + 4].isdigit():
+            out.append(chr(int(field[i + 1:i + 4], 8)))
+            i += 4
+        else:
+            out.append(field[i])
+            i += 1
+    return "".join(out)
+
+def parse_mountinfo(lines) -> set[str]:
+    paths = set()
+    for line in lines:
+        fields = line.split(" ")
+        if len(fields) > 4:
+            paths.add(unescape_mountinfo(fields[4]))
+    return paths
+
+def mounted_paths() -> set[str]:
+    # Reads the mount table only, so a dead network share is never stat()-ed
+    try:
+        with open(MOUNTINFO, "r", encoding="utf-8", errors="replace") as f:
+            return parse_mountinfo(f)
+    except OSError:
+        return set()
+
+def is_mountpoint(path: str) -> bool:
+    return os.path.abspath(path) in mounted_paths()
+
+class StillMountedError(OSError):
+    pass
+
+def cleanup_mountpoint(path: str) -> None:
+    # Never recurses: a path still in the mount table is refused, otherwise only an empty directory is removed
+    path = os.path.abspath(path)
+    if is_mountpoint(path):
+        raise StillMountedError(errno.EBUSY, "still a mountpoint", path)
+    try:
+        os.rmdir(path)
+    except FileNotFoundError:
+        pass
+
+def detach(path: str, fuse: bool, privileged: Callable[..., CommandResult] | None = None,
+           reachable: bool = True, cancel: threading.Event | None = None) -> tuple[CommandResult, str | None]:
+    # Walks the ladder until the path leaves the mount table; returns the last result and the stage
+    # that detached it (None when every stage failed). An unreachable server skips the polite step.
+    # A set `cancel` kills the running step and no further step is started.
+    ladder = FUSE_LADDER if fuse else CIFS_LADDER
+    if not reachable:
+        ladder = ladder[1:]
+    step_timeout = UNMOUNT_STEP_TIMEOUT if reachable else UNMOUNT_FAST_STEP_TIMEOUT
+
+    started = time.monotonic()
+    result = CommandResult([], -1, "", "", 0.0)
+    for stage, prefix in ladder:
+        if cancel is not None and cancel.is_set():
+            break
+        cmd = prefix + [path]
+        if fuse or privileged is None:
+            result = run_command(cmd, timeout=step_timeout, cancel=cancel)
+        else:
+            result = privileged(cmd, step_timeout, cancel=cancel)
+        if result.ok or not is_mountpoint(path):
+            return outcome(result, started), stage
+    cancelled = cancel is not None and cancel.is_set()
+    return outcome(result, started, cancelled), None
+
+def outcome(result: CommandResult, started: float, cancelled: bool = False) -> CommandResult:
+    return CommandResult(result.args, result.returncode, result.stdout, result.stderr,
+                         time.monotonic() - started, result.timed_out, result.cancelled or cancelled)
@@ -1,23 +1,34 @@
 #!/usr/bin/env python3
-import os, sys, json, socket, subprocess, time, signal, shutil
+import os, sys, json, socket, time, signal
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
 from PyQt6.QtWidgets import (
-    QApplication, QInputDialog, QMessageBox, QLineEdit, QHBoxLayout,
+    QApplication, QMessageBox, QHBoxLayout,
     QTextEdit, QDialog, QVBoxLayout, QLabel, QSystemTrayIcon, QPushButton
 )
 from PyQt6.QtGui import QIcon, QFont
-from PyQt6.QtCore import QTimer, QLocale
-import xml.etree.ElementTree as ET
-from xml.dom import minidom
+from PyQt6.QtCore import QTimer, QLocale, QFileSystemWatcher, QEventLoop
+from PyQt6.QtNetwork import QNetworkInformation
 
 current_file = Path(__file__).resolve()
 project_root = current_file.parent.parent
 sys.path.insert(0, str(project_root))
 
-from netmount.config import XBEL_FILE, BOOKMARK_NS, SECURE_FILE, icon_path, lang_file_un, lang_file_pw
-from netmount.bookmarks import clean_mount_bookmarks, regenerate_bookmarks_from_active_mounts
-from netmount.password_prompt import ask_admin_password
+from netmount.config import (
+    SECURE_FILE, icon_path, lang_file_un, lang_file_pw,
+    DAEMON_MAX_WORKERS, MOUNT_OP_TIMEOUT, CHECK_INTERVAL_MAX, SSH_TUNE_RECHECK_BYTES, SSH_TUNE_RECHECK_GAP
+)
+from netmount.password_prompt import ask_admin_password, password_from_parent, launch_with_password
+from netmount.privhelper import get_helper
+from netmount.runner import run_command, CommandResult, ERROR_AUTH, ERROR_REFUSED, ERROR_TIMEOUT
+from netmount.mountops import detach, cleanup_mountpoint
+from netmount.mount_options import build_mount_command, url_proto, needs_smb_probe, refresh_smb_capabilities
 from netmount.decryptor import decrypt, encrypt
+from netmount.health import MountHealth
+from netmount.recovery import plan_waves, wave_delay, RecoveryReport
+from netmount.scheduler import CheckScheduler
+from netmount.sshtune import calibrate_mount, is_stale, TUNE_RETRY_AFTER
+from netmount.policies import get_policy, unreachable_action, reachable_action, POLICY_ASK, POLICY_UNMOUNT, POLICY_MOUNT, POLICY_SUSPEND
 
 LANG = QLocale.system().name().split('_')[0]
 
@@ -63,7 +74,7 @@ signal.signal(signal.SIGTERM, create_signal_handler())
 
 def is_local_network_up() -> bool:
     try:
-        result = subprocess.run(
+        result = run_command(
             'ip -o addr show up | grep -v " lo " | grep -qE "inet(6)? "',
             shell=True
         )
@@ -80,12 +91,11 @@ def is_mount_dir_present(path: str) -> bool:
     except Exception:
         return False
 
-def update_mount_status(mounts: list[dict], path: str, status: str, password: str) -> None:
+def set_mount_status(mounts: list[dict], path: str, status: str) -> None:
     for m in mounts:
         if m.get("path") == path:
             m["last_known_status"] = status
             break
-    encrypt(password, mounts)
 
 class UnmountManager:
     def __init__(self):
@@ -93,11 +103,72 @@ class UnmountManager:
         self.log_dialog = None
         self.mounts = []
         self.setup_tray_icon()
-        self.admin_password = os.environ.get("NETMOUNT_PW")
+        self.admin_password = password_from_parent()
         self.log_opened_by_user = False
         self.log_shown_by_script = False
         self.user_cancelled_unmount_last_time = False
         self.user_cancelled_mount_last_time = False
+        self.unreachable_since = {}
+        self.suspended = {}
+        self.health = {}
+        self.network_restored_at = None
+        self.scheduler = CheckScheduler()
+        self.tune_pool = ThreadPoolExecutor(max_workers=1)
+        self.tuning = {}
+        self.tuning_failed = {}
+        self.last_tuning = 0.0
+        self.in_cycle = False
+        self.config_dirty = True
+        self.config_mtime = None
+
+        self.timer = QTimer()
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.main_loop)
+
+        self.config_watcher = QFileSystemWatcher()
+        self.config_watcher.fileChanged.connect(self.on_config_changed)
+        self.watch_config()
+
+        self.network_info = None
+        try:
+            if QNetworkInformation.loadDefaultBackend():
+                self.network_info = QNetworkInformation.instance()
+                self.network_info.reachabilityChanged.connect(self.on_external_event)
+        except Exception:
+            self.network_info = None
+
+    def watch_config(self):
+        if SECURE_FILE.exists() and str(SECURE_FILE) not in self.config_watcher.files():
+            self.config_watcher.addPath(str(SECURE_FILE))
+
+    def remember_config_mtime(self):
+        try:
+            self.config_mtime = SECURE_FILE.stat().st_mtime_ns
+        except OSError:
+            self.config_mtime = None
+
+    def on_config_changed(self, _path=None):
+        self.watch_config()
+        try:
+            mtime = SECURE_FILE.stat().st_mtime_ns
+        except OSError:
+            mtime = None
+        if mtime is not None and mtime == self.config_mtime:
+            return
+        self.config_dirty = True
+        self.on_external_event()
+
+    def on_external_event(self, *_):
+        self.scheduler.reset_all()
+        self.arm_timer()
+
+    def arm_timer(self):
+        if self.in_cycle:
+            return
+        delay = self.scheduler.next_delay()
+        if delay is None:
+            delay = CHECK_INTERVAL_MAX
+        self.timer.start(int(delay * 1000))
 
     def network_stable_check(self):
         if not is_local_network_up():
@@ -107,6 +178,8 @@ class UnmountManager:
             else:
                 self.network_interrupted_status = 2
         else:
+            if getattr(self, "network_interrupted_status", 0) != 0:
+                self.network_restored_at = time.monotonic()
             self.network_interrupted_daemon_restarted = False
             self.network_interrupted_status = 0
 
@@ -139,13 +212,6 @@ class UnmountManager:
             self.log_window.verticalScrollBar().setValue(self.log_window.verticalScrollBar().maximum())
             QApplication.processEvents()
 
-    def escape_url_for_protocol(self, url: str, proto: str) -> str:
-        if proto == "ftp":
-            return url.replace(' ', '%20')
-        elif proto == "smb":
-            return url.replace(' ', r'\040')
-        return url
-
     def is_mounted(self, path: str) -> bool:
         result = os.path.ismount(path)
         self.log(f"{T['debug_log']} is_mounted({path}) = {result}")
@@ -172,12 +238,8 @@ class UnmountManager:
                 return False
         return False
 
-    def run_with_sudo(self, command: list[str]) -> bool:
-        try:
-            proc = subprocess.run(["sudo", "-S"] + command, input=self.admin_password + "\n", capture_output=True, text=True)
-            return proc.returncode == 0
-        except Exception:
-            return False
+    def run_with_sudo(self, command: list[str], timeout: float, cancel=None) -> CommandResult:
+        return get_helper(self.admin_password).run(command, timeout, cancel=cancel)
 
     def show_log_window(self, from_tray=False):
         if self.log_window and self.log_dialog:
@@ -201,10 +263,7 @@ class UnmountManager:
         layout.addWidget(self.log_window)
 
         def launch_main_gui():
-            env = os.environ.copy()
-            if self.admin_password:
-                env["NETMOUNT_PW"] = self.admin_password
-            subprocess.Popen(["python3", str(project_root / "netmount/main.py")], env=env)
+            launch_with_password(["python3", str(project_root / "netmount/main.py")], self.admin_password)
             if self.log_dialog:
                 self.log_dialog.close()
                 self.log_dialog = None
@@ -240,6 +299,22 @@ class UnmountManager:
         self.log_shown_by_script = not from_tray
 
     def main_loop(self):
+        due = self.scheduler.pop_due()
+        self.in_cycle = True
+        try:
+            self.run_cycle(due)
+        finally:
+            # Entries left unchecked by an aborted cycle are retried at the shortest interval
+            for key in due:
+                self.scheduler.record(key, True)
+            self.scheduler.sync(m.get("path", "") for m in self.mounts)
+            self.in_cycle = False
+            self.arm_timer()
+
+    def run_cycle(self, due: set):
+        if not due and not self.config_dirty:
+            return
+
         self.network_stable_check()
         if self.network_interrupted_status == 1:
             self.log(f"{T['error_log']} {T['network_lost_during_cycle']}")
@@ -253,94 +328,46 @@ class UnmountManager:
 
         self.log(f"{T['information_log']} {T['cycle_start']}")
 
-        try:
-            self.mounts = decrypt(self.admin_password)
-        except Exception as e:
-            self.log(f"{T['error_log']} {T['decryption_failed'].format(error=e)}")
-            return
+        if self.config_dirty:
+            try:
+                self.mounts = decrypt(self.admin_password)
+            except Exception as e:
+                self.log(f"{T['error_log']} {T['decryption_failed'].format(error=e)}")
+                return
+            self.config_dirty = False
+            self.remember_config_mtime()
+            self.watch_config()
+            self.scheduler.sync(m.get("path", "") for m in self.mounts)
+            due.update(self.scheduler.pop_due())
+
+        self.collect_tuning()
 
         to_unmount = []
         to_mount = []
+        auto_unmount = []
+        auto_mount = []
 
         for mount in self.mounts:
-            user = mount.get("user", "")
-            password = mount.get("password", "")
-            smb_version = mount.get("smb_version", "")
             url = mount.get("url", "")
             path = mount.get("path", "")
             last_known_status = mount.get("last_known_status", "unknown")
-            proto = "smb" if url.startswith("smb://") else "ftp" if url.startswith("ftp://") else "sftp" if url.startswith("sftp://") else "unknown"
+            proto = url_proto(url)
             host = url.split("//")[1].split('/')[0].split(':')[0]
             automount = mount.get("automount", False)
             uid, gid = os.getuid(), os.getgid()
             if "last_known_status" not in mount:
                 mount["last_known_status"] = "unknown"
+            if path not in due:
+                continue
+            due.discard(path)
 
-            if proto == "smb":
-                vers_opt = f",vers={smb_version}" if smb_version else ""
-                smb_host = "//" + self.escape_url_for_protocol(url[6:], "smb")
-
-                if not path or not smb_host or not user or not password:
-                    cmd_for_mount = ""
-                else:
-                    cmd_for_mount = [
-                        "mount", "-t", "cifs", smb_host, path, "-o",
-                        f"username={user},password={password},uid={uid},gid={gid}{vers_opt}"
-                    ]
-
-                if not path:
-                    cmd_for_unmount = ""
-                else:
-                    cmd_for_unmount = ["umount", path]
-            elif proto == "ftp":
-                ftp_url = self.escape_url_for_protocol(url, "ftp")
-                ftp_remote = ftp_url[6:]
-                ftp_host_path = ftp_remote.split('/', 1)
-                ftp_host = ftp_host_path[0]
-
-                ftp_port = ftp_host.split(':')[1] if ':' in ftp_host else '21'
-                ftp_host = ftp_host.split(':')[0] if ':' in ftp_host else ftp_host
-                full_ftp_host = f"{ftp_host}:{ftp_port}" if ftp_port != "21" else ftp_host
-
-                if not ftp_host or not path or not user or not password or not ftp_port:
-                    cmd_for_mount = ""
-                else:
-                    cmd_for_mount = [
-                        "curlftpfs", full_ftp_host, path,
-                        "-o", f"user={user}:{password},uid={uid},gid={gid}"
-                    ]
-
-                if not path:
-                    cmd_for_unmount = ""
-                else:
-                    cmd_for_unmount = ["fusermount", "-u", path]
-            elif proto == "sftp":
-                sftp_remote = url[7:]
-                sftp_host_path = sftp_remote.split('/', 1)
-                sftp_host = sftp_host_path[0]
-                sftp_remote_path = '/' + sftp_host_path[1] if len(sftp_host_path) > 1 else ''
-
-                sftp_port = sftp_host.split(':')[1] if ':' in sftp_host else '22'
-                sftp_host = sftp_host.split(':')[0] if ':' in sftp_host else sftp_host
-
-                sftp_key_path = os.path.expanduser(f"~/.ssh/netmount_keys/id_rsa_{sftp_host}_{sftp_port}")
-
-                if not user or not sftp_host or not sftp_remote_path or not path or not sftp_port or not os.path.exists(sftp_key_path):
-                    cmd_for_mount = ""
-                else:
-                    cmd_for_mount = [
-                        "sshfs", f"{user}@{sftp_host}:{sftp_remote_path}", path,
-                        "-p", sftp_port,
-                        "-o", f"IdentityFile={sftp_key_path},uid={uid},gid={gid},StrictHostKeyChecking=no"
-                    ]
-
-                if not path:
-                    cmd_for_unmount = ""
-                else:
-                    cmd_for_unmount = ["fusermount", "-u", path]
-            else:
-                cmd_for_mount = ""
+            cmd_for_mount = build_mount_command(mount, uid, gid)
+            if not path or proto == "unknown":
                 cmd_for_unmount = ""
+            elif proto == "smb":
+                cmd_for_unmount = ["umount", path]
+            else:
+                cmd_for_unmount = ["fusermount", "-u", path]
 
             if self.network_interrupted_status == 0:
                 mounted = self.is_mounted(path)
@@ -357,13 +384,68 @@ class UnmountManager:
                 "cmd_for_unmount": cmd_for_unmount,
                 "mounted": mounted,
                 "reachable": reachable,
-                "automount": automount
+                "automount": automount,
+                "order": mount.get("order", 0),
+                "mount": mount
             }
 
+            if proto == "sftp" and reachable:
+                self.schedule_tuning(mount)
+
+            policy = get_policy(mount)
+            now = time.time()
+            if reachable:
+                self.unreachable_since.pop(path, None)
+                suspended_at = self.suspended.pop(path, None)
+                if suspended_at is not None and mounted:
+                    self.log(f"{T['information_log']} {T['suspend_recovered'].format(path=path, seconds=int(now - suspended_at))}")
+            else:
+                self.unreachable_since.setdefault(path, now)
+
+            health = self.health.setdefault(path, MountHealth())
+            was_reachable = health.last_reachable
+            remount_pending = bool(cmd_for_mount) and reachable and not mounted and automount and last_known_status == "unmounted"
+            if health.record(reachable):
+                key = 'flap_suppressed' if health.suppressed else 'flap_released'
+                self.log(f"{T['information_log']} {T[key].format(path=path, flaps=health.flaps, score=health.flap_score)}")
+            if health.flapped:
+                self.log(f"{T['debug_log']} {T['flap_status'].format(path=path, flaps=health.flaps, score=health.flap_score)}")
+
+            changed = was_reachable is not None and was_reachable != reachable
+            # Fast checks only while something is about to happen; a server that simply stays off backs off
+            failing = mounted and not reachable and last_known_status == "mounted"
+            interval = self.scheduler.record(path, changed or failing or remount_pending)
+            self.log(f"{T['debug_log']} {T['next_check'].format(path=path, seconds=interval)}")
+
             if cmd_for_unmount and not reachable and mounted and last_known_status == "mounted":
-                to_unmount.append(status)
-            elif cmd_for_mount and reachable and not mounted and automount and last_known_status == "unmounted":
-                to_mount.append(status)
+                if not health.sustained_down(policy['fail_threshold']):
+                    if not health.suppressed:
+                        self.log(f"{T['debug_log']} {T['hysteresis_waiting'].format(path=path, count=health.failures, limit=policy['fail_threshold'])}")
+                    continue
+                unreachable_for = now - self.unreachable_since[path]
+                action = unreachable_action(policy, unreachable_for)
+                if action == POLICY_UNMOUNT:
+                    auto_unmount.append(status)
+                elif action == POLICY_ASK:
+                    to_unmount.append(status)
+                elif action == POLICY_SUSPEND:
+                    if path not in self.suspended:
+                        self.suspended[path] = self.unreachable_since[path]
+                        self.log(f"{T['information_log']} {T['suspend_watching'].format(path=path)}")
+                else:
+                    self.log(f"{T['debug_log']} {T['policy_waiting'].format(path=path, elapsed=int(unreachable_for), limit=policy['unreachable_after'])}")
+            elif remount_pending:
+                if not health.sustained_up(policy['success_threshold']):
+                    if not health.suppressed:
+                        self.log(f"{T['debug_log']} {T['hysteresis_waiting'].format(path=path, count=health.successes, limit=policy['success_threshold'])}")
+                    continue
+                if reachable_action(policy) == POLICY_MOUNT:
+                    auto_mount.append(status)
+                else:
+                    to_mount.append(status)
+
+        if auto_unmount or auto_mount:
+            self.apply_policies(auto_unmount, auto_mount)
 
         if to_unmount:
             if self.user_cancelled_unmount_last_time:
@@ -397,39 +479,12 @@ class UnmountManager:
                     self.log_dialog.close()
                     self.log_dialog = None
                     self.log_window = None
-                subprocess.run(["reboot"])
+                run_command(["reboot"], capture=False)
                 return
             elif clicked == unmount_btn:
-                self.network_stable_check()
                 self.log(f"{T['information_log']} {T['proceeding_with_unmount']}")
-                any_action_taken = False
 
-                for entry in to_unmount:
-                    try:
-                        if self.network_interrupted_status == 0 or self.network_interrupted_status == 2:
-                            self.log(f"{T['information_log']} {T['unmounting_entry'].format(host=entry['host'], path=entry['path'])}")
-                            if entry['proto'] == "smb":
-                                self.run_with_sudo(entry['cmd_for_unmount'])
-                                shutil.rmtree(entry['path'], ignore_errors=True)
-                                update_mount_status(self.mounts, entry['path'], "unmounted", self.admin_password)
-                                any_action_taken = True
-                            elif entry['proto'] in ("ftp", "sftp"):
-                                subprocess.run(entry['cmd_for_unmount'], check=False, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                                shutil.rmtree(entry['path'], ignore_errors=True)
-                                update_mount_status(self.mounts, entry['path'], "unmounted", self.admin_password)
-                                any_action_taken = True
-                            else:
-                                self.log(f"{T['ok_log']} {T['not_compatible_mount'].format(host=entry['host'])}")
-                                continue
-                            self.log(f"{T['ok_log']} {T['entry_unmounted'].format(host=entry['host'], path=entry['path'])}")
-                        else:
-                            self.log(f"{T['error_log']} {T['network_lost_during_cycle']}")
-
-                    except Exception as e:
-                        self.log(f"{T['error_log']} {T['mount_failed'].format(error=e)}")
-
-                if any_action_taken:
-                    clean_mount_bookmarks()
+                if self.unmount_entries(to_unmount):
                     self.log(f"{T['ok_log']} {T['all_unmounted_successfully']}")
                     QTimer.singleShot(5000, lambda: self.log_dialog and self.log_dialog.close())
                     QMessageBox.information(None, T["finished_title"], T["finished_text"])
@@ -464,63 +519,9 @@ class UnmountManager:
             clicked = dialog.clickedButton()
 
             if clicked == proceed_btn:
-                self.network_stable_check()
                 self.log(f"{T['information_log']} {T['proceeding_with_mount']}")
-                any_action_taken = False
-
-                for entry in to_mount:
-                    try:
-                        if self.network_interrupted_status == 0:
-                            result = False
-                            stderr = ""
-
-                            self.log(f"{T['information_log']} {T['mounting_entry'].format(host=entry['host'], path=entry['path'])}")
-
-                            if not os.path.exists(entry['path']):
-                                os.makedirs(entry['path'], exist_ok=True)
-
-                            if entry['proto'] == "smb":
-                                proc = subprocess.run(
-                                    ["sudo", "-S"] + entry['cmd_for_mount'],
-                                    input=self.admin_password + "\n",
-                                    capture_output=True,
-                                    text=True
-                                )
-                                stderr = proc.stderr
-                                result = proc.returncode == 0
-                                update_mount_status(self.mounts, entry['path'], "mounted", self.admin_password)
-                            elif entry['proto'] in ("ftp", "sftp"):
-                                proc = subprocess.run(
-                                    entry['cmd_for_mount'],
-                                    check=False,
-                                    stdout=subprocess.DEVNULL,
-                                    stderr=subprocess.PIPE,
-                                    text=True
-                                )
-                                stderr = proc.stderr
-                                result = proc.returncode == 0
-                                update_mount_status(self.mounts, entry['path'], "mounted", self.admin_password)
-                            else:
-                                self.log(f"{T['ok_log']} {T['not_compatible_mount'].format(host=entry['host'])}")
-
-                            if result:
-                                self.log(f"{T['ok_log']} {T['entry_mounted'].format(host=entry['host'], path=entry['path'])}")
-                                any_action_taken = True
-                            else:
-                                if "530" in stderr or "Access denied" in stderr or "Permission denied" in stderr:
-                                    self.log(f"{T['error_log']} {T['auth_failed'].format(host=entry['host'])}")
-                                elif "No such file or directory" in stderr or "Connection refused" in stderr:
-                                    self.log(f"{T['error_log']} {T['mount_failed'].format(error=T['connection_refused'])}")
-                                else:
-                                    self.log(f"{T['error_log']} {T['mount_failed'].format(error=stderr.strip() or T['unknown_error'])}")
-                        else:
-                            self.log(f"{T['error_log']} {T['network_lost_during_cycle']}")
-
-                    except Exception as e:
-                        self.log(f"{T['error_log']} {T['mount_failed'].format(error=e)}")
 
-                if any_action_taken:
-                    regenerate_bookmarks_from_active_mounts(self.mounts)
+                if self.mount_entries(to_mount):
                     self.log(f"{T['ok_log']} {T['all_mounted_successfully']}")
                     QTimer.singleShot(5000, lambda: self.log_dialog and self.log_dialog.close())
                     QMessageBox.information(None, T["finished_title"], T["finished_text"])
@@ -530,18 +531,231 @@ class UnmountManager:
                 self.user_cancelled_mount_last_time = True
                 return
         else:
-            if not to_unmount and not to_mount:
+            if not to_unmount and not to_mount and not auto_unmount and not auto_mount:
                 self.log(f"{T['debug_log']} {T['action_not_required']}")
             self.log(f"{T['ok_log']} {T['end_of_check']}")
 
+    def apply_policies(self, auto_unmount, auto_mount):
+        # The tray message names each entry by its own outcome, not by whether the batch did anything
+        done = []
+        failed = []
+
+        if auto_unmount:
+            self.log(f"{T['information_log']} {T['policy_unmount_start']}")
+            self.unmount_entries(auto_unmount)
+            for e in auto_unmount:
+                if e.get('unmount_stage') is not None:
+                    done.append(T['policy_unmounted'].format(host=e['host'], path=e['path']))
+                else:
+                    failed.append(T['policy_unmount_failed'].format(host=e['host'], path=e['path']))
+
+        if auto_mount:
+            self.log(f"{T['information_log']} {T['policy_mount_start']}")
+            self.mount_entries(auto_mount)
+            for e in auto_mount:
+                if e.get('mount_ok'):
+                    done.append(T['policy_mounted'].format(host=e['host'], path=e['path']))
+                else:
+                    failed.append(T['policy_mount_failed'].format(host=e['host'], path=e['path']))
+
+        if done or failed:
+            self.tray.showMessage(
+                T["policy_applied_title"],
+                "\n".join(done + failed),
+                QSystemTrayIcon.MessageIcon.Warning if failed else QSystemTrayIcon.MessageIcon.Information,
+                10000
+            )
+
+    def run_batch(self, entries, operation) -> list[tuple[dict, CommandResult]]:
+        results = []
+        workers = max(1, min(DAEMON_MAX_WORKERS, len(entries)))
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            pending = {pool.submit(operation, entry): entry for entry in entries}
+            while pending:
+                done, _ = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                for future in done:
+                    entry = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = CommandResult([], -1, "", str(e), 0.0)
+                    self.log(f"{T['debug_log']} {T['command_duration'].format(path=entry['path'], seconds=result.duration)}")
+                    results.append((entry, result))
+                QApplication.processEvents()
+
+        return results
+
+    def pause(self, seconds: float) -> None:
+        # Waits in a nested event loop: the tray and log window stay live without polling
+        loop = QEventLoop()
+        QTimer.singleShot(int(seconds * 1000), loop.quit)
+        loop.exec()
+
+    def unmount_one(self, entry) -> CommandResult:
+        result, stage = detach(
+            entry['path'], entry['proto'] != "smb", self.run_with_sudo, reachable=entry.get('reachable', True)
+        )
+        entry['unmount_stage'] = stage
+        if stage is not None:
+            try:
+                cleanup_mountpoint(entry['path'])
+            except OSError as e:
+                self.log(f"{T['debug_log']} {T['cleanup_skipped'].format(path=entry['path'], error=e)}")
+        return result
+
+    def mount_one(self, entry) -> CommandResult:
+        if not os.path.exists(entry['path']):
+            os.makedirs(entry['path'], exist_ok=True)
+
+        if entry['proto'] == "smb":
+            # Negotiate the dialect once per host; a failed mount re-probes for the next attempt
+            if needs_smb_probe(entry['mount']):
+                refresh_smb_capabilities(entry['mount'])
+                entry['cmd_for_mount'] = build_mount_command(entry['mount'], os.getuid(), os.getgid()) or entry['cmd_for_mount']
+            result = self.run_with_sudo(entry['cmd_for_mount'], MOUNT_OP_TIMEOUT)
+            if not result.ok and result.error_kind != ERROR_AUTH:
+                refresh_smb_capabilities(entry['mount'])
+            return result
+        return run_command(entry['cmd_for_mount'], timeout=MOUNT_OP_TIMEOUT)
+
+    def unmount_entries(self, entries) -> bool:
+        self.network_stable_check()
+        if self.network_interrupted_status not in (0, 2):
+            self.log(f"{T['error_log']} {T['network_lost_during_cycle']}")
+            return False
+
+        batch = []
+        for entry in entries:
+            if entry['proto'] in ("smb", "ftp", "sftp"):
+                self.log(f"{T['information_log']} {T['unmounting_entry'].format(host=entry['host'], path=entry['path'])}")
+                batch.append(entry)
+            else:
+                self.log(f"{T['ok_log']} {T['not_compatible_mount'].format(host=entry['host'])}")
+
+        any_action_taken = False
+        for entry, result in self.run_batch(batch, self.unmount_one):
+            stage = entry.get('unmount_stage')
+            if stage is not None:
+                set_mount_status(self.mounts, entry['path'], "unmounted")
+                self.unreachable_since.pop(entry['path'], None)
+                self.log(f"{T['debug_log']} {T['unmount_stage'].format(path=entry['path'], stage=T['stage_' + stage], seconds=result.duration)}")
+                self.log(f"{T['ok_log']} {T['entry_unmounted'].format(host=entry['host'], path=entry['path'])}")
+                any_action_taken = True
+            else:
+                error = result.stderr.strip() or T['unknown_error']
+                self.log(f"{T['error_log']} {T['unmount_stuck'].format(path=entry['path'], error=error)}")
+
+        if any_action_taken:
+            self.commit_status()
+            # The bookmark/XML stack is only loaded once a cycle actually changes something
+            from netmount.bookmarks import clean_mount_bookmarks
+            clean_mount_bookmarks()
+        return any_action_taken
+
+    def mount_entries(self, entries) -> bool:
+        self.network_stable_check()
+        if self.network_interrupted_status != 0:
+            self.log(f"{T['error_log']} {T['network_lost_during_cycle']}")
+            return False
+
+        batch = []
+        for entry in entries:
+            if entry['proto'] in ("smb", "ftp", "sftp"):
+                batch.append(entry)
+            else:
+                self.log(f"{T['ok_log']} {T['not_compatible_mount'].format(host=entry['host'])}")
+
+        report = RecoveryReport(self.network_restored_at)
+        self.network_restored_at = None
+        results = []
+        for i, wave in enumerate(plan_waves(batch)):
+            if i:
+                self.pause(wave_delay())
+            for entry in wave:
+                self.log(f"{T['information_log']} {T['mounting_entry'].format(host=entry['host'], path=entry['path'])}")
+            for entry, result in self.run_batch(wave, self.mount_one):
+                report.record(result.ok)
+                results.append((entry, result))
+        report.finish()
+
+        any_action_taken = False
+        for entry, result in results:
+            # A failed remount stays "unmounted", so remount_pending picks it up again next cycle
+            set_mount_status(self.mounts, entry['path'], "mounted" if result.ok else "unmounted")
+            entry['mount_ok'] = result.ok
+
+            if result.ok:
+                self.log(f"{T['ok_log']} {T['entry_mounted'].format(host=entry['host'], path=entry['path'])}")
+                any_action_taken = True
+            elif result.error_kind == ERROR_AUTH:
+                self.log(f"{T['error_log']} {T['auth_failed'].format(host=entry['host'])}")
+            elif result.error_kind == ERROR_REFUSED:
+                self.log(f"{T['error_log']} {T['mount_failed'].format(error=T['connection_refused'])}")
+            elif result.error_kind == ERROR_TIMEOUT:
+                self.log(f"{T['error_log']} {T['mount_failed'].format(error=T['operation_timeout'].format(seconds=MOUNT_OP_TIMEOUT))}")
+            else:
+                self.log(f"{T['error_log']} {T['mount_failed'].format(error=result.stderr.strip() or T['unknown_error'])}")
+
+        if results:
+            first = f"{report.first_mounted:.1f}s" if report.first_mounted is not None else "-"
+            all_done = f"{report.all_mounted:.1f}s" if report.all_mounted is not None else "-"
+            msg = T['recovery_report'].format(mounted=report.mounted, total=len(results), first=first, all=all_done)
+            self.log(f"{T['information_log']} {msg}")
+            self.commit_status()
+        if any_action_taken:
+            from netmount.bookmarks import regenerate_bookmarks_from_active_mounts
+            regenerate_bookmarks_from_active_mounts(self.mounts)
+        return any_action_taken
+
+    def schedule_tuning(self, mount) -> None:
+        # Re-measures the fastest sshfs cipher in the background once the last calibration is too old.
+        # One host at a time, SSH_TUNE_RECHECK_GAP apart and with a smaller sample than a manual
+        # calibration, so stale hosts never pile up transfers next to the check cycle
+        path = mount.get("path", "")
+        if self.tuning or not is_stale(mount):
+            return
+        now = time.time()
+        if now - self.tuning_failed.get(path, 0) < TUNE_RETRY_AFTER or now - self.last_tuning < SSH_TUNE_RECHECK_GAP:
+            return
+        self.last_tuning = now
+        self.log(f"{T['information_log']} {T['tuning_started'].format(path=path)}")
+        self.tuning[path] = self.tune_pool.submit(calibrate_mount, dict(mount), SSH_TUNE_RECHECK_BYTES)
+
+    def collect_tuning(self) -> None:
+        changed = False
+        for path, future in list(self.tuning.items()):
+            if not future.done():
+                continue
+            del self.tuning[path]
+            try:
+                tuning = future.result()
+            except Exception:
+                tuning = None
+            if not tuning:
+                self.tuning_failed[path] = time.time()
+                continue
+            for m in self.mounts:
+                if m.get("path") == path:
+                    m["ssh_tuning"] = tuning
+                    changed = True
+                    self.log(f"{T['information_log']} {T['tuning_updated'].format(path=path, cipher=tuning['cipher'], mbps=tuning['mbps'])}")
+        if changed:
+            self.commit_status()
+
+    def commit_status(self) -> None:
+        try:
+            encrypt(self.admin_password, self.mounts)
+            self.remember_config_mtime()
+        except Exception as e:
+            self.log(f"{T['error_log']} {T['config_save_failed'].format(error=e)}")
+
 def main():
     app = QApplication(sys.argv)
     app.setWindowIcon(QIcon(str(icon_path)))
     time.sleep(5)
     manager = UnmountManager()
-    timer = QTimer()
-    timer.timeout.connect(manager.main_loop)
-    timer.start(5000)
+    manager.timer.start(0)
     sys.exit(app.exec())
 
 if __name__ == "__main__":
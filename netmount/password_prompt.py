@@ -1,6 +1,27 @@
+import os
 import subprocess
 import sys
 from PyQt6.QtWidgets import QInputDialog, QMessageBox, QLineEdit
+from netmount.runner import run_command
+
+PASSWORD_STDIN_FLAG = "--password-stdin"
+
+def password_from_parent():
+    # The launching NetMountManager process hands the password over on stdin, never in the environment
+    password = os.environ.pop("NETMOUNT_PW", None)
+    if PASSWORD_STDIN_FLAG in sys.argv:
+        line = sys.stdin.readline().rstrip("\n")
+        password = line or password
+    return password
+
+def launch_with_password(command, admin_password, **kwargs):
+    proc = subprocess.Popen(command + [PASSWORD_STDIN_FLAG], stdin=subprocess.PIPE, text=True, **kwargs)
+    try:
+        proc.stdin.write((admin_password or "") + "\n")
+        proc.stdin.close()
+    except Exception:
+        pass
+    return proc
 
 def ask_admin_password(T, parent=None, log=None):
     if log:
@@ -19,14 +40,8 @@ def ask_admin_password(T, parent=None, log=None):
             sys.exit(1)
 
         try:
-            proc = subprocess.run(
-                ["sudo", "-S", "whoami"],
-                input=text + "\n",
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            if proc.returncode == 0 and "root" in proc.stdout:
+            proc = run_command(["sudo", "-S", "whoami"], timeout=5, input=text + "\n")
+            if proc.ok and "root" in proc.stdout:
                 return text
             else:
                 QMessageBox.warning(parent, T['invalid_password_title'], T['invalid_password_text'])
@@ -0,0 +1,65 @@
+from typing import Any
+
+# 🛡️ Per-mount unattended remediation policies (NetUnmounter daemon)
+POLICY_ASK = "ask"
+POLICY_UNMOUNT = "unmount"
+POLICY_MOUNT = "mount"
+POLICY_SUSPEND = "suspend"
+
+UNREACHABLE_POLICIES = (POLICY_ASK, POLICY_UNMOUNT, POLICY_SUSPEND)
+REACHABLE_POLICIES = (POLICY_ASK, POLICY_MOUNT)
+
+DEFAULT_POLICY = {
+    "on_unreachable": POLICY_ASK,
+    "unreachable_after": 0,
+    "on_reachable": POLICY_ASK,
+    "fail_threshold": 3,
+    "success_threshold": 2,
+}
+
+def get_policy(mount: dict[str, Any]) -> dict[str, Any]:
+    policy = dict(DEFAULT_POLICY)
+    stored = mount.get("policy")
+    if isinstance(stored, dict):
+        if stored.get("on_unreachable") in UNREACHABLE_POLICIES:
+            policy["on_unreachable"] = stored["on_unreachable"]
+        if stored.get("on_reachable") in REACHABLE_POLICIES:
+            policy["on_reachable"] = stored["on_reachable"]
+        for key, minimum in (("unreachable_after", 0), ("fail_threshold", 1), ("success_threshold", 1)):
+            try:
+                policy[key] = max(minimum, int(stored.get(key, policy[key])))
+            except (TypeError, ValueError):
+                pass
+    return policy
+
+def make_policy(on_unreachable: str, unreachable_after: int, on_reachable: str,
+                fail_threshold: int = DEFAULT_POLICY["fail_threshold"],
+                success_threshold: int = DEFAULT_POLICY["success_threshold"]) -> dict[str, Any]:
+    return get_policy({"policy": {
+        "on_unreachable": on_unreachable,
+        "unreachable_after": unreachable_after,
+        "on_reachable": on_reachable,
+        "fail_threshold": fail_threshold,
+        "success_threshold": success_threshold,
+    }})
+
+def unreachable_action(policy: dict[str, Any], unreachable_for: float) -> str:
+    # "ask" -> dialog, "unmount" -> act now, "wait" -> grace period not over yet,
+    # "suspend" -> keep the mount and let the protocol reconnect (ask once unreachable_after runs out, 0 = never)
+    if policy["on_unreachable"] == POLICY_SUSPEND:
+        if not policy["unreachable_after"] or unreachable_for < policy["unreachable_after"]:
+            return POLICY_SUSPEND
+        return POLICY_ASK
+    if policy["on_unreachable"] != POLICY_UNMOUNT:
+        return POLICY_ASK
+    if unreachable_for < policy["unreachable_after"]:
+        return "wait"
+    return POLICY_UNMOUNT
+
+def is_suspend(policy: dict[str, Any]) -> bool:
+    return policy["on_unreachable"] == POLICY_SUSPEND
+
+def reachable_action(policy: dict[str, Any]) -> str:
+    if policy["on_reachable"] == POLICY_MOUNT:
+        return POLICY_MOUNT
+    return POLICY_ASK
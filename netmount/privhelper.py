@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+import os
+import sys
+import re
+import json
+import time
+import socket
+import struct
+import select
+import argparse
+import threading
+import subprocess
+import socketserver
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+current_file = Path(__file__).resolve()
+project_root = current_file.parent.parent
+sys.path.insert(0, str(project_root))
+
+from netmount.config import HELPER_SOCKET, HELPER_IDLE_TIMEOUT, HELPER_START_TIMEOUT, MOUNT_OP_TIMEOUT, UNMOUNT_FAST_STEP_TIMEOUT
+from netmount.runner import run_command, CommandResult, CANCEL_POLL
+
+# 🔒 The only requests the root helper accepts
+CIFS_OPTION_KEYS = {
+    "username", "password", "domain", "uid", "gid", "vers", "sec", "seal",
+    "rsize", "wsize", "cache", "actimeo", "multichannel", "max_channels",
+    "echo_interval", "soft", "hard", "handletimeout", "noserverino", "nobrl",
+}
+UMOUNT_FLAGS = {"-f", "-l"}
+MAX_OP_TIMEOUT = 120
+MAX_BATCH = 64
+SOURCE_RE = re.compile(r"^//[^/\s,]+/[^\n\r\0,]+$")
+MOUNT_NAME_RE = re.compile(r"^[a-zA-Z0-9]+$")
+
+class HelperError(Exception):
+    pass
+
+# --- server side (runs as root) ---
+
+def validate_target(target: str, root: str) -> str:
+    if not isinstance(target, str) or not target:
+        raise HelperError("missing target")
+    real = os.path.realpath(target)
+    if os.path.dirname(real) != os.path.realpath(root) or not MOUNT_NAME_RE.match(os.path.basename(real)):
+        raise HelperError(f"target outside {root}: {target}")
+    return real
+
+def validate_options(options: str, uid: int, gid: int) -> str:
+    if not isinstance(options, str) or any(c in options for c in "\n\r\0"):
+        raise HelperError("invalid options")
+    for opt in options.split(","):
+        key, _, value = opt.partition("=")
+        if key not in CIFS_OPTION_KEYS:
+            raise HelperError(f"option not allowed: {key}")
+        if key == "uid" and value != str(uid):
+            raise HelperError("uid mismatch")
+        if key == "gid" and value != str(gid):
+            raise HelperError("gid mismatch")
+    return options
+
+def op_timeout(request: dict) -> float:
+    # The floor is the shortest unmount ladder step, so detaching from a dead server stays sub-second
+    try:
+        return min(MAX_OP_TIMEOUT, max(UNMOUNT_FAST_STEP_TIMEOUT, float(request.get("timeout", MOUNT_OP_TIMEOUT))))
+    except (TypeError, ValueError):
+        return float(MOUNT_OP_TIMEOUT)
+
+def build_command(request: dict, settings: dict) -> list[str]:
+    op = request.get("op")
+    if op == "mount":
+        source = request.get("source", "")
+        if not isinstance(source, str) or not SOURCE_RE.match(source):
+            raise HelperError(f"invalid source: {source}")
+        target = validate_target(request.get("target"), settings["root"])
+        options = validate_options(request.get("options", ""), settings["uid"], settings["gid"])
+        return ["mount", "-t", "cifs", source, target, "-o", options]
+    if op == "umount":
+        flags = request.get("flags", [])
+        if not isinstance(flags, list) or not set(flags) <= UMOUNT_FLAGS:
+            raise HelperError(f"invalid umount flags: {flags}")
+        target = validate_target(request.get("target"), settings["root"])
+        return ["umount"] + flags + [target]
+    raise HelperError(f"unknown op: {op}")
+
+def execute(request: dict, settings: dict, cancel: threading.Event | None = None) -> dict:
+    try:
+        cmd = build_command(request, settings)
+    except HelperError as e:
+        return {"ok": False, "returncode": -1, "stderr": str(e)}
+
+    try:
+        result = run_command(cmd, timeout=op_timeout(request), cancel=cancel)
+        return {
+            "ok": result.ok, "returncode": result.returncode, "stderr": result.stderr,
+            "duration": result.duration, "timed_out": result.timed_out, "cancelled": result.cancelled
+        }
+    except Exception as e:
+        return {"ok": False, "returncode": -1, "stderr": str(e)}
+
+def dispatch(request: dict, settings: dict, cancel: threading.Event | None = None) -> dict:
+    op = request.get("op")
+    if op == "ping":
+        return {"ok": True, "pid": os.getpid()}
+    if op == "batch":
+        requests = request.get("requests", [])
+        if not isinstance(requests, list) or len(requests) > MAX_BATCH:
+            return {"ok": False, "stderr": "invalid batch"}
+        if not requests:
+            return {"ok": True, "results": []}
+        with ThreadPoolExecutor(max_workers=min(8, len(requests))) as pool:
+            results = list(pool.map(lambda r: execute(r, settings, cancel), requests))
+        return {"ok": all(r["ok"] for r in results), "results": results}
+    return execute(request, settings, cancel)
+
+def watch_peer(sock: socket.socket, cancel: threading.Event, done: threading.Event) -> None:
+    # The client cancels by closing its end: EOF before the response means nobody waits for the op any more
+    while not done.is_set():
+        readable, _, _ = select.select([sock], [], [], CANCEL_POLL)
+        if not readable:
+            continue
+        try:
+            data = sock.recv(1, socket.MSG_PEEK)
+        except OSError:
+            data = b""
+        if not data:
+            cancel.set()
+        return
+
+class HelperHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        server = self.server
+        server.last_activity = time.monotonic()
+        creds = self.request.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+        _, peer_uid, _ = struct.unpack("3i", creds)
+        if peer_uid not in (0, server.settings["uid"]):
+            return
+
+        try:
+            request = json.loads(self.rfile.readline(1 << 16).decode("utf-8"))
+            if not isinstance(request, dict):
+                raise ValueError("request must be an object")
+        except Exception as e:
+            response = {"ok": False, "stderr": f"bad request: {e}"}
+        else:
+            if request.get("op") == "shutdown":
+                response = {"ok": True}
+                threading.Thread(target=server.shutdown, daemon=True).start()
+            else:
+                cancel = threading.Event()
+                done = threading.Event()
+                watcher = threading.Thread(target=watch_peer, args=(self.request, cancel, done), daemon=True)
+                watcher.start()
+                try:
+                    response = dispatch(request, server.settings, cancel)
+                finally:
+                    done.set()
+                    watcher.join()
+                if cancel.is_set():
+                    # The client is gone; there is nobody to answer
+                    return
+
+        self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+        server.last_activity = time.monotonic()
+
+class HelperServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+def serve(socket_path: str, settings: dict, idle_timeout: float) -> None:
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+    old_umask = os.umask(0o177)
+    try:
+        server = HelperServer(socket_path, HelperHandler)
+    finally:
+        os.umask(old_umask)
+    os.chown(socket_path, settings["uid"], settings["gid"])
+    os.chmod(socket_path, 0o600)
+
+    server.settings = settings
+    server.last_activity = time.monotonic()
+
+    def idle_watchdog():
+        while True:
+            time.sleep(5)
+            if time.monotonic() - server.last_activity > idle_timeout:
+                server.shutdown()
+                return
+
+    threading.Thread(target=idle_watchdog, daemon=True).start()
+    try:
+        server.serve_forever(poll_interval=1.0)
+    finally:
+        server.server_close()
+        try:
+            os.unlink(socket_path)
+        except OSError:
+            pass
+
+# --- client side (runs as the desktop user) ---
+
+class PrivilegedHelper:
+    def __init__(self, admin_password: str, socket_path: Path = HELPER_SOCKET):
+        self.admin_password = admin_password
+        self.socket_path = Path(socket_path)
+        self.lock = threading.Lock()
+
+    def connect(self, timeout: float) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.settimeout(timeout)
+            sock.connect(str(self.socket_path))
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+    def send(self, request: dict, timeout: float, cancel: threading.Event | None = None,
+             sock: socket.socket | None = None) -> dict:
+        # `sock` is a connection from connect(), a new one is opened without it.
+        # A set `cancel` closes the connection, which makes the helper kill the running op
+        deadline = time.monotonic() + timeout
+        with sock or self.connect(timeout) as sock:
+            sock.sendall((json.dumps(request) + "\n").encode("utf-8"))
+            data = b""
+            while not data.endswith(b"\n"):
+                if cancel is not None:
+                    if cancel.is_set():
+                        return {"ok": False, "returncode": -1, "stderr": "", "cancelled": True}
+                    sock.settimeout(max(0.01, min(CANCEL_POLL, deadline - time.monotonic())))
+                try:
+                    chunk = sock.recv(65536)
+                except socket.timeout:
+                    if cancel is not None and time.monotonic() < deadline:
+                        continue
+                    raise
+                if not chunk:
+                    break
+                data += chunk
+        return json.loads(data.decode("utf-8"))
+
+    def is_running(self) -> bool:
+        try:
+            return bool(self.send({"op": "ping"}, timeout=2).get("ok"))
+        except Exception:
+            return False
+
+    def ensure_running(self) -> bool:
+        with self.lock:
+            if self.is_running():
+                return True
+            if not self.admin_password:
+                return False
+
+            self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+            cmd = [
+                "sudo", "-S", "-p", "", sys.executable, str(current_file), "--serve",
+                "--socket", str(self.socket_path),
+                "--uid", str(os.getuid()), "--gid", str(os.getgid()),
+                "--root", os.path.expanduser("~/mnt"),
+            ]
+            try:
+                proc = subprocess.Popen(
+                    cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL, text=True, start_new_session=True
+                )
+                proc.stdin.write(self.admin_password + "\n")
+                proc.stdin.close()
+            except Exception:
+                return False
+
+            deadline = time.monotonic() + HELPER_START_TIMEOUT
+            while time.monotonic() < deadline:
+                if proc.poll() is not None:
+                    return False
+                if self.is_running():
+                    return True
+                time.sleep(0.1)
+            return False
+
+    def run(self, command: list[str], timeout: float = MOUNT_OP_TIMEOUT,
+            cancel: threading.Event | None = None) -> CommandResult:
+        request = request_from_argv(command)
+        request["timeout"] = timeout
+        sock = self.reach(timeout + 5)
+        if sock is not None:
+            try:
+                return to_result(command, self.send(request, timeout=timeout + 5, cancel=cancel, sock=sock))
+            except Exception as e:
+                return lost_result(command, e, timeout)
+
+        # Fallback: one sudo spawn for this operation only
+        return run_command(["sudo", "-S"] + command, timeout=timeout, input=self.admin_password + "\n", cancel=cancel)
+
+    def batch(self, commands: list[list[str]], timeout: float = MOUNT_OP_TIMEOUT) -> list[CommandResult]:
+        requests = [dict(request_from_argv(cmd), timeout=timeout) for cmd in commands]
+        sock = self.reach(timeout * len(requests) + 5)
+        if sock is None:
+            return [self.run(cmd, timeout) for cmd in commands]
+        try:
+            result = self.send({"op": "batch", "requests": requests}, timeout=timeout * len(requests) + 5, sock=sock)
+        except Exception as e:
+            return [lost_result(cmd, e, timeout) for cmd in commands]
+        return [to_result(cmd, r) for cmd, r in zip(commands, result.get("results", []))]
+
+    def reach(self, timeout: float) -> socket.socket | None:
+        # A connection for one request, or None when sudo has to take over. Only this point may fall back:
+        # once a request is written the helper may already be running it, and a sudo retry would run
+        # the same mount/umount a second time, so later failures are reported as they are
+        if not self.ensure_running():
+            return None
+        try:
+            return self.connect(timeout)
+        except OSError:
+            return None
+
+    def shutdown(self) -> None:
+        try:
+            self.send({"op": "shutdown"}, timeout=2)
+        except Exception:
+            pass
+
+def to_result(command: list[str], response: dict) -> CommandResult:
+    return CommandResult(
+        command, response.get("returncode", -1), "", response.get("stderr", ""),
+        response.get("duration", 0.0), response.get("timed_out", False), response.get("cancelled", False)
+    )
+
+def lost_result(command: list[str], error: Exception, timeout: float) -> CommandResult:
+    # The request reached the helper but no answer came back
+    return CommandResult(command, -1, "", f"privileged helper: {error}", timeout, isinstance(error, TimeoutError))
+
+def request_from_argv(command: list[str]) -> dict:
+    # Accepts the two command shapes the app builds: mount -t cifs SRC DST -o OPTS / umount [-f|-l] DST
+    if len(command) == 7 and command[:3] == ["mount", "-t", "cifs"] and command[5] == "-o":
+        return {"op": "mount", "source": command[3], "target": command[4], "options": command[6]}
+    if len(command) >= 2 and command[0] == "umount":
+        return {"op": "umount", "flags": command[1:-1], "target": command[-1]}
+    raise HelperError(f"unsupported privileged command: {command[:1]}")
+
+_helper = None
+
+def get_helper(admin_password: str) -> PrivilegedHelper:
+    global _helper
+    if _helper is None:
+        _helper = PrivilegedHelper(admin_password)
+    _helper.admin_password = admin_password
+    return _helper
+
+def main():
+    parser = argparse.ArgumentParser(description="NetMountManager privileged mount helper")
+    parser.add_argument("--serve", action="store_true")
+    parser.add_argument("--socket", default=str(HELPER_SOCKET))
+    parser.add_argument("--uid", type=int, required=True)
+    parser.add_argument("--gid", type=int, required=True)
+    parser.add_argument("--root", required=True)
+    parser.add_argument("--idle-timeout", type=float, default=HELPER_IDLE_TIMEOUT)
+    args = parser.parse_args()
+
+    if not args.serve or os.geteuid() != 0:
+        sys.exit(1)
+
+    serve(args.socket, {"uid": args.uid, "gid": args.gid, "root": args.root}, args.idle_timeout)
+
+if __name__ == "__main__":
+    main()
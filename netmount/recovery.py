@@ -0,0 +1,48 @@
+import random
+import time
+from typing import Any
+
+from netmount.config import RECOVERY_WAVE_SIZE, RECOVERY_PER_HOST_LIMIT, RECOVERY_JITTER
+
+def plan_waves(entries: list[dict[str, Any]], wave_size: int = RECOVERY_WAVE_SIZE,
+               per_host_limit: int = RECOVERY_PER_HOST_LIMIT) -> list[list[dict[str, Any]]]:
+    # Lower 'order' first; a wave never holds more than per_host_limit entries of one server
+    remaining = sorted(entries, key=lambda e: e.get("order", 0))
+    waves = []
+
+    while remaining:
+        wave, rest, per_host = [], [], {}
+        for entry in remaining:
+            host = entry.get("host", "")
+            if len(wave) < max(1, wave_size) and per_host.get(host, 0) < max(1, per_host_limit):
+                wave.append(entry)
+                per_host[host] = per_host.get(host, 0) + 1
+            else:
+                rest.append(entry)
+        waves.append(wave)
+        remaining = rest
+
+    return waves
+
+def wave_delay(jitter: tuple[float, float] = RECOVERY_JITTER) -> float:
+    return random.uniform(*jitter)
+
+class RecoveryReport:
+    def __init__(self, started: float | None = None):
+        self.started = time.monotonic() if started is None else started
+        self.first_mounted = None
+        self.all_mounted = None
+        self.mounted = 0
+        self.failed = 0
+
+    def record(self, ok: bool) -> None:
+        if ok:
+            self.mounted += 1
+            if self.first_mounted is None:
+                self.first_mounted = time.monotonic() - self.started
+        else:
+            self.failed += 1
+
+    def finish(self) -> None:
+        if self.mounted and not self.failed:
+            self.all_mounted = time.monotonic() - self.started
@@ -0,0 +1,124 @@
+import os
+import signal
+import subprocess
+import threading
+import time
+from collections import deque
+
+from netmount.config import COMMAND_TIMEOUT
+
+# Error buckets shared by the GUI, auto_mount and the daemon
+ERROR_AUTH = "auth"
+ERROR_REFUSED = "refused"
+ERROR_TIMEOUT = "timeout"
+ERROR_CANCELLED = "cancelled"
+ERROR_UNKNOWN = "unknown"
+
+AUTH_MARKERS = ("530", "Access denied", "Permission denied", "NT_STATUS_LOGON_FAILURE", "Authentication failed")
+REFUSED_MARKERS = ("No such file or directory", "Connection refused", "Host is down", "No route to host")
+
+# How often a running command checks its cancel event (s)
+CANCEL_POLL = 0.2
+
+# Longest wait per signal when a timed-out or cancelled command is killed (s); short steps wait a quarter of their timeout
+KILL_GRACE = 1.0
+
+# Last invocations with their duration, newest last
+HISTORY = deque(maxlen=200)
+_history_lock = threading.Lock()
+
+class CommandResult(subprocess.CompletedProcess):
+    def __init__(self, args, returncode, stdout, stderr, duration, timed_out=False, cancelled=False):
+        super().__init__(args, returncode, stdout, stderr)
+        self.duration = duration
+        self.timed_out = timed_out
+        self.cancelled = cancelled
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0 and not self.timed_out and not self.cancelled
+
+    @property
+    def error_kind(self) -> str | None:
+        if self.ok:
+            return None
+        if self.cancelled:
+            return ERROR_CANCELLED
+        if self.timed_out:
+            return ERROR_TIMEOUT
+        return classify_error(self.stderr)
+
+def classify_error(stderr: str | None) -> str:
+    stderr = stderr or ""
+    if any(marker in stderr for marker in AUTH_MARKERS):
+        return ERROR_AUTH
+    if any(marker in stderr for marker in REFUSED_MARKERS):
+        return ERROR_REFUSED
+    return ERROR_UNKNOWN
+
+def kill_process_group(proc: subprocess.Popen, grace: float = KILL_GRACE) -> None:
+    for sig in (signal.SIGTERM, signal.SIGKILL):
+        try:
+            os.killpg(proc.pid, sig)
+        except (ProcessLookupError, PermissionError):
+            return
+        try:
+            proc.wait(timeout=grace)
+            return
+        except subprocess.TimeoutExpired:
+            continue
+
+def run_command(cmd, timeout: float = COMMAND_TIMEOUT, input: str | None = None, env=None,
+                shell: bool = False, check: bool = False, capture: bool = True,
+                cancel: threading.Event | None = None) -> CommandResult:
+    # Every command runs in its own process group so a hung helper and its children die together.
+    # A set `cancel` event kills the group the same way a timeout does.
+    started = time.monotonic()
+    proc = subprocess.Popen(
+        cmd,
+        stdin=subprocess.PIPE if input is not None else subprocess.DEVNULL,
+        stdout=subprocess.PIPE if capture else subprocess.DEVNULL,
+        stderr=subprocess.PIPE if capture else subprocess.DEVNULL,
+        text=True,
+        env=env,
+        shell=shell,
+        start_new_session=True
+    )
+
+    # The kill grace is part of the budget: the command runs until `timeout - grace`, and stopping
+    # and reaping it fit into the rest, so a step never takes longer than its timeout
+    grace = min(KILL_GRACE, timeout / 4)
+    timed_out = cancelled = False
+    deadline = started + timeout - grace
+    try:
+        if cancel is None:
+            stdout, stderr = proc.communicate(input, timeout=timeout - grace)
+        else:
+            while True:
+                try:
+                    stdout, stderr = proc.communicate(input, timeout=max(0.0, min(CANCEL_POLL, deadline - time.monotonic())))
+                    break
+                except subprocess.TimeoutExpired:
+                    if cancel.is_set():
+                        cancelled = True
+                        raise
+                    if time.monotonic() >= deadline:
+                        raise
+    except subprocess.TimeoutExpired:
+        timed_out = not cancelled
+        # SIGTERM and SIGKILL get half the grace each; the pipes are drained in what is left
+        kill_process_group(proc, grace / 2)
+        try:
+            stdout, stderr = proc.communicate(timeout=max(0.01, started + timeout - time.monotonic()))
+        except subprocess.TimeoutExpired:
+            stdout, stderr = "", ""
+
+    result = CommandResult(cmd, proc.returncode, stdout or "", stderr or "", time.monotonic() - started, timed_out, cancelled)
+    with _history_lock:
+        HISTORY.append((cmd if shell else cmd[0], result.returncode, result.duration, result.timed_out))
+
+    if check:
+        if timed_out:
+            raise subprocess.TimeoutExpired(cmd, timeout, result.stdout, result.stderr)
+        result.check_returncode()
+    return result
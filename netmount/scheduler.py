@@ -0,0 +1,71 @@
+import heapq
+import itertools
+import time
+from typing import Hashable, Iterable
+
+from netmount.config import CHECK_INTERVAL_MIN, CHECK_INTERVAL_MAX, CHECK_INTERVAL_BACKOFF, CHECK_COALESCE_WINDOW
+
+class CheckScheduler:
+    # Min-heap of (deadline, seq, key); stale heap items are skipped lazily
+    def __init__(self, min_interval: float = CHECK_INTERVAL_MIN, max_interval: float = CHECK_INTERVAL_MAX,
+                 backoff: float = CHECK_INTERVAL_BACKOFF, coalesce: float = CHECK_COALESCE_WINDOW):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.coalesce = coalesce
+        self.heap = []
+        self.deadlines = {}
+        self.intervals = {}
+        self.seq = itertools.count()
+
+    def schedule(self, key: Hashable, delay: float, now: float | None = None) -> None:
+        now = time.monotonic() if now is None else now
+        deadline = now + max(0.0, delay)
+        self.deadlines[key] = deadline
+        heapq.heappush(self.heap, (deadline, next(self.seq), key))
+
+    def sync(self, keys: Iterable[Hashable]) -> None:
+        keys = set(keys)
+        for key in list(self.intervals):
+            if key not in keys:
+                del self.intervals[key]
+                self.deadlines.pop(key, None)
+        for key in keys:
+            if key not in self.intervals:
+                self.intervals[key] = self.min_interval
+                self.schedule(key, 0.0)
+            elif key not in self.deadlines:
+                self.schedule(key, self.intervals[key])
+
+    def reset_all(self) -> None:
+        for key in self.intervals:
+            self.intervals[key] = self.min_interval
+            self.schedule(key, 0.0)
+
+    def pop_due(self, now: float | None = None) -> set:
+        now = time.monotonic() if now is None else now
+        due = set()
+        while self.heap and self.heap[0][0] <= now + self.coalesce:
+            deadline, _, key = heapq.heappop(self.heap)
+            if self.deadlines.get(key) == deadline:
+                del self.deadlines[key]
+                due.add(key)
+        return due
+
+    def next_delay(self, now: float | None = None) -> float | None:
+        now = time.monotonic() if now is None else now
+        while self.heap and self.deadlines.get(self.heap[0][2]) != self.heap[0][0]:
+            heapq.heappop(self.heap)
+        if not self.heap:
+            return None
+        return max(0.0, self.heap[0][0] - now)
+
+    def record(self, key: Hashable, unsettled: bool) -> float:
+        # State change or failure -> check again soon; healthy -> relax towards the ceiling
+        if unsettled:
+            interval = self.min_interval
+        else:
+            interval = min(self.max_interval, self.intervals.get(key, self.min_interval) * self.backoff)
+        self.intervals[key] = interval
+        self.schedule(key, interval)
+        return interval
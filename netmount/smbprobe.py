@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+import os
+import sys
+import json
+import time
+import uuid
+import socket
+import struct
+import threading
+from pathlib import Path
+
+current_file = Path(__file__).resolve()
+project_root = current_file.parent.parent
+sys.path.insert(0, str(project_root))
+
+from netmount.config import SMB_PROBE_CACHE, SMB_PROBE_TIMEOUT, SMB_PROBE_MAX_AGE
+
+# 🤝 SMB2 NEGOTIATE probe: asks the server which dialect and capabilities it offers
+DIALECTS = {
+    0x0202: "2.0",
+    0x0210: "2.1",
+    0x0300: "3.0",
+    0x0302: "3.02",
+    0x0311: "3.1.1",
+}
+
+CAP_DFS = 0x01
+CAP_LEASING = 0x02
+CAP_LARGE_MTU = 0x04
+CAP_MULTI_CHANNEL = 0x08
+CAP_PERSISTENT_HANDLES = 0x10
+CAP_DIRECTORY_LEASING = 0x20
+CAP_ENCRYPTION = 0x40
+
+PREAUTH_INTEGRITY_CAPABILITIES = 0x0001
+ENCRYPTION_CAPABILITIES = 0x0002
+SHA_512 = 0x0001
+AES_128_CCM = 0x0001
+AES_128_GCM = 0x0002
+
+SMB2_MAGIC = b"\xfeSMB"
+HEADER_SIZE = 64
+
+class ProbeError(Exception):
+    pass
+
+def build_negotiate_request() -> bytes:
+    dialects = sorted(DIALECTS)
+    header = struct.pack(
+        "<4sHHIHHIIQIIQ16s",
+        SMB2_MAGIC, HEADER_SIZE, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, b"\0" * 16
+    )
+
+    # Negotiate contexts start 8-byte aligned after the dialect list (offset from the SMB2 header)
+    body_fixed = 36
+    dialect_bytes = struct.pack(f"<{len(dialects)}H", *dialects)
+    context_offset = HEADER_SIZE + body_fixed + len(dialect_bytes)
+    padding = (8 - context_offset % 8) % 8
+    context_offset += padding
+
+    preauth = struct.pack("<HHH", 1, 32, SHA_512) + os.urandom(32)
+    encryption = struct.pack("<HHH", 2, AES_128_GCM, AES_128_CCM)
+    contexts = b""
+    for ctype, data in ((PREAUTH_INTEGRITY_CAPABILITIES, preauth), (ENCRYPTION_CAPABILITIES, encryption)):
+        if contexts:
+            contexts += b"\0" * ((8 - len(contexts) % 8) % 8)
+        contexts += struct.pack("<HHI", ctype, len(data), 0) + data
+
+    capabilities = CAP_DFS | CAP_LEASING | CAP_LARGE_MTU | CAP_MULTI_CHANNEL | CAP_ENCRYPTION
+    body = struct.pack(
+        "<HHHHI16sIHH",
+        body_fixed, len(dialects), 0x0001, 0, capabilities, uuid.uuid4().bytes,
+        context_offset, 2, 0
+    ) + dialect_bytes + b"\0" * padding + contexts
+
+    message = header + body
+    return struct.pack(">I", len(message)) + message
+
+def recv_exact(sock: socket.socket, size: int) -> bytes:
+    data = b""
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ProbeError("connection closed")
+        data += chunk
+    return data
+
+def parse_negotiate_response(message: bytes) -> dict:
+    if len(message) < HEADER_SIZE + 64 or message[:4] != SMB2_MAGIC:
+        raise ProbeError("not an SMB2 response")
+    status, command = struct.unpack_from("<IH", message, 8)
+    if command != 0:
+        raise ProbeError(f"unexpected command {command}")
+    if status != 0:
+        raise ProbeError(f"negotiate failed: status 0x{status:08x}")
+
+    (_, security_mode, dialect, context_count, _, capabilities,
+     max_transact, max_read, max_write) = struct.unpack_from("<HHHH16sIIII", message, HEADER_SIZE)
+    context_offset, = struct.unpack_from("<I", message, HEADER_SIZE + 60)
+    if dialect not in DIALECTS:
+        raise ProbeError(f"unsupported dialect 0x{dialect:04x}")
+
+    cipher = None
+    offset = context_offset
+    for _ in range(context_count if dialect == 0x0311 else 0):
+        offset += (8 - offset % 8) % 8
+        if offset + 8 > len(message):
+            break
+        ctype, length = struct.unpack_from("<HH", message, offset)
+        data = message[offset + 8:offset + 8 + length]
+        if ctype == ENCRYPTION_CAPABILITIES and len(data) >= 4:
+            count, first = struct.unpack_from("<HH", data)
+            cipher = first if count else None
+        offset += 8 + length
+
+    return {
+        "dialect": DIALECTS[dialect],
+        "signing_required": bool(security_mode & 0x0002),
+        "multichannel": bool(capabilities & CAP_MULTI_CHANNEL),
+        "large_mtu": bool(capabilities & CAP_LARGE_MTU),
+        "encryption": bool(capabilities & CAP_ENCRYPTION) or cipher is not None,
+        "max_read": max_read,
+        "max_write": max_write,
+        "max_transact": max_transact,
+    }
+
+def probe(host: str, port: int = 445, timeout: float = SMB_PROBE_TIMEOUT) -> dict:
+    with socket.create_connection((host, port), timeout=timeout) as sock:
+        sock.settimeout(timeout)
+        sock.sendall(build_negotiate_request())
+        length, = struct.unpack(">I", recv_exact(sock, 4))
+        length &= 0x00FFFFFF
+        return parse_negotiate_response(recv_exact(sock, length))
+
+# --- per-host cache (DATA_DIR/smb_probe.json) ---
+
+_cache_lock = threading.Lock()
+
+def load_cache() -> dict:
+    try:
+        with open(SMB_PROBE_CACHE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+            return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def save_cache(cache: dict) -> None:
+    SMB_PROBE_CACHE.parent.mkdir(parents=True, exist_ok=True)
+    tmp = SMB_PROBE_CACHE.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=2)
+    os.replace(tmp, SMB_PROBE_CACHE)
+
+def cache_key(host: str, port: int) -> str:
+    return f"{host}:{port}"
+
+def cached(host: str, port: int = 445) -> dict | None:
+    entry = load_cache().get(cache_key(host, port))
+    if not isinstance(entry, dict) or time.time() - entry.get("probed_at", 0) > SMB_PROBE_MAX_AGE:
+        return None
+    return entry
+
+def refresh(host: str, port: int = 445, timeout: float = SMB_PROBE_TIMEOUT) -> dict | None:
+    # Probes now and updates the cache; a failed probe drops the stale entry
+    try:
+        result = probe(host, port, timeout)
+        result["probed_at"] = time.time()
+    except (OSError, ProbeError, struct.error):
+        result = None
+    with _cache_lock:
+        cache = load_cache()
+        if result is None:
+            cache.pop(cache_key(host, port), None)
+        else:
+            cache[cache_key(host, port)] = result
+        try:
+            save_cache(cache)
+        except OSError:
+            pass
+    return result
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print(f"usage: {Path(sys.argv[0]).name} HOST [PORT]")
+        sys.exit(2)
+    try:
+        print(json.dumps(probe(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else 445), indent=2))
+    except (OSError, ProbeError, struct.error) as e:
+        print(f"probe failed: {e}")
+        sys.exit(1)
@@ -0,0 +1,32 @@
+import os
+import uuid
+import hashlib
+
+from netmount.config import SSH_CONTROL_DIR, SSH_CONTROL_PERSIST
+
+# 🔗 sshfs mounts share a ControlMaster when they go to the same user@host:port with the same option set.
+# A session that joins a master rides on the master's connection, so its own Ciphers/MACs/Compression
+# would be ignored; keying the socket on the options keeps differently tuned mounts on separate masters.
+# Password-authenticated key setup sessions never join these: each gets a private socket (setup_control_path)
+# and only ever closes that one, so an `-O exit` cannot drop a live mount.
+
+def ensure_control_dir() -> None:
+    os.makedirs(SSH_CONTROL_DIR, mode=0o700, exist_ok=True)
+
+def mount_control_path(user: str, host: str, port: str, options: str) -> str:
+    # A fixed-length digest instead of %C: unix socket paths are limited to ~104 bytes
+    digest = hashlib.sha1(f"{user}@{host}:{port}|{options}".encode("utf-8")).hexdigest()
+    return str(SSH_CONTROL_DIR / digest)
+
+def setup_control_path() -> str:
+    return str(SSH_CONTROL_DIR / f"setup-{uuid.uuid4().hex[:12]}")
+
+def mux_options(control_path: str, persist: int = SSH_CONTROL_PERSIST) -> list[str]:
+    # For sshfs -o: join the master if one is up, otherwise become it
+    return ["ControlMaster=auto", f"ControlPath={control_path}", f"ControlPersist={persist}"]
+
+def ssh_args(control_path: str, master: str = "auto", persist: int = SSH_CONTROL_PERSIST) -> list[str]:
+    args = []
+    for option in [f"ControlMaster={master}", f"ControlPath={control_path}", f"ControlPersist={persist}"]:
+        args += ["-o", option]
+    return args
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+current_file = Path(__file__).resolve()
+project_root = current_file.parent.parent
+sys.path.insert(0, str(project_root))
+
+from netmount.config import SSH_TUNE_BYTES, SSH_TUNE_TIMEOUT, SSH_TUNE_MAX_AGE
+from netmount.mount_options import split_remote, sftp_key_path
+from netmount.runner import run_command
+
+# A failed background re-check is retried after this many seconds
+TUNE_RETRY_AFTER = 3600
+
+# 🔐 Cipher/MAC pairs tried by the calibration; AEAD ciphers carry their own MAC
+CANDIDATES = [
+    ("aes128-gcm@openssh.com", None),
+    ("chacha20-poly1305@openssh.com", None),
+    ("aes256-ctr", "hmac-sha2-256-etm@openssh.com"),
+    ("aes128-ctr", "umac-64-etm@openssh.com"),
+]
+
+def ssh_command(user: str, host: str, port: str, key_path: str, cipher: str, mac: str | None, remote: str) -> list[str]:
+    # ControlPath=none: a shared master would carry every session over the cipher it was opened with
+    cmd = [
+        "ssh", "-p", str(port), "-i", key_path,
+        "-o", "BatchMode=yes", "-o", "StrictHostKeyChecking=no", "-o", "Compression=no",
+        "-o", "ControlPath=none",
+        "-o", f"Ciphers={cipher}",
+    ]
+    if mac:
+        cmd += ["-o", f"MACs={mac}"]
+    return cmd + [f"{user}@{host}", remote]
+
+def measure(user: str, host: str, port: str, key_path: str, cipher: str, mac: str | None,
+            size: int = SSH_TUNE_BYTES, timeout: float = SSH_TUNE_TIMEOUT) -> float | None:
+    # MB/s of a remote -> local stream, with the handshake cost of an empty session subtracted
+    handshake = run_command(ssh_command(user, host, port, key_path, cipher, mac, "true"), timeout=timeout, capture=False)
+    if not handshake.ok:
+        return None
+    transfer = run_command(
+        ssh_command(user, host, port, key_path, cipher, mac, f"head -c {int(size)} /dev/zero"),
+        timeout=timeout, capture=False
+    )
+    if not transfer.ok:
+        return None
+    elapsed = max(transfer.duration - handshake.duration, 1e-3)
+    return size / elapsed / 1e6
+
+def calibrate(user: str, host: str, port: str, key_path: str, size: int = SSH_TUNE_BYTES) -> dict[str, Any] | None:
+    results = {}
+    for cipher, mac in CANDIDATES:
+        rate = measure(user, host, port, key_path, cipher, mac, size)
+        if rate is not None:
+            results[cipher] = {"mac": mac, "mbps": round(rate, 1)}
+    if not results:
+        return None
+
+    best = max(results, key=lambda c: results[c]["mbps"])
+    return {
+        "cipher": best,
+        "mac": results[best]["mac"],
+        "mbps": results[best]["mbps"],
+        "measured_at": time.time(),
+        "results": results,
+    }
+
+def calibrate_mount(mount: dict[str, Any], size: int = SSH_TUNE_BYTES) -> dict[str, Any] | None:
+    host, port, _ = split_remote(mount.get("url", ""), "sftp")
+    key_path = sftp_key_path(host, port)
+    if not host or not mount.get("user") or not Path(key_path).exists():
+        return None
+    return calibrate(mount["user"], host, port, key_path, size)
+
+def is_stale(mount: dict[str, Any], now: float | None = None) -> bool:
+    # Only entries that were calibrated once are re-checked
+    tuning = mount.get("ssh_tuning")
+    if not isinstance(tuning, dict):
+        return False
+    now = time.time() if now is None else now
+    return now - tuning.get("measured_at", 0) > SSH_TUNE_MAX_AGE
+
+def main():
+    import argparse
+    import getpass
+
+    parser = argparse.ArgumentParser(description="Measure sshfs cipher throughput against an SSH server")
+    parser.add_argument("target", help="user@host")
+    parser.add_argument("-p", "--port", default="22")
+    parser.add_argument("-i", "--identity", required=True)
+    parser.add_argument("--size", type=int, default=SSH_TUNE_BYTES)
+    args = parser.parse_args()
+
+    user, _, host = args.target.rpartition("@")
+    user = user or getpass.getuser()
+    tuning = calibrate(user, host, args.port, args.identity, args.size)
+    if tuning is None:
+        print("calibration failed: no cipher could be measured")
+        sys.exit(1)
+    for cipher, result in sorted(tuning["results"].items(), key=lambda r: -r[1]["mbps"]):
+        print(f"{cipher:32} {result['mac'] or '-':32} {result['mbps']:8.1f} MB/s")
+    print(f"best: {tuning['cipher']}")
+
+if __name__ == "__main__":
+    main()
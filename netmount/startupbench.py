@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+import os
+import sys
+import json
+import time
+import tempfile
+import subprocess
+from pathlib import Path
+from typing import Any
+
+current_file = Path(__file__).resolve()
+project_root = current_file.parent.parent
+sys.path.insert(0, str(project_root))
+
+from netmount.config import STARTUP_BUDGETS_MS
+
+# ⏱️ Cold-start measurement of the three entry points, each in a fresh interpreter:
+# `-X importtime` for the module import, and wall-clock time from process start to "ready"
+
+TARGETS = ("main", "auto_mount", "net_unmounter")
+
+READY_MARK = "STARTUPBENCH-READY"
+
+# Each driver brings its entry point to the state the user first sees and prints READY_MARK with extra timings
+DRIVERS = {
+    # Window shown and the list verified against the decrypted config and the live mount table
+    "main": f"""
+import sys, time, json
+from PyQt6.QtWidgets import QApplication
+app = QApplication(sys.argv)
+from netmount.main import T
+from netmount.mountmanager import MountManager
+password = sys.stdin.readline().rstrip("\\n")
+window = MountManager(T, password, time.monotonic())
+window.refresh_list()
+window.show()
+deadline = time.monotonic() + 30
+while "accurate_ms" not in window.startup_timing and time.monotonic() < deadline:
+    app.processEvents()
+    time.sleep(0.002)
+print("{READY_MARK}", json.dumps(window.startup_timing), flush=True)
+window.close()
+""",
+    # Progress window on screen, before the password prompt
+    "auto_mount": f"""
+import json
+from PyQt6.QtWidgets import QApplication
+import netmount.auto_mount as auto_mount
+auto_mount.start_ui()
+QApplication.processEvents()
+print("{READY_MARK}", json.dumps({{}}), flush=True)
+auto_mount.progress_dialog.close()
+""",
+    # Tray icon and watchers set up; the real entry point waits 5 s for the session before this
+    "net_unmounter": f"""
+import sys, json
+from PyQt6.QtWidgets import QApplication
+app = QApplication(sys.argv)
+from netmount.net_unmounter import UnmountManager
+manager = UnmountManager()
+app.processEvents()
+print("{READY_MARK}", json.dumps({{}}), flush=True)
+""",
+}
+
+def child_env(offscreen: bool) -> dict[str, str]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(project_root), env.get("PYTHONPATH")]))
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    if offscreen:
+        env["QT_QPA_PLATFORM"] = "offscreen"
+    return env
+
+def parse_importtime(stderr: str, module: str, top: int) -> dict[str, Any]:
+    # Lines look like "import time:   self [us] | cumulative | imported package"
+    rows = []
+    total = None
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        self_us, cumulative_us, name = int(fields[0]), int(fields[1]), fields[2].rstrip()
+        rows.append((self_us, name.strip()))
+        if name.strip() == module and not name.startswith("  "):
+            total = cumulative_us
+    rows.sort(reverse=True)
+    return {
+        "import_ms": total / 1000 if total is not None else None,
+        "modules": len(rows),
+        "top": [{"module": name, "self_ms": self_us / 1000} for self_us, name in rows[:top]],
+    }
+
+def measure_import(target: str, offscreen: bool, top: int) -> dict[str, Any]:
+    module = f"netmount.{target}"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=child_env(offscreen), timeout=60
+    )
+    result = parse_importtime(proc.stderr, module, top)
+    if proc.returncode != 0:
+        result["error"] = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"exit {proc.returncode}"
+    return result
+
+def measure_ready(target: str, offscreen: bool, password: str | None) -> dict[str, Any]:
+    # stderr goes to a file: the driver's console output must not block it before READY_MARK
+    with tempfile.TemporaryFile("w+") as errors:
+        started = time.monotonic()
+        proc = subprocess.Popen(
+            [sys.executable, "-c", DRIVERS[target]],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=errors,
+            text=True, env=child_env(offscreen)
+        )
+        try:
+            proc.stdin.write((password or "") + "\n")
+            proc.stdin.close()
+        except OSError:
+            pass
+        ready_ms = None
+        details = {}
+        for line in proc.stdout:
+            if line.startswith(READY_MARK):
+                ready_ms = (time.monotonic() - started) * 1000
+                details = json.loads(line[len(READY_MARK):] or "{}")
+                break
+        try:
+            proc.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+        proc.stdout.close()
+        errors.seek(0)
+        stderr = errors.read().strip()
+    result = {"ready_ms": ready_ms, **details}
+    if ready_ms is None:
+        result["error"] = stderr.splitlines()[-1] if stderr else f"exit {proc.returncode}"
+    return result
+
+def over_budget(target: str, result: dict[str, Any]) -> list[str]:
+    budget = STARTUP_BUDGETS_MS.get(target, {})
+    over = []
+    for key in ("import_ms", "ready_ms"):
+        limit = budget.get(key)
+        value = result.get(key)
+        if limit is not None and (value is None or value > limit):
+            over.append(key)
+    return over
+
+def bench(target: str, runs: int, offscreen: bool, password: str | None, top: int) -> dict[str, Any]:
+    # Best of `runs`: the noise on a desktop is one-sided, so the minimum is the repeatable figure
+    imports = [measure_import(target, offscreen, top) for _ in range(runs)]
+    readies = [measure_ready(target, offscreen, password) for _ in range(runs)]
+    best_import = min(imports, key=lambda r: r["import_ms"] if r["import_ms"] is not None else float("inf"))
+    best_ready = min(readies, key=lambda r: r["ready_ms"] if r["ready_ms"] is not None else float("inf"))
+    result = {**best_import, **best_ready, "budget": STARTUP_BUDGETS_MS.get(target, {})}
+    errors = [r["error"] for r in (best_import, best_ready) if "error" in r]
+    if errors:
+        result["error"] = "; ".join(errors)
+    result["over_budget"] = over_budget(target, result)
+    return result
+
+def format_ms(value: float | None) -> str:
+    return f"{value:8.1f} ms" if value is not None else "       - ms"
+
+def main():
+    import argparse
+    import getpass
+
+    parser = argparse.ArgumentParser(description="Measure cold-start import and ready times of the NetMountManager entry points")
+    parser.add_argument("targets", nargs="*", metavar="target", help=f"one of {', '.join(TARGETS)} (default: all)")
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters per measurement, best one counts")
+    parser.add_argument("--top", type=int, default=10, help="slowest modules (self time) listed per target")
+    parser.add_argument("--offscreen", action="store_true", help="run the Qt side without a display")
+    parser.add_argument("--json", action="store_true", help="machine-readable output for release-to-release tracking")
+    args = parser.parse_args()
+    args.targets = args.targets or list(TARGETS)
+    unknown = [t for t in args.targets if t not in TARGETS]
+    if unknown:
+        parser.error(f"unknown target: {', '.join(unknown)}")
+
+    password = None
+    if "main" in args.targets:
+        # The main window is only "ready" once the real config is decrypted
+        password = getpass.getpass("Admin password: ")
+
+    results = {target: bench(target, max(1, args.runs), args.offscreen, password, args.top) for target in args.targets}
+    failed = [target for target, result in results.items() if result["over_budget"] or "error" in result]
+
+    if args.json:
+        print(json.dumps({"python": sys.version.split()[0], "results": results}, indent=2))
+    else:
+        for target, result in results.items():
+            budget = result["budget"]
+            print(f"{target}")
+            print(f"  import {format_ms(result['import_ms'])}  (budget {budget.get('import_ms', '-')} ms, {result['modules']} modules)")
+            print(f"  ready  {format_ms(result['ready_ms'])}  (budget {budget.get('ready_ms', '-')} ms)")
+            for extra in ("first_paint_ms", "config_ms", "accurate_ms"):
+                if extra in result:
+                    print(f"    {extra:15} {format_ms(result[extra])}")
+            for row in result["top"]:
+                print(f"    {row['self_ms']:8.1f} ms  {row['module']}")
+            if "error" in result:
+                print(f"  error: {result['error']}")
+            if result["over_budget"]:
+                print(f"  OVER BUDGET: {', '.join(result['over_budget'])}")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
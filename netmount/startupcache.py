@@ -0,0 +1,54 @@
+import os
+import json
+import tempfile
+from typing import Any
+
+from netmount.config import STARTUP_SNAPSHOT
+
+# 🖼️ What the mount list shows, kept in plain JSON next to the secure file: the window paints it
+# before the PBKDF2 decryption of the real config has finished. No users, passwords or keys.
+SNAPSHOT_FIELDS = ("id", "url", "path", "order", "automount", "last_known_status", "sshkeyvalid")
+
+def strip_credentials(url: str) -> str:
+    scheme, sep, rest = url.partition("://")
+    if not sep:
+        return url
+    netloc, slash, tail = rest.partition("/")
+    return f"{scheme}://{netloc.rpartition('@')[2]}{slash}{tail}"
+
+def snapshot_entries(mounts: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    entries = []
+    for mount in mounts:
+        entry = {key: mount[key] for key in SNAPSHOT_FIELDS if key in mount}
+        entry["url"] = strip_credentials(entry.get("url", ""))
+        entries.append(entry)
+    return entries
+
+def load_snapshot() -> list[dict[str, Any]]:
+    # Missing or damaged snapshot: the window starts with an empty list and fills in once decrypted
+    try:
+        with open(STARTUP_SNAPSHOT, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return []
+    if not isinstance(data, list):
+        return []
+    return [e for e in data if isinstance(e, dict) and e.get("id") and e.get("url") and e.get("path")]
+
+def save_snapshot(entries: list[dict[str, Any]]) -> None:
+    # Best effort: without a snapshot only the next startup is slower.
+    # Each write gets its own temporary file (mode 0600), so the ConfigWriter thread and the
+    # post-load refresh on the background pool never interleave into one file before the rename
+    tmp = None
+    try:
+        STARTUP_SNAPSHOT.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=STARTUP_SNAPSHOT.parent, prefix=STARTUP_SNAPSHOT.name + ".", suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entries, f)
+        os.replace(tmp, STARTUP_SNAPSHOT)
+    except OSError:
+        if tmp is not None:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
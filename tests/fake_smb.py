@@ -0,0 +1,119 @@
+import socket
+import struct
+import threading
+
+from netmount.smbprobe import (
+    SMB2_MAGIC, HEADER_SIZE, ENCRYPTION_CAPABILITIES, AES_128_GCM,
+    CAP_LEASING, CAP_LARGE_MTU, CAP_MULTI_CHANNEL
+)
+
+# 🤝 Loopback SMB2 NEGOTIATE responder: answers one NEGOTIATE per connection the way a server would,
+# so the probe's request builder and response parser can be checked without a real SMB server
+
+class NegotiateResponder:
+    def __init__(self, dialect: int | None = None, capabilities: int = CAP_LEASING | CAP_LARGE_MTU | CAP_MULTI_CHANNEL,
+                 security_mode: int = 0x0001, status: int = 0, max_size: int = 8 << 20, close_early: bool = False):
+        # dialect: the one to answer with; None picks the highest the client offered
+        self.dialect = dialect
+        self.capabilities = capabilities
+        self.security_mode = security_mode
+        self.status = status
+        self.max_size = max_size
+        self.close_early = close_early
+        self.requests = []
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.listen(4)
+        self.port = self.sock.getsockname()[1]
+        self.thread = threading.Thread(target=self.serve, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *_):
+        # shutdown() wakes the blocked accept(); close() alone would leave it listening
+        try:
+            self.sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self.sock.close()
+        self.thread.join(2)
+
+    def serve(self) -> None:
+        while True:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                return
+            with conn:
+                if self.close_early:
+                    continue
+                try:
+                    self.answer(conn)
+                except (OSError, struct.error):
+                    pass
+
+    def answer(self, conn: socket.socket) -> None:
+        length, = struct.unpack(">I", recv_exact(conn, 4))
+        message = recv_exact(conn, length & 0x00FFFFFF)
+        request = parse_request(message)
+        self.requests.append(request)
+        dialect = self.dialect if self.dialect is not None else max(request["dialects"])
+        conn.sendall(self.response(dialect))
+
+    def response(self, dialect: int) -> bytes:
+        contexts = b""
+        if dialect == 0x0311:
+            data = struct.pack("<HH", 1, AES_128_GCM)
+            contexts = struct.pack("<HHI", ENCRYPTION_CAPABILITIES, len(data), 0) + data
+        context_offset = HEADER_SIZE + 64 + 64 if contexts else 0
+        header = struct.pack(
+            "<4sHHIHHIIQIIQ16s",
+            SMB2_MAGIC, HEADER_SIZE, 0, self.status, 0, 1, 1, 0, 0, 0, 0, 0, b"\0" * 16
+        )
+        body = struct.pack(
+            "<HHHH16sIIIIQQHHI",
+            65, self.security_mode, dialect, 1 if contexts else 0, b"\x11" * 16, self.capabilities,
+            self.max_size, self.max_size, self.max_size, 0, 0, HEADER_SIZE + 64, 0, context_offset
+        )
+        message = header + body
+        if contexts:
+            # Security buffer (empty here) up to the 8-byte aligned context list
+            message += b"\0" * (context_offset - len(message)) + contexts
+        return struct.pack(">I", len(message)) + message
+
+def recv_exact(conn: socket.socket, size: int) -> bytes:
+    data = b""
+    while len(data) < size:
+        chunk = conn.recv(size - len(data))
+        if not chunk:
+            raise OSError("connection closed")
+        data += chunk
+    return data
+
+def parse_request(message: bytes) -> dict:
+    # The fields of an SMB2 NEGOTIATE request a server looks at
+    if message[:4] != SMB2_MAGIC:
+        raise OSError("not SMB2")
+    command, = struct.unpack_from("<H", message, 12)
+    (structure_size, dialect_count, security_mode, _, capabilities, _,
+     context_offset, context_count, _) = struct.unpack_from("<HHHHI16sIHH", message, HEADER_SIZE)
+    dialects = list(struct.unpack_from(f"<{dialect_count}H", message, HEADER_SIZE + 36))
+    context_types = []
+    offset = context_offset
+    for _ in range(context_count):
+        offset += (8 - offset % 8) % 8
+        ctype, length = struct.unpack_from("<HH", message, offset)
+        context_types.append(ctype)
+        offset += 8 + length
+    return {
+        "command": command,
+        "structure_size": structure_size,
+        "dialects": dialects,
+        "security_mode": security_mode,
+        "capabilities": capabilities,
+        "context_offset": context_offset,
+        "context_types": context_types,
+        "size": len(message),
+    }
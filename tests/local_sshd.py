@@ -0,0 +1,94 @@
+import os
+import time
+import shutil
+import socket
+import getpass
+import tempfile
+import subprocess
+from pathlib import Path
+
+# 🔐 Throw-away sshd on loopback for the cipher calibration: own host key, own client key,
+# key-only login as the current user. Nothing outside the temporary directory is touched.
+
+SSHD_CANDIDATES = ("/usr/sbin/sshd", "/usr/local/sbin/sshd")
+
+def find_sshd() -> str | None:
+    return shutil.which("sshd") or next((p for p in SSHD_CANDIDATES if os.access(p, os.X_OK)), None)
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+class LocalSSHD:
+    def __init__(self, start_timeout: float = 10.0):
+        self.sshd = find_sshd()
+        if self.sshd is None:
+            raise FileNotFoundError("sshd not found")
+        self.start_timeout = start_timeout
+        self.user = getpass.getuser()
+        self.host = "127.0.0.1"
+        self.port = free_port()
+        self.tmp = None
+        self.proc = None
+
+    def __enter__(self):
+        self.tmp = Path(tempfile.mkdtemp(prefix="netmount-sshd-"))
+        host_key = self.tmp / "host_ed25519"
+        self.key_path = str(self.tmp / "client_ed25519")
+        for key in (host_key, self.key_path):
+            subprocess.run(["ssh-keygen", "-q", "-t", "ed25519", "-N", "", "-f", str(key)], check=True)
+        authorized = self.tmp / "authorized_keys"
+        shutil.copy(self.key_path + ".pub", authorized)
+        os.chmod(authorized, 0o600)
+
+        config = self.tmp / "sshd_config"
+        config.write_text("\n".join([
+            f"ListenAddress {self.host}",
+            f"Port {self.port}",
+            f"HostKey {host_key}",
+            f"PidFile {self.tmp / 'sshd.pid'}",
+            f"AuthorizedKeysFile {authorized}",
+            "PasswordAuthentication no",
+            "KbdInteractiveAuthentication no",
+            "PubkeyAuthentication yes",
+            "PermitRootLogin prohibit-password",
+            "StrictModes no",
+            "UsePAM no",
+            # Every cipher the calibration may try
+            "Ciphers aes128-gcm@openssh.com,chacha20-poly1305@openssh.com,aes256-ctr,aes128-ctr",
+            "MACs hmac-sha2-256-etm@openssh.com,umac-64-etm@openssh.com",
+        ]) + "\n")
+
+        # sshd re-executes itself and needs an absolute path (find_sshd() returns one).
+        # Its log goes to a file: a pipe nobody reads would stall it after enough connections
+        self.log_path = self.tmp / "sshd.log"
+        with open(self.log_path, "w") as log:
+            self.proc = subprocess.Popen(
+                [self.sshd, "-D", "-e", "-f", str(config)], stdout=subprocess.DEVNULL, stderr=log
+            )
+        deadline = time.monotonic() + self.start_timeout
+        while time.monotonic() < deadline:
+            if self.proc.poll() is not None:
+                error = self.log_path.read_text().strip()
+                self.__exit__()
+                raise RuntimeError(f"sshd exited: {error}")
+            try:
+                with socket.create_connection((self.host, self.port), timeout=0.5):
+                    return self
+            except OSError:
+                time.sleep(0.05)
+        self.__exit__()
+        raise RuntimeError("sshd did not start")
+
+    def __exit__(self, *_):
+        if self.proc is not None and self.proc.poll() is None:
+            self.proc.terminate()
+            try:
+                self.proc.wait(5)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
+                self.proc.wait()
+        if self.tmp is not None:
+            shutil.rmtree(self.tmp, ignore_errors=True)
+            self.tmp = None
@@ -0,0 +1,87 @@
+import sys
+import time
+import shutil
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from netmount import keyprovision, mount_options
+from netmount.runner import CommandResult, run_command
+
+class FakeSSH:
+    # Real ssh-keygen into a temporary key directory; install/verify/close are answered here.
+    # Every ssh call lingers briefly so that parallel jobs on the same host would overlap.
+    def __init__(self, verify_ok=lambda cmd: True):
+        self.verify_ok = verify_ok
+        self.lock = threading.Lock()
+        self.installs = []
+        self.keygens = []
+
+    def __call__(self, cmd, timeout=None, input=None, env=None, check=False, **kwargs):
+        if cmd[0] == "ssh-keygen":
+            with self.lock:
+                self.keygens.append(cmd[cmd.index("-f") + 1])
+            return run_command(cmd, timeout=timeout, check=check)
+        time.sleep(0.05)
+        ok = True
+        if cmd[0] == "sshpass":
+            with self.lock:
+                self.installs.append((cmd[-2], input))
+        elif "-i" in cmd:
+            ok = self.verify_ok(cmd)
+        return CommandResult(cmd, 0 if ok else 255, "", "" if ok else "Permission denied", 0.05)
+
+@unittest.skipIf(shutil.which("ssh-keygen") is None, "ssh-keygen is not installed")
+class ProvisionAllTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        patcher = mock.patch.object(mount_options, "KEY_DIR", self.tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.tmp.cleanup)
+
+    def run_all(self, entries, fake):
+        with mock.patch.object(keyprovision, "run_command", fake):
+            return keyprovision.provision_all(entries, "secret", workers=4)
+
+    def test_entries_on_the_same_host_share_one_job(self):
+        entries = [
+            {"url": "sftp://files.example/home", "user": "alice"},
+            {"url": "sftp://files.example/backup", "user": "alice"},
+            {"url": "sftp://other.example/data", "user": "alice"},
+        ]
+        fake = FakeSSH()
+        results = self.run_all(entries, fake)
+
+        self.assertTrue(all(outcome["ok"] for outcome in results))
+        self.assertEqual([outcome["url"] for outcome in results], [e["url"] for e in entries])
+        self.assertEqual(len(fake.keygens), 2)
+        self.assertEqual(sorted(host for host, _ in fake.installs), ["alice@files.example", "alice@other.example"])
+        self.assertEqual(keyprovision.apply_results(entries, results), 3)
+
+    def test_users_sharing_a_key_file_run_one_after_another(self):
+        entries = [
+            {"url": "sftp://files.example/a", "user": "alice"},
+            {"url": "sftp://files.example/b", "user": "bob", "password": "bobs"},
+        ]
+        # The host ignores Ed25519: both users fall back to the one RSA key
+        fake = FakeSSH(verify_ok=lambda cmd: "id_rsa_" in cmd[cmd.index("-i") + 1])
+        results = self.run_all(entries, fake)
+
+        self.assertEqual([outcome["key_type"] for outcome in results], ["rsa", "rsa"])
+        self.assertTrue(all(outcome["ok"] for outcome in results))
+        self.assertEqual(len(fake.keygens), 2)
+        self.assertEqual(keyprovision.existing_key_type("files.example", "22"), "rsa")
+
+    def test_invalid_entry_fails_alone(self):
+        entries = [{"url": "sftp:///nohost", "user": "alice"}, {"url": "sftp://files.example/a", "user": "alice"}]
+        results = self.run_all(entries, FakeSSH())
+        self.assertEqual((results[0]["ok"], results[0]["stage"]), (False, "config"))
+        self.assertTrue(results[1]["ok"])
+
+if __name__ == "__main__":
+    unittest.main()
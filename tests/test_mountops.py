@@ -0,0 +1,62 @@
+import sys
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from netmount import mountops
+from netmount.runner import CommandResult
+
+def failed(cmd, cancelled=False):
+    return CommandResult(cmd, 1, "", "target is busy", 0.01, cancelled=cancelled)
+
+class DetachLadderTest(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(mountops, "is_mountpoint", return_value=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_every_stage_is_tried(self):
+        calls = []
+        privileged = lambda cmd, timeout, cancel=None: calls.append(cmd) or failed(cmd)
+        result, stage = mountops.detach("/mnt/share", False, privileged)
+        self.assertIsNone(stage)
+        self.assertFalse(result.cancelled)
+        self.assertEqual([cmd[:-1] for cmd in calls], [prefix for _, prefix in mountops.CIFS_LADDER])
+
+    def test_cancel_stops_the_ladder(self):
+        cancel = threading.Event()
+        calls = []
+
+        def privileged(cmd, timeout, cancel=None):
+            # The user cancels while the first step runs; the step itself is killed
+            calls.append((cmd, cancel))
+            cancel.set()
+            return failed(cmd, cancelled=True)
+
+        result, stage = mountops.detach("/mnt/share", False, privileged, cancel=cancel)
+        self.assertIsNone(stage)
+        self.assertTrue(result.cancelled)
+        self.assertEqual(len(calls), 1)
+        self.assertIs(calls[0][1], cancel)
+
+    def test_cancel_reaches_fuse_steps(self):
+        cancel = threading.Event()
+        cancel.set()
+        with mock.patch.object(mountops, "run_command") as run:
+            result, stage = mountops.detach("/mnt/sftp", True, cancel=cancel)
+        run.assert_not_called()
+        self.assertIsNone(stage)
+        self.assertTrue(result.cancelled)
+
+    def test_detached_stage_is_reported(self):
+        with mock.patch.object(mountops, "run_command", return_value=CommandResult([], 0, "", "", 0.01)) as run:
+            result, stage = mountops.detach("/mnt/sftp", True, reachable=False, cancel=threading.Event())
+        self.assertEqual(stage, "lazy")
+        self.assertTrue(result.ok)
+        self.assertIsNotNone(run.call_args.kwargs["cancel"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+import os
+import sys
+import socket
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from netmount import privhelper
+from netmount.privhelper import HelperError, PrivilegedHelper, build_command, validate_options, validate_target
+from netmount.runner import CommandResult
+
+class ValidateTargetTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = os.path.join(self.tmp.name, "mnt")
+        os.mkdir(self.root)
+
+    def test_direct_child_is_accepted(self):
+        target = os.path.join(self.root, "share1")
+        self.assertEqual(validate_target(target, self.root), os.path.realpath(target))
+
+    def test_rejected_targets(self):
+        outside = os.path.join(self.tmp.name, "etc")
+        os.mkdir(outside)
+        escape = os.path.join(self.root, "escape")
+        os.symlink(outside, escape)
+        for target in (
+            "", None, 42,
+            outside,
+            self.root,
+            os.path.join(self.root, "a", "b"),
+            os.path.join(self.root, "..", "etc"),
+            os.path.join(self.root, "share-1"),
+            os.path.join(self.root, "share 1"),
+            escape,
+            "/etc",
+        ):
+            with self.subTest(target=target):
+                with self.assertRaises(HelperError):
+                    validate_target(target, self.root)
+
+class ValidateOptionsTest(unittest.TestCase):
+    def test_allowed_options(self):
+        options = "username=alice,password=x=y,uid=1000,gid=1000,vers=3.1.1,seal,multichannel,max_channels=4"
+        self.assertEqual(validate_options(options, 1000, 1000), options)
+
+    def test_rejected_options(self):
+        for options in (
+            "",
+            "username=alice,setuids",
+            "username=alice,exec",
+            "uid=0",
+            "uid=1000,gid=0",
+            "username=alice\nsetuids",
+            "username=alice\0",
+            "credentials=/root/.smb",
+            None,
+        ):
+            with self.subTest(options=options):
+                with self.assertRaises(HelperError):
+                    validate_options(options, 1000, 1000)
+
+class BuildCommandTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.settings = {"root": self.tmp.name, "uid": 1000, "gid": 1000}
+        self.target = os.path.join(self.tmp.name, "share")
+
+    def test_mount_and_umount(self):
+        command = build_command({"op": "mount", "source": "//nas/share", "target": self.target,
+                                 "options": "username=a,uid=1000"}, self.settings)
+        self.assertEqual(command[:4], ["mount", "-t", "cifs", "//nas/share"])
+        self.assertEqual(build_command({"op": "umount", "flags": ["-l"], "target": self.target}, self.settings)[:2],
+                         ["umount", "-l"])
+
+    def test_rejected_requests(self):
+        for request in (
+            {"op": "mount", "source": "//nas/share,setuids", "target": self.target, "options": "uid=1000"},
+            {"op": "mount", "source": "/dev/sda1", "target": self.target, "options": "uid=1000"},
+            {"op": "umount", "flags": ["--all"], "target": self.target},
+            {"op": "umount", "flags": "-f", "target": self.target},
+            {"op": "exec", "target": self.target},
+        ):
+            with self.subTest(request=request):
+                with self.assertRaises(HelperError):
+                    build_command(request, self.settings)
+
+class SudoFallbackTest(unittest.TestCase):
+    command = ["umount", "-f", "/home/u/mnt/share"]
+
+    def setUp(self):
+        self.helper = PrivilegedHelper("secret", socket_path=Path("/nonexistent/helper.sock"))
+        patcher = mock.patch.object(privhelper, "run_command", return_value=CommandResult([], 0, "", "", 0.1))
+        self.sudo = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_unreachable_helper_falls_back_to_sudo(self):
+        with mock.patch.object(self.helper, "ensure_running", return_value=True):
+            result = self.helper.run(self.command, timeout=1)
+        self.assertTrue(result.ok)
+        self.assertEqual(self.sudo.call_args.args[0], ["sudo", "-S"] + self.command)
+
+    def test_lost_answer_is_not_retried(self):
+        client, server = socket.socketpair()
+        received = []
+
+        def helper_dies():
+            # Reads the request, then goes away without answering
+            with server:
+                received.append(server.recv(65536))
+
+        thread = threading.Thread(target=helper_dies)
+        thread.start()
+        with mock.patch.object(self.helper, "ensure_running", return_value=True), \
+                mock.patch.object(self.helper, "connect", return_value=client):
+            result = self.helper.run(self.command, timeout=1)
+        thread.join()
+
+        self.assertTrue(received and received[0].startswith(b"{"))
+        self.assertFalse(result.ok)
+        self.sudo.assert_not_called()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import sys
+import time
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from netmount import mountops
+from netmount.config import UNMOUNT_FAST_STEP_TIMEOUT
+from netmount.runner import run_command
+
+# Scheduling slack on a loaded machine; the budgets themselves are what is being checked
+SLACK = 0.15
+
+# Ignores SIGTERM, like a umount stuck on a dead server; only SIGKILL ends it
+STUBBORN = ["sh", "-c", "trap '' TERM; sleep 5", "sh"]
+
+class TimeoutBudgetTest(unittest.TestCase):
+    def test_output_and_status(self):
+        result = run_command(["sh", "-c", "echo out; echo err >&2; exit 3"], timeout=5)
+        self.assertEqual((result.returncode, result.stdout, result.stderr), (3, "out\n", "err\n"))
+        self.assertFalse(result.ok)
+        self.assertFalse(result.timed_out)
+
+    def test_timeout_includes_the_kill_grace(self):
+        for cmd in (["sleep", "5"], STUBBORN):
+            with self.subTest(cmd=cmd[0]):
+                started = time.monotonic()
+                result = run_command(cmd, timeout=0.5)
+                self.assertTrue(result.timed_out)
+                self.assertLess(time.monotonic() - started, 0.5 + SLACK)
+
+    def test_cancel_stops_within_the_budget(self):
+        cancel = threading.Event()
+        threading.Timer(0.2, cancel.set).start()
+        started = time.monotonic()
+        result = run_command(STUBBORN, timeout=2, cancel=cancel)
+        self.assertTrue(result.cancelled)
+        self.assertFalse(result.timed_out)
+        self.assertLess(time.monotonic() - started, 0.2 + 0.5 + SLACK)
+
+    def test_fast_unmount_ladder_stays_within_two_steps(self):
+        # An unreachable server: both remaining steps hang until they are killed
+        ladder = [("force", STUBBORN), ("lazy", STUBBORN)]
+        with mock.patch.object(mountops, "FUSE_LADDER", [("normal", STUBBORN)] + ladder), \
+                mock.patch.object(mountops, "is_mountpoint", return_value=True):
+            started = time.monotonic()
+            result, stage = mountops.detach("/mnt/dead", True, reachable=False)
+        self.assertIsNone(stage)
+        self.assertLess(time.monotonic() - started, 2 * UNMOUNT_FAST_STEP_TIMEOUT + SLACK)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from netmount import smbprobe
+from netmount.smbprobe import (
+    DIALECTS, PREAUTH_INTEGRITY_CAPABILITIES, ENCRYPTION_CAPABILITIES, CAP_MULTI_CHANNEL, CAP_LARGE_MTU, ProbeError
+)
+from tests.fake_smb import NegotiateResponder
+
+class NegotiateProbeTest(unittest.TestCase):
+    def test_request_is_a_valid_negotiate(self):
+        with NegotiateResponder() as server:
+            smbprobe.probe("127.0.0.1", server.port)
+        request = server.requests[0]
+        self.assertEqual(request["command"], 0)
+        self.assertEqual(request["structure_size"], 36)
+        self.assertEqual(sorted(request["dialects"]), sorted(DIALECTS))
+        self.assertEqual(request["context_offset"] % 8, 0)
+        self.assertEqual(request["context_types"], [PREAUTH_INTEGRITY_CAPABILITIES, ENCRYPTION_CAPABILITIES])
+
+    def test_smb311_with_contexts(self):
+        with NegotiateResponder(security_mode=0x0003) as server:
+            result = smbprobe.probe("127.0.0.1", server.port)
+        self.assertEqual(result["dialect"], "3.1.1")
+        self.assertTrue(result["signing_required"])
+        self.assertTrue(result["multichannel"])
+        self.assertTrue(result["large_mtu"])
+        self.assertTrue(result["encryption"])
+        self.assertEqual(result["max_read"], 8 << 20)
+
+    def test_older_dialect_without_multichannel(self):
+        with NegotiateResponder(dialect=0x0210, capabilities=CAP_LARGE_MTU) as server:
+            result = smbprobe.probe("127.0.0.1", server.port)
+        self.assertEqual(result["dialect"], "2.1")
+        self.assertFalse(result["multichannel"])
+        self.assertFalse(result["encryption"])
+        self.assertFalse(result["signing_required"])
+
+    def test_error_status_is_rejected(self):
+        with NegotiateResponder(status=0xC0000022) as server:
+            with self.assertRaises(ProbeError):
+                smbprobe.probe("127.0.0.1", server.port)
+
+    def test_unknown_dialect_is_rejected(self):
+        with NegotiateResponder(dialect=0x02FF) as server:
+            with self.assertRaises(ProbeError):
+                smbprobe.probe("127.0.0.1", server.port)
+
+    def test_closed_connection(self):
+        with NegotiateResponder(close_early=True) as server:
+            with self.assertRaises((ProbeError, OSError)):
+                smbprobe.probe("127.0.0.1", server.port)
+
+    def test_refresh_caches_and_drops(self):
+        with tempfile.TemporaryDirectory() as tmp, \
+                mock.patch.object(smbprobe, "SMB_PROBE_CACHE", Path(tmp) / "smb_probe.json"):
+            with NegotiateResponder(capabilities=CAP_MULTI_CHANNEL) as server:
+                self.assertIsNotNone(smbprobe.refresh("127.0.0.1", server.port))
+                self.assertEqual(smbprobe.cached("127.0.0.1", server.port)["dialect"], "3.1.1")
+            # The responder is gone: the failed probe drops the cached entry
+            self.assertIsNone(smbprobe.refresh("127.0.0.1", server.port, timeout=0.5))
+            self.assertIsNone(smbprobe.cached("127.0.0.1", server.port))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from netmount import sshtune
+from tests.local_sshd import LocalSSHD, find_sshd
+
+# A small sample keeps the run short; the ranking logic does not depend on the size
+SAMPLE = 2 * 1024 * 1024
+
+@unittest.skipIf(find_sshd() is None, "sshd is not installed")
+class CalibrationAgainstLocalSSHDTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = LocalSSHD().__enter__()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.__exit__()
+
+    def test_measure_returns_a_rate(self):
+        s = self.server
+        cipher, mac = sshtune.CANDIDATES[0]
+        rate = sshtune.measure(s.user, s.host, str(s.port), s.key_path, cipher, mac, SAMPLE, timeout=30)
+        self.assertIsNotNone(rate)
+        self.assertGreater(rate, 0)
+
+    def test_unknown_cipher_is_skipped(self):
+        s = self.server
+        self.assertIsNone(sshtune.measure(s.user, s.host, str(s.port), s.key_path, "no-such-cipher", None, SAMPLE, timeout=10))
+
+    def test_calibrate_picks_the_fastest_candidate(self):
+        s = self.server
+        tuning = sshtune.calibrate(s.user, s.host, str(s.port), s.key_path, SAMPLE)
+        self.assertIsNotNone(tuning)
+        self.assertEqual(set(tuning["results"]), {cipher for cipher, _ in sshtune.CANDIDATES})
+        self.assertEqual(tuning["mbps"], max(r["mbps"] for r in tuning["results"].values()))
+        self.assertEqual(tuning["mac"], dict(sshtune.CANDIDATES)[tuning["cipher"]])
+        self.assertFalse(sshtune.is_stale({"ssh_tuning": tuning}))
+
+    def test_wrong_key_fails_cleanly(self):
+        s = self.server
+        self.assertIsNone(sshtune.calibrate(s.user, s.host, str(s.port), s.key_path + ".missing", SAMPLE))
+
+class StalenessTest(unittest.TestCase):
+    def test_only_calibrated_entries_go_stale(self):
+        self.assertFalse(sshtune.is_stale({}))
+        self.assertTrue(sshtune.is_stale({"ssh_tuning": {"cipher": "aes128-ctr", "measured_at": 0}}))
+
+if __name__ == "__main__":
+    unittest.main()